@@ -0,0 +1,71 @@
+"""
+Benchmark Command Line
+    python -m benchmarks run [-k PATTERN] [--compare]
+    python -m benchmarks compare [--baseline -2] [--current -1] [--threshold 0.10]
+    python -m benchmarks list
+"""
+
+import sys
+import argparse
+from typing import Optional, Sequence
+
+from .suite import BENCHMARKS, run_benchmarks
+from .history import (
+    DEFAULT_HISTORY, append_run, compare_runs, latest_results, load_history, print_comparison, run_metadata
+)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Performance benchmark suite")
+    parser.add_argument("--history", type=str, default=DEFAULT_HISTORY, help="History JSON file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and record them in the history")
+    run_parser.add_argument("-k", "--filter", type=str, default=None, help="Only benchmarks whose name contains this")
+    run_parser.add_argument("--min_time", type=float, default=0.05, help="Minimum seconds per sample")
+    run_parser.add_argument("--repeats", type=int, default=5, help="Samples per benchmark")
+    run_parser.add_argument("--label", type=str, default=None, help="Free-form label stored with the run")
+    run_parser.add_argument("--no_save", action="store_true", help="Do not append the run to the history")
+    run_parser.add_argument("--compare", action="store_true",
+                            help="Compare with the latest earlier result of each benchmark; exit 1 on regressions")
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (relative)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two recorded runs")
+    compare_parser.add_argument("--baseline", type=int, default=-2, help="Baseline run index (default: previous)")
+    compare_parser.add_argument("--current", type=int, default=-1, help="Current run index (default: latest)")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (relative)")
+
+    commands.add_parser("list", help="List registered benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for bench in BENCHMARKS.values():
+            print(f"{bench.name:<36} per {bench.unit}")
+        return 0
+
+    if args.command == "run":
+        history = load_history(args.history)
+        run = run_metadata(args.label)
+        run['results'] = run_benchmarks(args.filter, min_time=args.min_time, repeats=args.repeats)
+        if not args.no_save:
+            append_run(run, args.history)
+        if args.compare and history:
+            baseline = latest_results(history)
+            rows = compare_runs(baseline, run, args.threshold)
+            print()
+            print_comparison(baseline, run, rows)
+            return 1 if any(row['status'] == "regression" for row in rows) else 0
+        return 0
+
+    history = load_history(args.history)
+    if len(history) < 2:
+        print(f"Need at least two runs in {args.history}, found {len(history)}")
+        return 2
+    baseline, current = history[args.baseline], history[args.current]
+    rows = compare_runs(baseline, current, args.threshold)
+    print_comparison(baseline, current, rows)
+    return 1 if any(row['status'] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark History
+Appends benchmark runs to a JSON file and compares two runs, flagging
+benchmarks whose best (minimum) time per unit grew beyond a threshold
+"""
+
+import os
+import sys
+import json
+import platform
+import datetime
+import subprocess
+from typing import Dict, List, Optional
+
+from .suite import ROOT
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "history.json")
+
+
+def run_metadata(label: Optional[str] = None) -> Dict:
+    """Where and on what code a run was taken"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'label': label,
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_history(path: str = DEFAULT_HISTORY) -> List[Dict]:
+    """All recorded runs, oldest first (empty if the file does not exist)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)['runs']
+
+
+def append_run(run: Dict, path: str = DEFAULT_HISTORY):
+    """Add a run to the history file (atomic replace)"""
+    runs = load_history(path)
+    runs.append(run)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'runs': runs}, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def latest_results(runs: List[Dict]) -> Dict:
+    """
+    Pseudo-run holding the most recent result of every benchmark
+
+    Lets a filtered run (-k) be compared with whatever was last measured
+    for each benchmark it contains.
+    """
+    merged = {'timestamp': runs[-1]['timestamp'], 'commit': runs[-1].get('commit'),
+              'label': "latest per benchmark", 'host': runs[-1].get('host'), 'results': {}}
+    for run in runs:
+        merged['results'].update(run['results'])
+    return merged
+
+
+def compare_runs(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare the best time per unit (min over samples, the least noisy
+    estimate on a shared machine) of two runs
+
+    Args:
+        baseline: Earlier run
+        current: Later run
+        threshold: Relative slowdown that counts as a regression (0.10 = 10%)
+
+    Returns:
+        One row per benchmark of current: name, baseline_ns, current_ns, change (relative)
+        and status ("regression", "improvement", "ok", "new" or "skipped")
+    """
+    rows = []
+    for name in current['results']:
+        old = baseline['results'].get(name)
+        new = current['results'].get(name)
+        row = {'name': name, 'baseline_ns': None, 'current_ns': None, 'change': None}
+        if 'skipped' in new or (old is not None and 'skipped' in old):
+            row['status'] = "skipped"
+        elif old is None:
+            row['status'] = "new"
+        else:
+            row['baseline_ns'], row['current_ns'] = old['min_ns'], new['min_ns']
+            row['change'] = new['min_ns'] / old['min_ns'] - 1.0
+            if row['change'] > threshold:
+                row['status'] = "regression"
+            elif row['change'] < -threshold:
+                row['status'] = "improvement"
+            else:
+                row['status'] = "ok"
+        rows.append(row)
+    return rows
+
+
+def print_comparison(baseline: Dict, current: Dict, rows: List[Dict], stream=sys.stdout):
+    def describe(run: Dict) -> str:
+        return f"{run['timestamp']} {run.get('commit') or ''} {run.get('label') or ''}".strip()
+
+    print(f"baseline: {describe(baseline)}", file=stream)
+    print(f"current:  {describe(current)}", file=stream)
+    if baseline.get('host') != current.get('host'):
+        print("warning: runs were taken on different hosts", file=stream)
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>8}  status", file=stream)
+    for row in rows:
+        if row['change'] is None:
+            print(f"{row['name']:<36} {'':>12} {'':>12} {'':>8}  {row['status']}", file=stream)
+            continue
+        print(f"{row['name']:<36} {row['baseline_ns']:>10.0f}ns {row['current_ns']:>10.0f}ns "
+              f"{100 * row['change']:>+7.1f}%  {row['status'].upper() if row['status'] == 'regression' else row['status']}",
+              file=stream)
@@ -0,0 +1,247 @@
+"""
+Benchmark Definitions
+Each benchmark is a setup function returning the callable to time, plus
+the number of work units one call performs (steps, episodes, ...), so
+results are reported per unit and stay comparable when a benchmark changes
+its batch size
+"""
+
+import os
+import time
+import statistics
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Project root (the directory containing src/ and benchmarks/)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT, "config.yaml")
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when the benchmark cannot run here (e.g. missing dependency)"""
+
+
+class Benchmark(NamedTuple):
+    """One registered benchmark"""
+    name: str
+    setup: Callable[[], Tuple[Callable[[], Any], int]]  # -> (timed callable, units per call)
+    unit: str
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, unit: str = "call"):
+    """Register a setup function under name"""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, unit)
+        return setup
+    return register
+
+
+# --- Physics (scalar API) ---
+
+@benchmark("physics.update_soil_moisture")
+def _physics_soil():
+    from src.environment import PlantPhysics
+    physics = PlantPhysics(CONFIG_PATH)
+    return (lambda: physics.update_soil_moisture(0.5, 20.0, 24.0, 600.0)), 1
+
+
+@benchmark("physics.calculate_photosynthesis")
+def _physics_photosynthesis():
+    from src.environment import PlantPhysics
+    physics = PlantPhysics(CONFIG_PATH)
+    return (lambda: physics.calculate_photosynthesis(600.0, 0.5, 24.0)), 1
+
+
+@benchmark("physics.calculate_stress")
+def _physics_stress():
+    from src.environment import PlantPhysics
+    physics = PlantPhysics(CONFIG_PATH)
+    return (lambda: physics.calculate_stress(0.5, 24.0)), 1
+
+
+@benchmark("physics.update_plant_health")
+def _physics_health():
+    from src.environment import PlantPhysics
+    physics = PlantPhysics(CONFIG_PATH)
+    return (lambda: physics.update_plant_health(80.0, 0.6, 0.2)), 1
+
+
+@benchmark("physics.get_ambient_conditions")
+def _physics_ambient():
+    import numpy as np
+    from src.environment import PlantPhysics
+    physics = PlantPhysics(CONFIG_PATH)
+    rng = np.random.default_rng(0)
+    return (lambda: physics.get_ambient_conditions(12, "normal", rng)), 1
+
+
+# --- Gym environment ---
+
+@benchmark("env.reset")
+def _env_reset():
+    from src.environment import PlantCareEnv
+    env = PlantCareEnv(config_path=CONFIG_PATH)
+    env.reset(seed=0)
+    return env.reset, 1
+
+
+@benchmark("env.step", unit="step")
+def _env_step():
+    import numpy as np
+    from src.environment import PlantCareEnv
+    env = PlantCareEnv(config_path=CONFIG_PATH)
+    env.reset(seed=0)
+    action = np.array([10.0, 1.0], dtype=np.float32)
+    n_steps = 100
+
+    def run():
+        # Restart before the episode would end so every call times 100 plain steps
+        if env.current_step + n_steps >= env.max_steps:
+            env.reset()
+        for _ in range(n_steps):
+            env.step(action)
+    return run, n_steps
+
+
+def _episode(policy_name: str):
+    """One full episode of a baseline policy (reset + max_steps steps)"""
+    from src.environment import PlantCareEnv
+    from src.evaluation.sweep import _build_policy
+    env = PlantCareEnv(config_path=CONFIG_PATH)
+    act = _build_policy(policy_name, CONFIG_PATH).get_action
+
+    def run():
+        observation, _ = env.reset(seed=0)
+        done = False
+        while not done:
+            observation, _, terminated, truncated, _ = env.step(act(observation))
+            done = terminated or truncated
+    return run, 1
+
+
+@benchmark("episode.fixed_schedule", unit="episode")
+def _episode_fixed():
+    return _episode("fixed_schedule")
+
+
+@benchmark("episode.threshold_rule", unit="episode")
+def _episode_threshold():
+    return _episode("threshold_rule")
+
+
+# --- Vectorized environment ---
+
+def _vec_env(n_envs: int):
+    import numpy as np
+    from src.environment import PlantCareVecEnv
+    env = PlantCareVecEnv(n_envs, config_path=CONFIG_PATH)
+    env.reset(seed=0)
+    actions = np.tile(np.array([10.0, 1.0], dtype=np.float32), (n_envs, 1))
+    return (lambda: env.step(actions)), n_envs
+
+
+for _n_envs in (1, 16, 256):
+    benchmark(f"vec_env.step[{_n_envs}]", unit="env-step")(lambda n_envs=_n_envs: _vec_env(n_envs))
+
+
+# --- Policy inference ---
+
+@benchmark("model.predict[cpu]")
+def _model_predict():
+    try:
+        import torch
+        from stable_baselines3 import PPO
+    except ImportError as e:
+        raise SkipBenchmark(f"stable_baselines3 not available: {e}")
+    from src.config import load_config
+    from src.environment import PlantCareEnv
+    torch.set_num_threads(1)
+    ppo_config = load_config(CONFIG_PATH).ppo
+    env = PlantCareEnv(config_path=CONFIG_PATH)
+    model = PPO(
+        "MlpPolicy", env, device="cpu", seed=0,
+        policy_kwargs=dict(net_arch=dict(
+            pi=list(ppo_config.policy_network.net_arch), vf=list(ppo_config.value_network.net_arch)
+        ))
+    )
+    observation, _ = env.reset(seed=0)
+    return (lambda: model.predict(observation, deterministic=True)), 1
+
+
+def measure(fn: Callable[[], Any], units: int, min_time: float = 0.05, repeats: int = 5) -> Dict:
+    """
+    Time fn like timeit: calibrate calls per sample to last at least min_time, then take repeats samples
+
+    Returns:
+        Dictionary with median_ns / min_ns / stdev_ns per unit, calls per
+        sample, repeats and units_per_s (from the median)
+    """
+    fn()  # Warm-up (lazy imports, caches, JIT)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.2))
+
+    samples = [elapsed / (number * units) * 1e9]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / (number * units) * 1e9)
+
+    median = statistics.median(samples)
+    return {
+        'median_ns': median,
+        'min_ns': min(samples),
+        'stdev_ns': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeats': len(samples),
+        'units_per_s': 1e9 / median,
+    }
+
+
+def run_benchmarks(
+    pattern: Optional[str] = None,
+    min_time: float = 0.05,
+    repeats: int = 5,
+    verbose: bool = True
+) -> Dict[str, Dict]:
+    """
+    Run every registered benchmark whose name contains pattern
+
+    Returns:
+        {name: measure() fields plus unit}; skipped benchmarks have
+        {'skipped': reason}
+    """
+    results = {}
+    selected: List[Benchmark] = [b for b in BENCHMARKS.values() if pattern is None or pattern in b.name]
+    for bench in selected:
+        try:
+            fn, units = bench.setup()
+        except SkipBenchmark as e:
+            results[bench.name] = {'skipped': str(e)}
+            if verbose:
+                print(f"{bench.name:<36} skipped ({e})")
+            continue
+        row = measure(fn, units, min_time=min_time, repeats=repeats)
+        row['unit'] = bench.unit
+        results[bench.name] = row
+        if verbose:
+            print(f"{bench.name:<36} {_format_ns(row['median_ns']):>10}/{bench.unit:<9} "
+                  f"± {100 * row['stdev_ns'] / row['median_ns']:4.1f}%  {row['units_per_s']:>12,.0f} {bench.unit}/s")
+    return results
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
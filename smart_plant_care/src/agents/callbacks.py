@@ -0,0 +1,451 @@
+"""
+Training Callbacks
+Stable-Baselines3 callbacks for train_ppo: per-phase environment step
+timings, training throughput telemetry, background policy evaluation and
+background checkpoint writing
+"""
+
+import os
+import copy
+import time
+import warnings
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import torch
+from stable_baselines3.common.callbacks import BaseCallback, EventCallback
+
+from src.config import PlantCareConfig
+from src.environment import StepProfiler
+from src.evaluation.harness import (
+    _empty_results, _evaluate_lockstep, _merge_results, _process_pool, summarize_by_scenario, summarize_results
+)
+from src.agents.inference import BatchedPolicy, DeterministicActor, _torch_forward
+from src.agents.checkpoints import CheckpointWriter, capture_training_state
+
+try:
+    import psutil
+except ImportError:  # Optional dependency (memory / CPU metrics are skipped)
+    psutil = None
+
+
+class StepProfileCallback(BaseCallback):
+    """Log per-phase step timings (profile/<phase>_us, _share) once per rollout and restart the counts"""
+
+    def __init__(self, profiler: StepProfiler, verbose: int = 0):
+        super().__init__(verbose)
+        self.profiler = profiler
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self):
+        self.profiler.record(self.logger)
+        if self.verbose:
+            print(self.profiler.table())
+        self.profiler.reset_stats()
+
+
+class TrainingTelemetryCallback(BaseCallback):
+    """
+    Throughput telemetry per PPO iteration (rollout collection + gradient update)
+
+    Logged under telemetry/ (TensorBoard via the model's logger):
+        sps: Environment steps per second over the whole last iteration
+        rollout_sps: Environment steps per second while collecting
+        rollout_s, update_s: Wall time of the last rollout and of the update before it
+        rollout_fraction: rollout_s / (rollout_s + update_s)
+        rss_mb, workers_rss_mb: Resident memory of the trainer and of its rollout workers
+        cpu_percent, worker<i>_cpu_percent: CPU utilization since the previous rollout
+            (100 = one core busy), for the trainer and every rollout worker process
+
+    When rollout collection dominates (mean rollout_fraction over the last
+    window iterations above rollout_warning), a warning suggests adding
+    environments / workers rather than growing the network.
+    """
+
+    def __init__(self, rollout_warning: float = 0.7, window: int = 5, verbose: int = 0):
+        """
+        Args:
+            rollout_warning: rollout_fraction above which to warn
+            window: Iterations averaged for the warning (the first iteration has no update yet)
+            verbose: 1 to print a one-line summary per iteration
+        """
+        super().__init__(verbose)
+        self.rollout_warning = rollout_warning
+        self.window = window
+        self.fractions: Deque[float] = deque(maxlen=window)
+        self.history: List[Dict[str, float]] = []
+        self._warned = False
+        self._process = None
+        self._workers: List = []
+
+    def _on_training_start(self):
+        self._training_start = time.perf_counter()
+        self._start_timesteps = self.num_timesteps
+        self._rollout_end: Optional[float] = None
+        self._update_s = 0.0
+        if psutil is not None:
+            self._process = psutil.Process()
+            self._process.cpu_percent(None)  # First call only primes the counter
+            self._refresh_workers()
+
+    def _on_rollout_start(self):
+        now = time.perf_counter()
+        # Time between the end of the previous rollout and now is the gradient update
+        self._update_s = now - self._rollout_end if self._rollout_end is not None else 0.0
+        self._rollout_start = now
+        self._rollout_timesteps = self.num_timesteps
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self):
+        now = time.perf_counter()
+        self._rollout_end = now
+        steps = self.num_timesteps - self._rollout_timesteps
+        rollout_s = now - self._rollout_start
+        iteration_s = rollout_s + self._update_s
+        row = {
+            'sps': steps / iteration_s if iteration_s > 0 else 0.0,
+            'rollout_sps': steps / rollout_s if rollout_s > 0 else 0.0,
+            'rollout_s': rollout_s,
+            'update_s': self._update_s,
+            'rollout_fraction': rollout_s / iteration_s if iteration_s > 0 else 1.0,
+        }
+        row.update(self._resource_usage())
+        self.history.append(row)
+        for key, value in row.items():
+            self.logger.record(f"telemetry/{key}", value)
+        if self.verbose:
+            print(f"telemetry: {row['sps']:,.0f} steps/s, rollout {row['rollout_s']:.2f} s, "
+                  f"update {row['update_s']:.2f} s")
+
+        if self._update_s > 0:
+            self.fractions.append(row['rollout_fraction'])
+        if (not self._warned and len(self.fractions) == self.window
+                and np.mean(self.fractions) > self.rollout_warning):
+            self._warned = True
+            warnings.warn(
+                f"Rollout collection takes {100 * np.mean(self.fractions):.0f}% of training time; "
+                f"more environments or rollout workers (training.n_envs, training.vec_backend) "
+                f"will speed up training more than a smaller network",
+                RuntimeWarning
+            )
+
+    def summary(self) -> Dict[str, float]:
+        """Mean throughput over the whole run (empty before the first rollout)"""
+        if not self.history:
+            return {}
+        elapsed = time.perf_counter() - self._training_start
+        rollout_s = sum(row['rollout_s'] for row in self.history)
+        update_s = sum(row['update_s'] for row in self.history)
+        return {
+            'sps': (self.num_timesteps - self._start_timesteps) / elapsed,
+            'rollout_fraction': rollout_s / (rollout_s + update_s) if rollout_s + update_s > 0 else 1.0,
+            'peak_rss_mb': max(row.get('rss_mb', 0.0) for row in self.history),
+        }
+
+    def _refresh_workers(self):
+        """Rollout worker processes (SubprocVecEnv / SharedMemoryVecEnv), with primed CPU counters"""
+        env, processes = self.training_env, None
+        while env is not None and processes is None:
+            processes = getattr(env, 'processes', None)
+            env = getattr(env, 'venv', None)
+        self._workers = []
+        for process in processes or []:
+            try:
+                worker = psutil.Process(process.pid)
+                worker.cpu_percent(None)
+            except (psutil.Error, TypeError):  # Exited (or never started: pid None)
+                continue
+            self._workers.append(worker)
+
+    def _resource_usage(self) -> Dict[str, float]:
+        if self._process is None:
+            return {}
+        usage = {
+            'rss_mb': self._process.memory_info().rss / 2**20,
+            'cpu_percent': self._process.cpu_percent(None),
+        }
+        workers_rss = 0
+        alive = True
+        for i, worker in enumerate(self._workers):
+            try:
+                usage[f'worker{i}_cpu_percent'] = worker.cpu_percent(None)
+                workers_rss += worker.memory_info().rss
+            except psutil.Error:
+                alive = False
+        if self._workers:
+            usage['workers_rss_mb'] = workers_rss / 2**20
+        if not alive:
+            self._refresh_workers()
+        return usage
+
+
+def _evaluate_snapshot(
+    actor: DeterministicActor,
+    config_path: Union[str, PlantCareConfig],
+    scenario: str,
+    seeds: List[int]
+) -> Dict[str, List]:
+    """Process pool task: run a policy snapshot on a chunk of seeds in lock-step"""
+    torch.set_num_threads(1)  # Workers share the CPU with training
+    policy = BatchedPolicy(_torch_forward(actor.eval()), backend="torch")
+    return _evaluate_lockstep(policy, config_path, scenario, seeds)
+
+
+class AsyncEvalCallback(EventCallback):
+    """
+    Evaluate policy snapshots in background processes while training continues
+
+    Every eval_freq calls the deterministic actor is copied to the CPU and
+    evaluated over seeds × scenarios by a spawned process pool (one batched
+    forward pass per tick per chunk). Finished evaluations are logged under
+    eval/ and the best snapshot by mean episode reward is saved as
+    best_model.zip, as EvalCallback does; results therefore arrive a few
+    rollouts after the weights they belong to (eval/snapshot_timesteps).
+    callback_after_eval runs after every finished evaluation, with
+    last_mean_reward / last_summary / last_timesteps set on its parent;
+    returning False stops training.
+    """
+
+    def __init__(
+        self,
+        config_path: Union[str, PlantCareConfig],
+        eval_freq: int = 10_000,
+        seeds: Sequence[int] = tuple(range(1000, 1010)),
+        scenarios: Sequence[str] = ("normal",),
+        n_workers: int = 2,
+        best_model_save_path: Optional[str] = None,
+        log_path: Optional[str] = None,
+        max_pending: int = 2,
+        wait_at_end: bool = True,
+        callback_after_eval: Optional[BaseCallback] = None,
+        verbose: int = 1
+    ):
+        """
+        Args:
+            config_path: Configuration file path or loaded PlantCareConfig (evaluation environments)
+            eval_freq: Evaluate every eval_freq calls (one call = one step of the vectorized env)
+            seeds: Reset seeds, evaluated for every scenario
+            scenarios: Weather scenario names
+            n_workers: Evaluation processes
+            best_model_save_path: Directory for best_model.zip (None: do not save)
+            log_path: Directory for evaluations.npz (None: do not write)
+            max_pending: Snapshots allowed in flight; further evaluations are
+                skipped until one finishes (the pool cannot keep up)
+            wait_at_end: Wait for pending evaluations when training ends (else cancel them)
+            callback_after_eval: Callback triggered after every finished evaluation
+            verbose: 1 to print finished evaluations
+        """
+        super().__init__(callback_after_eval, verbose=verbose)
+        self.config_path = config_path
+        self.eval_freq = eval_freq
+        self.seeds = [int(seed) for seed in seeds]
+        self.scenarios = list(scenarios)
+        self.n_workers = n_workers
+        self.best_model_save_path = best_model_save_path
+        self.log_path = log_path
+        self.max_pending = max_pending
+        self.wait_at_end = wait_at_end
+
+        self.best_mean_reward = -np.inf
+        self.last_mean_reward = -np.inf
+        self.last_summary: Dict = {}
+        self.last_timesteps = 0
+        self.n_skipped = 0
+        self._continue_training = True
+        self.evaluations_timesteps: List[int] = []
+        self.evaluations_results: List[List[float]] = []
+        self.evaluations_health: List[List[float]] = []
+        self._pending: Deque[Dict] = deque()
+        self._pool = None
+
+    def load_evaluations(self, max_timesteps: Optional[int] = None) -> int:
+        """
+        Continue the evaluation history of log_path/evaluations.npz (resuming a run)
+
+        Entries after max_timesteps (snapshots newer than the checkpoint being
+        resumed) are dropped from the history. All of them still count for
+        best_mean_reward, so best_model.zip is only replaced by a better snapshot.
+
+        Returns:
+            Number of evaluations kept
+        """
+        path = os.path.join(self.log_path, "evaluations.npz") if self.log_path is not None else None
+        if path is None or not os.path.exists(path):
+            return 0
+        with np.load(path) as data:
+            timesteps = data['timesteps'].tolist()
+            results = data['results'].tolist()
+            health = data['avg_health'].tolist()
+        if results:
+            self.best_mean_reward = max(float(np.mean(rewards)) for rewards in results)
+        keep = [i for i, t in enumerate(timesteps) if max_timesteps is None or t <= max_timesteps]
+        self.evaluations_timesteps = [timesteps[i] for i in keep]
+        self.evaluations_results = [results[i] for i in keep]
+        self.evaluations_health = [health[i] for i in keep]
+        return len(keep)
+
+    def _init_callback(self):
+        for path in (self.best_model_save_path, self.log_path):
+            if path is not None:
+                os.makedirs(path, exist_ok=True)
+        if self._pool is None:
+            self._pool = _process_pool(self.n_workers)
+
+    def _on_step(self) -> bool:
+        if self._pending:
+            self._collect(block=False)
+        if self.eval_freq > 0 and self.n_calls % self.eval_freq == 0:
+            if len(self._pending) >= self.max_pending:
+                self.n_skipped += 1
+                self.logger.record("eval/skipped", self.n_skipped)
+            else:
+                self._submit()
+        return self._continue_training
+
+    def _on_training_end(self):
+        if self.wait_at_end:
+            self._collect(block=True)
+        self.close()
+
+    def close(self):
+        """Cancel pending evaluations and stop the worker processes"""
+        if self._pool is not None:
+            for evaluation in self._pending:
+                for future in evaluation['futures']:
+                    future.cancel()
+            self._pending.clear()
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _submit(self):
+        """Snapshot the current weights and queue the evaluation tasks"""
+        actor = copy.deepcopy(DeterministicActor(self.model.policy)).to("cpu")
+        state = {key: value.detach().clone() for key, value in self.model.policy.state_dict().items()}
+        # About one chunk per worker: larger lock-step batches, fewer actor copies to pickle
+        chunk_size = max(1, -(-len(self.seeds) * len(self.scenarios) // self.n_workers))
+        futures: List[Future] = [
+            self._pool.submit(_evaluate_snapshot, actor, self.config_path, scenario, self.seeds[i:i + chunk_size])
+            for scenario in self.scenarios
+            for i in range(0, len(self.seeds), chunk_size)
+        ]
+        self._pending.append({
+            'timesteps': self.num_timesteps,
+            'futures': futures,
+            'state': state,
+            'submitted': time.perf_counter(),
+        })
+
+    def _collect(self, block: bool):
+        """Report finished evaluations, oldest first"""
+        while self._pending:
+            evaluation = self._pending[0]
+            if not block and not all(future.done() for future in evaluation['futures']):
+                return
+            self._pending.popleft()
+            results = _empty_results()
+            try:
+                for future in evaluation['futures']:
+                    _merge_results(results, future.result())
+            except Exception as e:
+                print(f"Evaluation at {evaluation['timesteps']} steps failed: {e!r}")
+                continue
+            self._report(evaluation, results)
+
+    def _report(self, evaluation: Dict, results: Dict[str, List]):
+        timesteps = evaluation['timesteps']
+        summary = summarize_results(results)
+        mean_reward = float(np.mean(results['reward']))
+
+        self.logger.record("eval/mean_reward", mean_reward)
+        self.logger.record("eval/std_reward", float(np.std(results['reward'])))
+        self.logger.record("eval/avg_health", float(summary['avg_health_mean']))
+        self.logger.record("eval/violations", float(summary['violations_mean']))
+        self.logger.record("eval/efficiency", float(summary['efficiency_mean']))
+        if len(self.scenarios) > 1:
+            for scenario, scenario_summary in summarize_by_scenario(results).items():
+                self.logger.record(f"eval/{scenario}/avg_health", float(scenario_summary['avg_health_mean']))
+        self.logger.record("eval/snapshot_timesteps", timesteps)
+        self.logger.record("eval/latency_s", time.perf_counter() - evaluation['submitted'])
+
+        self.evaluations_timesteps.append(timesteps)
+        self.evaluations_results.append(list(results['reward']))
+        self.evaluations_health.append(list(results['avg_health']))
+        if self.log_path is not None:
+            np.savez(
+                os.path.join(self.log_path, "evaluations"),
+                timesteps=self.evaluations_timesteps,
+                results=self.evaluations_results,
+                avg_health=self.evaluations_health,
+            )
+
+        if self.verbose:
+            print(f"Eval (snapshot at {timesteps} steps): mean reward {mean_reward:.2f}, "
+                  f"avg health {summary['avg_health_mean']:.1f}")
+        if mean_reward > self.best_mean_reward:
+            self.best_mean_reward = mean_reward
+            if self.best_model_save_path is not None:
+                self._save_snapshot(evaluation['state'], os.path.join(self.best_model_save_path, "best_model"))
+                if self.verbose:
+                    print("New best mean reward!")
+
+        self.last_mean_reward = mean_reward
+        self.last_summary = summary
+        self.last_timesteps = timesteps
+        if not self._on_event():
+            self._continue_training = False
+
+    def _save_snapshot(self, state: Dict[str, torch.Tensor], path: str):
+        """Save the model with the snapshot weights (training is paused inside the callback)"""
+        policy = self.model.policy
+        current = {key: value.detach().clone() for key, value in policy.state_dict().items()}
+        policy.load_state_dict(state)
+        try:
+            self.model.save(path)
+        finally:
+            policy.load_state_dict(current)
+
+
+class AsyncCheckpointCallback(BaseCallback):
+    """
+    Capture the training state every save_freq calls and hand it to a CheckpointWriter
+
+    Only the in-memory copy of the weights happens on the training thread.
+    Checkpoints are scored by the mean reward of the recent training
+    episodes (the writer keeps the best ones besides the latest).
+    """
+
+    def __init__(self, writer: CheckpointWriter, save_freq: int, verbose: int = 0):
+        """
+        Args:
+            writer: Background writer (owns the directory and retention policy)
+            save_freq: Checkpoint every save_freq calls (one call = one step of the vectorized env)
+            verbose: 1 to print every submitted checkpoint
+        """
+        super().__init__(verbose)
+        self.writer = writer
+        self.save_freq = save_freq
+
+    def _on_step(self) -> bool:
+        if self.save_freq > 0 and self.n_calls % self.save_freq == 0:
+            self._checkpoint()
+        return True
+
+    def _on_training_end(self):
+        # The final state, so a resumed run continues exactly where this one stopped
+        if self.n_calls % self.save_freq != 0:
+            self._checkpoint()
+        self.writer.flush()
+
+    def _checkpoint(self):
+        episodes = self.model.ep_info_buffer
+        score = float(np.mean([episode['r'] for episode in episodes])) if episodes else None
+        if not self.writer.submit(capture_training_state(self.model, score)):
+            self.logger.record("checkpoint/dropped", self.writer.n_dropped)
+        if self.verbose:
+            print(f"Checkpoint at {self.num_timesteps} steps queued")
@@ -0,0 +1,264 @@
+"""
+Training Checkpoints
+Captures the full training state (policy and optimizer weights, step
+counters, torch / NumPy / Python and environment RNG states) in memory on
+the training thread; a background thread compresses and writes it with an
+atomic rename and prunes old checkpoints. train_ppo_agent resumes from the
+latest one
+"""
+
+import io
+import os
+import glob
+import gzip
+import json
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+import torch
+
+
+CHECKPOINT_PATTERN = "checkpoint_{timesteps:012d}.pt.gz"
+INDEX = "checkpoints.json"
+
+
+def _to_cpu(value: Any) -> Any:
+    """Copy every tensor of a nested state dict to the CPU (detached from training)"""
+    if isinstance(value, torch.Tensor):
+        return value.detach().to("cpu", copy=True)
+    if isinstance(value, dict):
+        return {key: _to_cpu(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_cpu(item) for item in value)
+    return value
+
+
+def capture_training_state(model, score: Optional[float] = None) -> Dict:
+    """
+    Snapshot everything needed to continue training (call from the training thread)
+
+    Args:
+        model: SB3 PPO model
+        score: Value used to keep the best checkpoints (e.g. mean episode reward)
+
+    Returns:
+        Dictionary of CPU tensors and plain values, safe to serialize in another thread
+    """
+    env = model.get_env()
+    return {
+        'parameters': _to_cpu(model.get_parameters()),  # policy + policy.optimizer
+        'num_timesteps': model.num_timesteps,
+        'n_updates': model._n_updates,
+        'score': score,
+        'rng': {
+            'torch': torch.get_rng_state(),
+            'numpy': np.random.get_state(),
+            'python': random.getstate(),
+        },
+        # One generator per sub-environment (the native vectorized env shares one)
+        'env_rng': [rng.bit_generator.state for rng in env.get_attr("np_random")] if env is not None else None,
+    }
+
+
+def restore_training_state(model, state: Dict):
+    """
+    Load a captured state into a freshly built model with the same architecture and environment
+
+    The environment is reset once to consume its initial seeds, its RNG
+    states are restored, and the first observations of the resumed run are
+    drawn from the restored streams; episodes in progress at checkpoint time
+    are restarted. Continue with model.learn(..., reset_num_timesteps=False).
+    """
+    model.set_parameters(state['parameters'], exact_match=True)
+    model.num_timesteps = state['num_timesteps']
+    model._n_updates = state['n_updates']
+    torch.set_rng_state(state['rng']['torch'])
+    np.random.set_state(state['rng']['numpy'])
+    random.setstate(state['rng']['python'])
+
+    env = model.get_env()
+    env.reset()  # Consumes the seeds given to env.seed() at construction
+    if state.get('env_rng') is not None:
+        generators = env.get_attr("np_random")
+        if all(generator is generators[0] for generator in generators):
+            # One generator shared by all sub-environments (native vectorized env)
+            env.set_attr("np_random", _generator(state['env_rng'][0]))
+        else:
+            for i, rng_state in enumerate(state['env_rng'][:env.num_envs]):
+                env.set_attr("np_random", _generator(rng_state), indices=[i])
+    model._last_obs = env.reset()
+    model._last_episode_starts = np.ones((env.num_envs,), dtype=bool)
+
+
+def _generator(rng_state: Dict) -> np.random.Generator:
+    """Generator restored from a bit_generator.state dictionary"""
+    bit_generator = getattr(np.random, rng_state['bit_generator'])()
+    bit_generator.state = rng_state
+    return np.random.Generator(bit_generator)
+
+
+def load_checkpoint(path: str) -> Dict:
+    """Read a checkpoint written by CheckpointWriter"""
+    with gzip.open(path, 'rb') as f:
+        return torch.load(io.BytesIO(f.read()), map_location="cpu", weights_only=False)
+
+
+def latest_checkpoint(directory: str) -> Optional[str]:
+    """Path of the checkpoint with the most timesteps in directory (None if there is none)"""
+    paths = sorted(glob.glob(os.path.join(directory, "checkpoint_*.pt.gz")))  # Zero-padded: name order = step order
+    return paths[-1] if paths else None
+
+
+class CheckpointWriter:
+    """
+    Background checkpoint writer with retention
+
+    submit() only enqueues an already captured state; a writer thread
+    serializes it, gzip-compresses it, writes it to a temporary file and
+    renames it into place, so a crash never leaves a truncated checkpoint.
+    After every write only the keep_last most recent checkpoints and the
+    keep_best highest-scoring ones are kept. The list of checkpoints and
+    their scores is stored in checkpoints.json next to them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        keep_last: int = 3,
+        keep_best: int = 1,
+        compress_level: int = 6,
+        max_pending: int = 2
+    ):
+        """
+        Args:
+            directory: Checkpoint directory (created if needed)
+            keep_last: Most recent checkpoints to keep
+            keep_best: Highest-scoring checkpoints to keep in addition
+            compress_level: gzip level (1 fastest .. 9 smallest)
+            max_pending: Captured states allowed in the queue; when it is full
+                submit() drops the oldest queued one instead of blocking training
+        """
+        if keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.keep_last = keep_last
+        self.keep_best = keep_best
+        self.compress_level = compress_level
+        self.checkpoints: List[Dict] = self._read_index()
+        self.n_written = 0
+        self.n_dropped = 0
+        self.errors: List[str] = []
+
+        self.max_pending = max_pending
+        self._pending: Deque[Dict] = deque()
+        self._writing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, state: Dict) -> bool:
+        """
+        Queue a state from capture_training_state for writing
+
+        Returns:
+            False if an older queued checkpoint had to be dropped to make room
+        """
+        with self._cond:
+            dropped = len(self._pending) >= self.max_pending
+            if dropped:
+                self._pending.popleft()
+                self.n_dropped += 1
+            self._pending.append(state)
+            self._cond.notify_all()
+        return not dropped
+
+    def flush(self):
+        """Wait until every queued checkpoint is on disk"""
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+
+    def close(self):
+        """Write the queued checkpoints and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def __enter__(self) -> "CheckpointWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                state = self._pending.popleft()
+                self._writing = True
+            try:
+                self._write(state)
+            except Exception as e:  # Keep training alive (disk full, permissions, ...)
+                self.errors.append(f"{type(e).__name__}: {e}")
+                print(f"Checkpoint write failed: {e!r}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, state: Dict):
+        path = os.path.join(self.directory, CHECKPOINT_PATTERN.format(timesteps=state['num_timesteps']))
+        buffer = io.BytesIO()
+        torch.save(state, buffer)
+        _atomic_write(path, gzip.compress(buffer.getbuffer(), compresslevel=self.compress_level))
+        self.n_written += 1
+
+        self.checkpoints = [c for c in self.checkpoints if c['path'] != os.path.basename(path)]
+        self.checkpoints.append({
+            'path': os.path.basename(path), 'timesteps': state['num_timesteps'], 'score': state['score']
+        })
+        self._prune()
+        _atomic_write(os.path.join(self.directory, INDEX), json.dumps(self.checkpoints, indent=1).encode())
+
+    def _prune(self):
+        """Delete checkpoints that are neither among the latest nor among the best"""
+        by_time = sorted(self.checkpoints, key=lambda c: c['timesteps'])
+        keep = {c['path'] for c in by_time[-self.keep_last:]}
+        scored = [c for c in self.checkpoints if c['score'] is not None]
+        if self.keep_best > 0:
+            keep.update(c['path'] for c in sorted(scored, key=lambda c: c['score'])[-self.keep_best:])
+        for checkpoint in self.checkpoints:
+            if checkpoint['path'] not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, checkpoint['path']))
+                except FileNotFoundError:
+                    pass
+        self.checkpoints = [c for c in by_time if c['path'] in keep]
+
+    def _read_index(self) -> List[Dict]:
+        """Checkpoints of an earlier run (resume), dropping entries whose file is gone"""
+        path = os.path.join(self.directory, INDEX)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r') as f:
+            checkpoints = json.load(f)
+        return [c for c in checkpoints if os.path.exists(os.path.join(self.directory, c['path']))]
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write to a temporary file in the same directory, fsync, then rename over path"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
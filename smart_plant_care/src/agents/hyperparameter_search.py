@@ -0,0 +1,339 @@
+"""
+Hyperparameter Search
+Random search over the ppo section of config.yaml: concurrent CPU training
+trials of train_ppo_agent in a process pool, early stopping of weak trials
+with a median pruner on their intermediate evaluation scores, and every
+trial recorded in an append-only JSONL store
+"""
+
+import os
+import json
+import math
+import time
+import argparse
+import contextlib
+import dataclasses
+from concurrent.futures import as_completed
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+
+from src.config import PlantCareConfig, load_config
+from src.evaluation.harness import _process_pool
+
+
+# name -> ("log_uniform", low, high) | ("uniform", low, high) | ("choice", options)
+# net_arch sets the policy and value networks alike
+SEARCH_SPACE: Dict[str, Tuple] = {
+    'learning_rate': ("log_uniform", 1e-5, 1e-3),
+    'n_steps': ("choice", (256, 512, 1024, 2048)),
+    'batch_size': ("choice", (32, 64, 128, 256)),
+    'net_arch': ("choice", ((64, 64), (128, 128), (256, 256))),
+    'ent_coef': ("log_uniform", 1e-4, 5e-2),
+}
+
+
+def sample_params(space: Dict[str, Tuple], rng: np.random.Generator) -> Dict[str, Any]:
+    """Draw one configuration from the search space (JSON-serializable values)"""
+    params = {}
+    for name, (kind, *args) in space.items():
+        if kind == "log_uniform":
+            params[name] = float(math.exp(rng.uniform(math.log(args[0]), math.log(args[1]))))
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(args[0], args[1]))
+        elif kind == "choice":
+            value = args[0][rng.integers(len(args[0]))]
+            params[name] = list(value) if isinstance(value, tuple) else value
+        else:
+            raise ValueError(f"Unknown search space type for {name}: {kind}")
+    return params
+
+
+def apply_params(config: PlantCareConfig, params: Dict[str, Any]) -> PlantCareConfig:
+    """Copy of config with the ppo section overridden by params"""
+    ppo_fields = {field.name for field in dataclasses.fields(config.ppo)}
+    overrides = {}
+    for name, value in params.items():
+        if name == 'net_arch':
+            net_arch = tuple(int(units) for units in value)
+            overrides['policy_network'] = dataclasses.replace(config.ppo.policy_network, net_arch=net_arch)
+            overrides['value_network'] = dataclasses.replace(config.ppo.value_network, net_arch=net_arch)
+        elif name in ppo_fields:
+            overrides[name] = value
+        else:
+            raise ValueError(f"Unknown ppo hyperparameter: {name}")
+    return dataclasses.replace(config, ppo=dataclasses.replace(config.ppo, **overrides))
+
+
+class TrialStore:
+    """
+    Append-only JSONL record of a search
+
+    One line per event: {"event": "start", "trial", "params", "dir"},
+    {"event": "report", "trial", "step", "score", "avg_health"} and
+    {"event": "end", "trial", "status", "score", "duration_s"}. Every
+    record is a single append of a short line, so the trial processes
+    share the file without locking; a rerun with the same store continues
+    the trial numbering.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, record: Dict):
+        line = json.dumps(record) + "\n"
+        with open(self.path, 'a') as f:
+            f.write(line)
+
+    def records(self) -> List[Dict]:
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:  # Line being written by another process
+                    pass
+        return records
+
+    def trials(self) -> Dict[int, Dict]:
+        """
+        Current state of every trial
+
+        Returns:
+            {trial: {params, status ("running", "complete", "pruned" or
+            "failed"), score, reports {step: score}, ...}}
+        """
+        trials: Dict[int, Dict] = {}
+        for record in self.records():
+            trial = trials.setdefault(record['trial'], {'status': "running", 'score': None, 'reports': {}})
+            if record['event'] == "start":
+                trial.update(params=record['params'], dir=record.get('dir'))
+            elif record['event'] == "report":
+                trial['reports'][record['step']] = record['score']
+            elif record['event'] == "end":
+                trial.update({key: value for key, value in record.items() if key not in ('event', 'trial')})
+        return trials
+
+    def next_trial_id(self) -> int:
+        trials = self.trials()
+        return max(trials) + 1 if trials else 0
+
+
+class MedianPruner:
+    """
+    Stop a trial whose best score so far is below the median score of the
+    other trials at the same step
+
+    Unlike Optuna's MedianPruner, running trials count too (trials run
+    concurrently, so few are complete early in a search); evaluation steps
+    line up across trials because they depend only on training.eval_freq.
+    """
+
+    def __init__(self, n_startup_trials: int = 4, n_warmup_steps: int = 0):
+        """
+        Args:
+            n_startup_trials: Other trials that must have reached the step before pruning
+            n_warmup_steps: Never prune before this many timesteps
+        """
+        self.n_startup_trials = n_startup_trials
+        self.n_warmup_steps = n_warmup_steps
+
+    def should_prune(self, store: TrialStore, trial_id: int, step: int, best_score: float) -> bool:
+        if step < self.n_warmup_steps:
+            return False
+        others = [
+            trial['reports'][step] for other_id, trial in store.trials().items()
+            if other_id != trial_id and step in trial['reports']
+        ]
+        if len(others) < self.n_startup_trials:
+            return False
+        return best_score < float(np.median(others))
+
+
+class TrialPruningCallback(BaseCallback):
+    """
+    callback_after_eval of a trial's AsyncEvalCallback: records every
+    evaluation in the store and stops training when the pruner says so
+    """
+
+    def __init__(self, store: TrialStore, trial_id: int, pruner: Optional[MedianPruner] = None):
+        super().__init__()
+        self.store = store
+        self.trial_id = trial_id
+        self.pruner = pruner
+        self.best_score = -np.inf
+        self.pruned = False
+
+    def _on_step(self) -> bool:
+        score = self.parent.last_mean_reward
+        step = self.parent.last_timesteps
+        self.best_score = max(self.best_score, score)
+        self.store.append({
+            'event': "report", 'trial': self.trial_id, 'step': step, 'score': score,
+            'avg_health': float(self.parent.last_summary['avg_health_mean']),
+        })
+        if self.pruner is not None and self.pruner.should_prune(self.store, self.trial_id, step, self.best_score):
+            self.pruned = True
+            return False
+        return True
+
+
+def _run_trial(
+    trial_id: int,
+    params: Dict[str, Any],
+    config: PlantCareConfig,
+    total_timesteps: int,
+    store_path: str,
+    output_dir: str,
+    pruner: Optional[MedianPruner],
+    n_threads: int,
+    seed: int
+) -> Dict:
+    """Process pool task: train one configuration (output goes to <trial dir>/train.log)"""
+    import torch
+    from src.agents.train_ppo import train_ppo_agent
+
+    torch.set_num_threads(n_threads)
+    store = TrialStore(store_path)
+    trial_dir = os.path.join(output_dir, f"trial_{trial_id:04d}")
+    os.makedirs(trial_dir, exist_ok=True)
+    store.append({'event': "start", 'trial': trial_id, 'params': params, 'dir': trial_dir})
+
+    pruning = TrialPruningCallback(store, trial_id, pruner)
+    start = time.perf_counter()
+    record = {'event': "end", 'trial': trial_id, 'status': "complete"}
+    try:
+        with open(os.path.join(trial_dir, "train.log"), 'w') as log, contextlib.redirect_stdout(log):
+            train_ppo_agent(
+                apply_params(config, params),
+                total_timesteps=total_timesteps,
+                device="cpu",
+                save_path=os.path.join(trial_dir, "models"),
+                log_path=os.path.join(trial_dir, "logs"),
+                seed=seed,
+                callback_after_eval=pruning,
+                progress_bar=False
+            )
+        if pruning.pruned:
+            record['status'] = "pruned"
+    except Exception as e:
+        record.update(status="failed", error=repr(e))
+    record['score'] = float(pruning.best_score) if np.isfinite(pruning.best_score) else None
+    record['duration_s'] = time.perf_counter() - start
+    store.append(record)
+    return record
+
+
+def run_search(
+    config_path: Union[str, PlantCareConfig] = "config.yaml",
+    n_trials: int = 20,
+    n_workers: int = 2,
+    threads_per_trial: int = 1,
+    total_timesteps: int = 200_000,
+    store_path: str = "./results/hpo_trials.jsonl",
+    output_dir: str = "./models/hpo/",
+    space: Optional[Dict[str, Tuple]] = None,
+    pruner: Optional[MedianPruner] = MedianPruner(),
+    eval_freq: Optional[int] = None,
+    eval_workers: int = 1,
+    seed: int = 0
+) -> Dict[int, Dict]:
+    """
+    Random search over the ppo section with concurrent training trials
+
+    Each trial trains with train_ppo_agent in its own worker process and is
+    scored by its best evaluation mean reward. A node runs about
+    n_workers × (threads_per_trial + eval_workers) busy processes.
+
+    Args:
+        config_path: Base configuration (file path or loaded PlantCareConfig)
+        n_trials: Trials to run in this call
+        n_workers: Concurrent trials
+        threads_per_trial: Torch threads per trial
+        total_timesteps: Training steps per trial
+        store_path: JSONL trial store (appended; existing trials are kept)
+        output_dir: Per-trial models, logs and train.log
+        space: Search space (default SEARCH_SPACE)
+        pruner: Early stopping rule (None: train every trial to the end)
+        eval_freq: Override training.eval_freq (steps between evaluations)
+        eval_workers: Evaluation processes per trial (training.eval_workers)
+        seed: Sampling seed (trial i trains with seed + i)
+
+    Returns:
+        {trial: state} of every trial in the store (see TrialStore.trials)
+    """
+    config = load_config(config_path)
+    training = dataclasses.replace(
+        config.training,
+        eval_workers=eval_workers,
+        eval_freq=eval_freq if eval_freq is not None else config.training.eval_freq
+    )
+    config = dataclasses.replace(config, training=training)
+    store = TrialStore(store_path)
+    first_id = store.next_trial_id()
+    rng = np.random.default_rng([seed, first_id])  # A continued search draws new configurations
+    space = space or SEARCH_SPACE
+
+    with _process_pool(n_workers) as pool:
+        futures = [
+            pool.submit(
+                _run_trial, trial_id, sample_params(space, rng), config, total_timesteps,
+                store_path, output_dir, pruner, threads_per_trial, seed + trial_id
+            )
+            for trial_id in range(first_id, first_id + n_trials)
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            score = "n/a" if record['score'] is None else f"{record['score']:.2f}"
+            print(f"Trial {record['trial']}: {record['status']}, score {score}, {record['duration_s']:.0f} s")
+
+    return store.trials()
+
+
+def print_trials(trials: Dict[int, Dict], top: int = 10):
+    """Best trials first (trials without a score last)"""
+    ranked = sorted(trials.items(), key=lambda item: -np.inf if item[1]['score'] is None else item[1]['score'],
+                    reverse=True)
+    print(f"{'trial':>5} {'status':<9} {'score':>9}  params")
+    for trial_id, trial in ranked[:top]:
+        score = "" if trial['score'] is None else f"{trial['score']:.2f}"
+        print(f"{trial_id:>5} {trial['status']:<9} {score:>9}  {json.dumps(trial.get('params'))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter search over the ppo config section")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Base configuration file")
+    parser.add_argument("--trials", type=int, default=20, help="Trials to run")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent trials")
+    parser.add_argument("--threads", type=int, default=1, help="Torch threads per trial")
+    parser.add_argument("--timesteps", type=int, default=200_000, help="Training steps per trial")
+    parser.add_argument("--eval_freq", type=int, default=None, help="Steps between evaluations (default: config)")
+    parser.add_argument("--eval_workers", type=int, default=1, help="Evaluation processes per trial")
+    parser.add_argument("--startup_trials", type=int, default=4, help="Trials reporting a step before pruning at it")
+    parser.add_argument("--no_prune", action="store_true", help="Train every trial to the end")
+    parser.add_argument("--store", type=str, default="./results/hpo_trials.jsonl", help="JSONL trial store")
+    parser.add_argument("--out", type=str, default="./models/hpo/", help="Per-trial output directory")
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed")
+    args = parser.parse_args()
+
+    trials = run_search(
+        args.config,
+        n_trials=args.trials,
+        n_workers=args.workers,
+        threads_per_trial=args.threads,
+        total_timesteps=args.timesteps,
+        store_path=args.store,
+        output_dir=args.out,
+        pruner=None if args.no_prune else MedianPruner(n_startup_trials=args.startup_trials),
+        eval_freq=args.eval_freq,
+        eval_workers=args.eval_workers,
+        seed=args.seed
+    )
+    print()
+    print_trials(trials)
@@ -0,0 +1,265 @@
+"""
+Batched Policy Inference
+Runs the deterministic actor of a trained PPO model on a whole batch of
+observations per call, with optional TorchScript/ONNX export for CPU-only
+serving and per-batch latency statistics
+"""
+
+import os
+
+import time
+import argparse
+import numpy as np
+import torch
+from torch import nn
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from src.environment.plant_env import build_observation_space
+
+
+class DeterministicActor(nn.Module):
+    """
+    Deterministic action path of an SB3 ActorCriticPolicy
+
+    features -> policy MLP -> action mean, clipped to the action space
+    bounds. This is what model.predict(obs, deterministic=True) computes for
+    a Box action space, without the per-call numpy/tensor conversion and
+    observation checks.
+    """
+
+    def __init__(self, policy):
+        """
+        Args:
+            policy: SB3 ActorCriticPolicy (model.policy)
+        """
+        super().__init__()
+        self.features_extractor = policy.pi_features_extractor
+        self.policy_net = policy.mlp_extractor.policy_net
+        self.action_net = policy.action_net
+        self.register_buffer('low', torch.tensor(policy.action_space.low, dtype=torch.float32))
+        self.register_buffer('high', torch.tensor(policy.action_space.high, dtype=torch.float32))
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        features = self.features_extractor(obs)
+        actions = self.action_net(self.policy_net(features))
+        return torch.clamp(actions, self.low, self.high)
+
+
+class BatchedPolicy:
+    """
+    Batched inference wrapper with latency tracking
+
+    predict_batch() takes a (batch, obs_dim) array and returns (batch,
+    action_dim) actions with a single forward pass. get_action()/predict()
+    also accept a single observation, so the wrapper can stand in for an SB3
+    model anywhere in the evaluation code.
+    """
+
+    def __init__(self, forward, backend: str, n_threads: Optional[int] = None, history: int = 10000):
+        """
+        Args:
+            forward: Callable float32 array (batch, obs_dim) -> array (batch, action_dim)
+            backend: "torch", "torchscript" or "onnx" (reported in latency stats)
+            n_threads: Torch intra-op threads (None keeps the current setting)
+            history: Most recent calls kept for latency_stats()
+        """
+        self._forward = forward
+        self.backend = backend
+        if n_threads is not None:
+            torch.set_num_threads(n_threads)
+
+        # Per-call latency (ns) and batch size, bounded so long-running services stay at constant memory
+        self.latencies_ns: Deque[int] = deque(maxlen=history)
+        self.batch_sizes: Deque[int] = deque(maxlen=history)
+
+    @classmethod
+    def from_model(cls, model, n_threads: Optional[int] = None) -> "BatchedPolicy":
+        """Wrap a loaded SB3 model (runs on CPU)"""
+        actor = DeterministicActor(model.policy).to("cpu").eval()
+        return cls(_torch_forward(actor), backend="torch", n_threads=n_threads)
+
+    @classmethod
+    def load(cls, path: str, n_threads: Optional[int] = None) -> "BatchedPolicy":
+        """
+        Load a policy by file extension
+
+        Args:
+            path: Saved SB3 model (.zip), TorchScript module (.pt) or ONNX model (.onnx)
+            n_threads: Torch intra-op threads
+
+        Returns:
+            BatchedPolicy
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".zip":
+            from stable_baselines3 import PPO
+            return cls.from_model(PPO.load(path, device="cpu"), n_threads=n_threads)
+        if extension == ".pt":
+            actor = torch.jit.load(path, map_location="cpu").eval()
+            return cls(_torch_forward(actor), backend="torchscript", n_threads=n_threads)
+        if extension == ".onnx":
+            try:
+                import onnxruntime
+            except ImportError as e:
+                raise ImportError("Loading .onnx policies requires onnxruntime (pip install onnxruntime)") from e
+            options = onnxruntime.SessionOptions()
+            if n_threads is not None:
+                options.intra_op_num_threads = n_threads
+            session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+            input_name = session.get_inputs()[0].name
+            return cls(lambda obs: session.run(None, {input_name: obs})[0], backend="onnx")
+        raise ValueError(f"Unknown policy file type: {path}")
+
+    def predict_batch(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Compute actions for a batch of observations
+
+        Args:
+            observations: (batch, obs_dim) array
+
+        Returns:
+            actions: (batch, action_dim) float32 array
+        """
+        observations = np.ascontiguousarray(observations, dtype=np.float32)
+        start = time.perf_counter_ns()
+        actions = self._forward(observations)
+        self.latencies_ns.append(time.perf_counter_ns() - start)
+        self.batch_sizes.append(len(observations))
+        return actions
+
+    def get_action(self, observation: np.ndarray) -> np.ndarray:
+        """Single-observation action (same interface as the baseline policies)"""
+        return self.predict_batch(observation[None])[0]
+
+    def predict(self, observation: np.ndarray, state=None, episode_start=None, deterministic: bool = True):
+        """SB3-compatible predict() (always deterministic)"""
+        observation = np.asarray(observation)
+        if observation.ndim == 1:
+            return self.get_action(observation), state
+        return self.predict_batch(observation), state
+
+    def reset_stats(self):
+        """Clear recorded latencies"""
+        self.latencies_ns.clear()
+        self.batch_sizes.clear()
+
+    def latency_stats(self) -> Dict:
+        """
+        Per-batch latency statistics over the last `history` calls
+
+        Returns:
+            Dictionary with backend, n_batches, mean_batch_size, mean/p50/p95/p99/max
+            latency (ms) and us_per_obs
+        """
+        if not self.latencies_ns:
+            return {'backend': self.backend, 'n_batches': 0}
+        latencies = np.asarray(self.latencies_ns, dtype=np.float64) / 1e6
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            'backend': self.backend,
+            'n_batches': len(latencies),
+            'mean_batch_size': float(np.mean(self.batch_sizes)),
+            'mean_ms': float(np.mean(latencies)),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(np.max(latencies)),
+            'us_per_obs': float(1e3 * np.sum(latencies) / np.sum(self.batch_sizes))
+        }
+
+
+def _torch_forward(actor: nn.Module):
+    """numpy -> numpy forward function for a torch module"""
+    def forward(observations: np.ndarray) -> np.ndarray:
+        with torch.inference_mode():
+            return actor(torch.from_numpy(observations)).numpy()
+    return forward
+
+
+def export_policy(model, path: str, format: str = "torchscript", obs_dim: Optional[int] = None) -> str:
+    """
+    Export the deterministic actor of an SB3 model for CPU-only serving
+
+    Args:
+        model: Loaded SB3 model
+        path: Output file path
+        format: "torchscript" (.pt) or "onnx" (.onnx, dynamic batch dimension)
+        obs_dim: Observation size (default: from the model's observation space)
+
+    Returns:
+        Output file path
+    """
+    actor = DeterministicActor(model.policy).to("cpu").eval()
+    obs_dim = obs_dim or int(np.prod(model.observation_space.shape))
+    example = torch.zeros(1, obs_dim, dtype=torch.float32)
+
+    if format == "torchscript":
+        with torch.inference_mode():
+            traced = torch.jit.trace(actor, example)
+        traced.save(path)
+    elif format == "onnx":
+        torch.onnx.export(
+            actor,
+            (example,),
+            path,
+            input_names=["observation"],
+            output_names=["action"],
+            dynamic_axes={"observation": {0: "batch"}, "action": {0: "batch"}},
+            dynamo=False
+        )
+    else:
+        raise ValueError(f"Unknown export format: {format}")
+    return path
+
+
+def benchmark_latency(policy: BatchedPolicy, obs_dim: int, batch_sizes=(1, 8, 64, 256), n_calls: int = 200) -> Dict[int, Dict]:
+    """
+    Measure per-batch latency for several batch sizes
+
+    Args:
+        policy: BatchedPolicy
+        obs_dim: Observation size
+        batch_sizes: Batch sizes to measure
+        n_calls: Forward passes per batch size (after 10 warm-up calls)
+
+    Returns:
+        {batch_size: latency_stats}
+    """
+    rng = np.random.default_rng(0)
+    results = {}
+    for batch_size in batch_sizes:
+        observations = rng.random((batch_size, obs_dim), dtype=np.float32)
+        for _ in range(10):
+            policy.predict_batch(observations)
+        policy.reset_stats()
+        for _ in range(n_calls):
+            policy.predict_batch(observations)
+        results[batch_size] = policy.latency_stats()
+    policy.reset_stats()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and benchmark batched PPO inference")
+    parser.add_argument("model", type=str, help="Model path (.zip, .pt or .onnx)")
+    parser.add_argument("--export", type=str, default=None, choices=["torchscript", "onnx"], help="Export format (requires a .zip model)")
+    parser.add_argument("--output", type=str, default=None, help="Export path")
+    parser.add_argument("--threads", type=int, default=1, help="Inference threads")
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[1, 8, 64, 256], help="Batch sizes to benchmark")
+    args = parser.parse_args()
+
+    path = args.model
+    if args.export:
+        from stable_baselines3 import PPO
+        extension = ".pt" if args.export == "torchscript" else ".onnx"
+        output = args.output or os.path.splitext(path)[0] + extension
+        path = export_policy(PPO.load(path, device="cpu"), output, format=args.export)
+        print(f"Exported {args.export} policy: {path}")
+
+    policy = BatchedPolicy.load(path, n_threads=args.threads)
+    print(f"\nPer-batch latency ({policy.backend}, {args.threads} thread(s))")
+    print(f"{'batch':>6} {'mean ms':>9} {'p99 ms':>9} {'us/obs':>9}")
+    obs_dim = build_observation_space().shape[0]
+    for batch_size, stats in benchmark_latency(policy, obs_dim, args.batch_sizes).items():
+        print(f"{batch_size:>6} {stats['mean_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['us_per_obs']:>9.2f}")
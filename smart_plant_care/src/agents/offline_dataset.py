@@ -0,0 +1,274 @@
+"""
+Offline Demonstration Dataset
+Mass-generates baseline rollouts with parallel workers into sharded float32
+.npy arrays, and samples random minibatches from the memory-mapped shards
+(behavior cloning / offline RL) without loading the dataset into RAM
+"""
+
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+from src.config import PlantCareConfig, load_config
+
+
+# Arrays of one shard: name -> per-row shape (all float32)
+DATASET_COLUMNS = {
+    'observations': (6,),
+    'actions': (2,),
+    'rewards': (),
+    'dones': (),        # 1.0 on the last step of an episode (terminated or truncated)
+    'terminals': (),    # 1.0 only if the plant died (no bootstrapping past this step)
+}
+
+MANIFEST = "manifest.json"
+
+
+def _generate_shard(
+    policy,
+    config_path: Union[str, PlantCareConfig],
+    scenario: str,
+    n_episodes: int,
+    seed: int,
+    shard_path: str
+) -> Dict:
+    """
+    Roll out n_episodes complete episodes in lock-step and save them as one shard
+
+    Rows are stored episode-major (each episode contiguous), so the row
+    after a non-terminal step is its successor state.
+    """
+    from src.environment.vec_env import PlantCareVecEnv
+    from src.evaluation.harness import _batch_action_fn, _load_policy
+
+    act = _batch_action_fn(_load_policy(policy))
+    env = PlantCareVecEnv(n_episodes, config_path=config_path, weather_scenario=scenario)
+    max_steps = env.max_steps
+
+    observations = np.zeros((max_steps, n_episodes, 6), dtype=np.float32)
+    actions = np.zeros((max_steps, n_episodes, 2), dtype=np.float32)
+    rewards = np.zeros((max_steps, n_episodes), dtype=np.float32)
+    terminals = np.zeros((max_steps, n_episodes), dtype=np.float32)
+    lengths = np.full(n_episodes, max_steps, dtype=np.int64)
+    running = np.ones(n_episodes, dtype=bool)
+
+    obs, _ = env.reset(seed=seed)
+    for t in range(max_steps):
+        action = np.asarray(act(obs), dtype=np.float32)
+        observations[t] = obs
+        actions[t] = action
+        obs, reward, terminated, truncated, _ = env.step(action)
+        rewards[t] = reward
+        terminals[t] = terminated
+        # Episodes that end early are auto-reset by the vector env; drop the continuation
+        ended = running & (terminated | truncated)
+        lengths[ended] = t + 1
+        running &= ~ended
+        if not running.any():
+            break
+    env.close()
+
+    # (time, episode) -> episode-major rows
+    columns = {name: [] for name in DATASET_COLUMNS}
+    for i, length in enumerate(lengths):
+        columns['observations'].append(observations[:length, i])
+        columns['actions'].append(actions[:length, i])
+        columns['rewards'].append(rewards[:length, i])
+        columns['terminals'].append(terminals[:length, i])
+        dones = np.zeros(length, dtype=np.float32)
+        dones[-1] = 1.0
+        columns['dones'].append(dones)
+
+    os.makedirs(shard_path, exist_ok=True)
+    for name, parts in columns.items():
+        np.save(os.path.join(shard_path, name + ".npy"), np.concatenate(parts))
+
+    return {
+        'dir': os.path.basename(shard_path),
+        'rows': int(lengths.sum()),
+        'episodes': n_episodes,
+        'scenario': scenario,
+        'seed': seed,
+        'mean_return': float(np.mean([part.sum() for part in columns['rewards']])),
+    }
+
+
+def generate_dataset(
+    policies: Dict[str, object],
+    path: str,
+    n_episodes: int = 256,
+    scenarios: Sequence[str] = ("normal",),
+    config_path: Union[str, PlantCareConfig] = "config.yaml",
+    episodes_per_shard: int = 64,
+    n_workers: int = 1,
+    seed: int = 0,
+    overwrite: bool = False
+) -> Dict:
+    """
+    Generate a demonstration dataset
+
+    Args:
+        policies: {name: policy}; rule policies, SB3 models or model paths
+        path: Output directory (one subdirectory per shard plus manifest.json)
+        n_episodes: Episodes per policy and scenario
+        scenarios: Weather scenario names
+        config_path: Configuration file path or loaded PlantCareConfig
+        episodes_per_shard: Episodes simulated in lock-step per worker task
+        n_workers: Worker processes (shards are generated in parallel)
+        seed: Base seed; shard k uses seed + k
+        overwrite: Replace an existing dataset
+
+    Returns:
+        Manifest dictionary (also written to path/manifest.json)
+    """
+    from src.evaluation.harness import _process_pool
+
+    if os.path.exists(os.path.join(path, MANIFEST)):
+        if not overwrite:
+            raise FileExistsError(f"Dataset already exists: {path} (pass overwrite=True)")
+        shutil.rmtree(path)
+    os.makedirs(path, exist_ok=True)
+    config = load_config(config_path)
+
+    tasks = []
+    for policy_name, policy in policies.items():
+        for scenario in scenarios:
+            for start in range(0, n_episodes, episodes_per_shard):
+                index = len(tasks)
+                tasks.append((policy_name, policy, scenario, min(episodes_per_shard, n_episodes - start),
+                              seed + index, os.path.join(path, f"shard_{index:05d}")))
+
+    if n_workers > 1:
+        with _process_pool(n_workers) as pool:
+            futures = [
+                pool.submit(_generate_shard, policy, config, scenario, count, shard_seed, shard_path)
+                for _, policy, scenario, count, shard_seed, shard_path in tasks
+            ]
+            shards = [future.result() for future in futures]
+    else:
+        shards = [
+            _generate_shard(policy, config, scenario, count, shard_seed, shard_path)
+            for _, policy, scenario, count, shard_seed, shard_path in tasks
+        ]
+    for shard, task in zip(shards, tasks):
+        shard['policy'] = task[0]
+
+    manifest = {
+        'columns': {name: list(shape) for name, shape in DATASET_COLUMNS.items()},
+        'rows': sum(shard['rows'] for shard in shards),
+        'episodes': sum(shard['episodes'] for shard in shards),
+        'shards': shards,
+    }
+    with open(os.path.join(path, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class OfflineDataset:
+    """
+    Memory-mapped random-access view of a demonstration dataset
+
+    Shards are opened with np.load(mmap_mode='r'); a minibatch copies only
+    its own rows, gathered shard by shard in sorted order so each shard is
+    read sequentially.
+    """
+
+    def __init__(self, path: str, columns: Sequence[str] = ('observations', 'actions')):
+        """
+        Args:
+            path: Directory written by generate_dataset
+            columns: Columns returned by sample() and iter_batches()
+        """
+        self.path = path
+        with open(os.path.join(path, MANIFEST), 'r') as f:
+            self.manifest = json.load(f)
+        self.columns = tuple(columns)
+        self.shards = self.manifest['shards']
+        self._offsets = np.cumsum([0] + [shard['rows'] for shard in self.shards])
+        self._arrays: Dict[tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def sample(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> Dict[str, np.ndarray]:
+        """Uniformly sampled minibatch (with replacement)"""
+        rng = rng or np.random.default_rng()
+        return self.gather(rng.integers(0, len(self), size=batch_size))
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        rng: Optional[np.random.Generator] = None,
+        drop_last: bool = False
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """One epoch of shuffled minibatches (each row exactly once)"""
+        rng = rng or np.random.default_rng()
+        order = rng.permutation(len(self))
+        stop = len(order) - len(order) % batch_size if drop_last else len(order)
+        for start in range(0, stop, batch_size):
+            yield self.gather(order[start:start + batch_size])
+
+    def gather(self, indices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Rows at the given global indices
+
+        Returns:
+            {column: float32 array}, rows in sorted index order
+        """
+        indices = np.sort(np.asarray(indices, dtype=np.int64))
+        shard_ids = np.searchsorted(self._offsets, indices, side='right') - 1
+        bounds = np.flatnonzero(np.diff(shard_ids)) + 1
+        batch = {
+            name: np.empty((len(indices),) + tuple(self.manifest['columns'][name]), dtype=np.float32)
+            for name in self.columns
+        }
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(indices)]):
+            shard = int(shard_ids[lo])
+            local = indices[lo:hi] - self._offsets[shard]
+            for name in self.columns:
+                batch[name][lo:hi] = self._array(shard, name)[local]
+        return batch
+
+    def _array(self, shard: int, name: str) -> np.ndarray:
+        key = (shard, name)
+        array = self._arrays.get(key)
+        if array is None:
+            array = self._arrays[key] = np.load(
+                os.path.join(self.path, self.shards[shard]['dir'], name + ".npy"), mmap_mode='r'
+            )
+        return array
+
+
+if __name__ == "__main__":
+    from src.evaluation.sweep import _build_policy
+
+    parser = argparse.ArgumentParser(description="Generate a demonstration dataset from baseline rollouts")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Configuration file path")
+    parser.add_argument("--policies", type=str, nargs="+", default=["threshold_rule"],
+                        help="Baseline names (fixed_schedule, threshold_rule) or model paths (.zip)")
+    parser.add_argument("--scenarios", type=str, nargs="+", default=["normal"], help="Weather scenarios")
+    parser.add_argument("--episodes", type=int, default=256, help="Episodes per policy and scenario")
+    parser.add_argument("--shard_episodes", type=int, default=64, help="Episodes per shard")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed")
+    parser.add_argument("--out", type=str, default="data/demonstrations", help="Output directory")
+    parser.add_argument("--overwrite", action="store_true", help="Replace an existing dataset")
+    args = parser.parse_args()
+
+    manifest = generate_dataset(
+        {name: _build_policy(name, args.config) for name in args.policies},
+        args.out,
+        n_episodes=args.episodes,
+        scenarios=args.scenarios,
+        config_path=args.config,
+        episodes_per_shard=args.shard_episodes,
+        n_workers=args.workers,
+        seed=args.seed,
+        overwrite=args.overwrite
+    )
+    size_mb = manifest['rows'] * sum(4 * int(np.prod(shape)) for shape in DATASET_COLUMNS.values()) / 2**20
+    print(f"{manifest['episodes']} episodes, {manifest['rows']:,} transitions "
+          f"in {len(manifest['shards'])} shards ({size_mb:.1f} MB): {args.out}")
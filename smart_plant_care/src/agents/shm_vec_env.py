@@ -0,0 +1,174 @@
+"""
+Shared-Memory Subprocess Vectorized Environment
+Worker processes step shards of PlantCareEnv and write observations,
+rewards and dones straight into a multiprocessing.shared_memory ring
+buffer, so only tiny command messages cross the pipes on each step
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from typing import Any, List, Optional, Sequence, Union
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv, VecEnvIndices, VecEnvObs, VecEnvStepReturn
+)
+
+from src.config import PlantCareConfig
+from src.environment.plant_env import build_observation_space, build_action_space
+from src.agents.shm_worker import _buffer_layout, _buffer_size, _map_arrays, _worker
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Multi-process VecEnv backed by a shared memory ring buffer
+
+    The n_envs environments are split into contiguous shards, one per worker
+    process. Actions are written into shared memory by the parent; each
+    worker steps its shard and writes results into the next ring slot. The
+    pipes only carry a (command, slot) tuple per step, so no observation is
+    ever pickled. step_wait() returns views into the ring slot, which stay
+    valid until n_slots further steps have been taken.
+    """
+
+    def __init__(
+        self,
+        n_envs: int,
+        config_path: Union[str, PlantCareConfig] = "config.yaml",
+        weather_scenario: str = "normal",
+        n_workers: Optional[int] = None,
+        n_slots: int = 2,
+        start_method: Optional[str] = None,
+        domain_randomization: bool = False
+    ):
+        """
+        Args:
+            n_envs: Total number of environments
+            config_path: Configuration file path or loaded PlantCareConfig
+            weather_scenario: Weather scenario for every environment
+            n_workers: Number of worker processes (default: one per CPU, at most n_envs)
+            n_slots: Depth of the observation ring buffer (>= 2)
+            start_method: multiprocessing start method (default: forkserver if available)
+            domain_randomization: Randomize physics per environment (training.domain_randomization)
+        """
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+        n_workers = max(1, min(n_workers, n_envs))
+        if n_slots < 2:
+            raise ValueError("n_slots must be at least 2")
+
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        ctx = mp.get_context(start_method)
+
+        self.n_slots = n_slots
+        self._slot = 0
+        self._closed = False
+
+        # Shared ring buffer
+        self._layout = _buffer_layout(n_envs, n_slots)
+        self._shm = shared_memory.SharedMemory(create=True, size=_buffer_size(self._layout))
+        self._arrays = _map_arrays(self._shm.buf, self._layout)
+
+        # Contiguous shards [start, stop) per worker
+        bounds = np.linspace(0, n_envs, n_workers + 1).astype(int)
+        self._shards = list(zip(bounds[:-1], bounds[1:]))
+
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_workers)])
+        self.processes = []
+        for work_remote, remote, (start, stop) in zip(self.work_remotes, self.remotes, self._shards):
+            args = (work_remote, remote, self._shm.name, self._layout, int(start), int(stop),
+                    config_path, weather_scenario, domain_randomization)
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        super().__init__(n_envs, build_observation_space(), build_action_space())
+
+    def reset(self) -> VecEnvObs:
+        """Reset all environments"""
+        self._slot = (self._slot + 1) % self.n_slots
+        for remote in self.remotes:
+            remote.send(('reset', (self._slot, self._seeds, self._options)))
+        for remote in self.remotes:
+            remote.recv()
+        self._reset_seeds()
+        self._reset_options()
+        return self._arrays['obs'][self._slot]
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Publish actions and wake up all workers"""
+        self._arrays['actions'][:] = actions
+        self._slot = (self._slot + 1) % self.n_slots
+        for remote in self.remotes:
+            remote.send(('step', self._slot))
+
+    def step_wait(self) -> VecEnvStepReturn:
+        """Wait for all workers and return views of the current ring slot"""
+        for remote in self.remotes:
+            remote.recv()
+
+        slot = self._slot
+        dones = self._arrays['dones'][slot]
+        infos: List[dict] = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            infos[i] = {
+                'terminal_observation': self._arrays['terminal_obs'][slot, i].copy(),
+                'TimeLimit.truncated': bool(self._arrays['truncated'][slot, i])
+            }
+        return self._arrays['obs'][slot], self._arrays['rewards'][slot], dones, infos
+
+    def close(self) -> None:
+        """Stop workers and release the shared memory block"""
+        if self._closed:
+            return
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self._arrays = None
+        self._shm.close()
+        self._shm.unlink()
+        self._closed = True
+
+    def _dispatch(self, cmd: str, make_payload, indices: VecEnvIndices) -> List[Any]:
+        """Send a command to the workers owning indices and gather their replies in order"""
+        indices = list(self._get_indices(indices))
+        targets = []
+        for remote, (start, stop) in zip(self.remotes, self._shards):
+            owned = [i for i in indices if start <= i < stop]
+            if owned:
+                remote.send((cmd, make_payload(owned)))
+                targets.append(remote)
+        results = []
+        for remote in targets:
+            results.extend(remote.recv() or [])
+        return results
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        """Return attribute from worker environments"""
+        return self._dispatch('get_attr', lambda owned: (attr_name, owned), indices)
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        """Set attribute inside worker environments"""
+        self._dispatch('set_attr', lambda owned: (attr_name, value, owned), indices)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args,
+        indices: VecEnvIndices = None,
+        **method_kwargs
+    ) -> List[Any]:
+        """Call a method of the worker environments"""
+        return self._dispatch(
+            'env_method', lambda owned: (method_name, method_args, method_kwargs, owned), indices
+        )
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> List[bool]:
+        """Worker environments are never wrapped"""
+        return [False for _ in self._get_indices(indices)]
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        """Rendering is not supported"""
+        return [None for _ in range(self.num_envs)]
@@ -0,0 +1,123 @@
+"""
+Shared-Memory Rollout Worker
+Worker side of SharedMemoryVecEnv: buffer layout helpers and the command
+loop. Kept free of Stable-Baselines3/torch imports so worker processes
+start with only NumPy, Gymnasium and the environment loaded
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+from typing import Dict, Tuple, Union
+
+from src.config import PlantCareConfig
+from src.environment.plant_env import PlantCareEnv, build_observation_space, build_action_space
+
+
+def _buffer_layout(n_envs: int, n_slots: int) -> Dict[str, Tuple[Tuple[int, ...], str]]:
+    """Shapes and dtypes of the arrays carved out of the shared block"""
+    obs_dim = build_observation_space().shape[0]
+    act_dim = build_action_space().shape[0]
+    return {
+        'actions': ((n_envs, act_dim), 'float32'),
+        'obs': ((n_slots, n_envs, obs_dim), 'float32'),
+        'terminal_obs': ((n_slots, n_envs, obs_dim), 'float32'),
+        'rewards': ((n_slots, n_envs), 'float32'),
+        'dones': ((n_slots, n_envs), 'bool'),
+        'truncated': ((n_slots, n_envs), 'bool'),
+    }
+
+
+def _map_arrays(buf, layout: Dict[str, Tuple[Tuple[int, ...], str]]) -> Dict[str, np.ndarray]:
+    """Create NumPy views over a shared memory buffer according to layout"""
+    arrays = {}
+    offset = 0
+    for name, (shape, dtype) in layout.items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        # Keep every array 8-byte aligned
+        offset += (count * dtype.itemsize + 7) // 8 * 8
+    return arrays
+
+
+def _buffer_size(layout: Dict[str, Tuple[Tuple[int, ...], str]]) -> int:
+    """Total number of bytes needed for layout"""
+    return sum(
+        (int(np.prod(shape)) * np.dtype(dtype).itemsize + 7) // 8 * 8
+        for shape, dtype in layout.values()
+    )
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; only the parent is responsible for unlinking it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: workers share the parent's resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker(
+    remote,
+    parent_remote,
+    shm_name: str,
+    layout: Dict[str, Tuple[Tuple[int, ...], str]],
+    start: int,
+    stop: int,
+    config_path: Union[str, PlantCareConfig],
+    weather_scenario: str,
+    domain_randomization: bool
+):
+    """Worker loop: owns environments [start, stop) and serves commands from the parent"""
+    parent_remote.close()
+    shm = _attach(shm_name)
+    arrays = _map_arrays(shm.buf, layout)
+    envs = [PlantCareEnv(config_path=config_path, weather_scenario=weather_scenario,
+                         domain_randomization=domain_randomization)
+            for _ in range(start, stop)]
+
+    try:
+        while True:
+            cmd, data = remote.recv()
+            if cmd == 'step':
+                slot = data
+                actions = arrays['actions']
+                for i, env in enumerate(envs, start=start):
+                    obs, reward, terminated, truncated, _ = env.step(actions[i])
+                    done = terminated or truncated
+                    if done:
+                        arrays['terminal_obs'][slot, i] = obs
+                        obs, _ = env.reset()
+                    arrays['obs'][slot, i] = obs
+                    arrays['rewards'][slot, i] = reward
+                    arrays['dones'][slot, i] = done
+                    arrays['truncated'][slot, i] = truncated and not terminated
+                remote.send(None)
+            elif cmd == 'reset':
+                slot, seeds, options = data
+                for i, env in enumerate(envs, start=start):
+                    obs, _ = env.reset(seed=seeds[i], options=options[i] or None)
+                    arrays['obs'][slot, i] = obs
+                remote.send(None)
+            elif cmd == 'get_attr':
+                name, indices = data
+                remote.send([getattr(envs[i - start], name) for i in indices])
+            elif cmd == 'set_attr':
+                name, value, indices = data
+                for i in indices:
+                    setattr(envs[i - start], name, value)
+                remote.send(None)
+            elif cmd == 'env_method':
+                name, args, kwargs, indices = data
+                remote.send([getattr(envs[i - start], name)(*args, **kwargs) for i in indices])
+            elif cmd == 'close':
+                break
+            else:
+                raise NotImplementedError(f"Unknown worker command: {cmd}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for env in envs:
+            env.close()
+        del arrays
+        shm.close()
+        remote.close()
@@ -4,28 +4,170 @@ Using Stable-Baselines3 library
 """
 
 import os
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
-import yaml
 import torch
 import numpy as np
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.callbacks import EvalCallback, CheckpointCallback
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv, VecMonitor
+from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.logger import configure
 import argparse
+from typing import Optional, Union
 
-from src.environment import PlantCareEnv
+from src.config import PlantCareConfig, load_config
+from src.environment import PlantCareEnv, StepProfiler
+from src.environment.vec_env import PlantCareVecEnv
+from src.agents.vec_env_adapter import PlantCareSB3VecEnv
+from src.agents.shm_vec_env import SharedMemoryVecEnv
+from src.agents.inference import BatchedPolicy
+from src.agents.offline_dataset import OfflineDataset
+from src.agents.callbacks import (
+    AsyncCheckpointCallback, AsyncEvalCallback, StepProfileCallback, TrainingTelemetryCallback
+)
+from src.agents.checkpoints import (
+    CheckpointWriter, capture_training_state, latest_checkpoint, load_checkpoint, restore_training_state
+)
+from src.evaluation import evaluate_policy
+
+
+def make_training_env(
+    config_path: Union[str, PlantCareConfig],
+    n_envs: int,
+    backend: str = "vectorized",
+    seed: int = 42,
+    n_workers: Optional[int] = None,
+    domain_randomization: bool = False
+) -> VecEnv:
+    """
+    Create the vectorized training environment
+
+    Args:
+        config_path: Configuration file path or loaded PlantCareConfig
+        n_envs: Number of parallel environments
+        backend: "vectorized" (native PlantCareVecEnv), "dummy" (in-process
+            DummyVecEnv), "subproc" (SB3 SubprocVecEnv) or "shm" (shared
+            memory worker processes)
+        seed: Random seed
+        n_workers: Worker processes for the "shm" backend (default: one per CPU)
+        domain_randomization: Randomize physics per environment and add sensor
+            noise (training.domain_randomization)
+
+    Returns:
+        SB3 VecEnv with episode monitoring
+    """
+    if backend == "vectorized":
+        env = VecMonitor(PlantCareSB3VecEnv(PlantCareVecEnv(
+            n_envs, config_path=config_path, domain_randomization=domain_randomization
+        )))
+    elif backend == "shm":
+        env = VecMonitor(SharedMemoryVecEnv(
+            n_envs, config_path=config_path, n_workers=n_workers,
+            domain_randomization=domain_randomization
+        ))
+    elif backend in ("dummy", "subproc"):
+        # make_vec_env already wraps each env in a Monitor
+        return make_vec_env(
+            lambda: PlantCareEnv(config_path=config_path, domain_randomization=domain_randomization),
+            n_envs=n_envs,
+            seed=seed,
+            vec_env_cls=DummyVecEnv if backend == "dummy" else SubprocVecEnv
+        )
+    else:
+        raise ValueError(f"Unknown vec_backend: {backend}")
+
+    env.seed(seed)
+    return env
+
+
+def attach_step_profiler(env: VecEnv) -> Optional[StepProfiler]:
+    """
+    Profile the environments stepped in this process
+
+    Args:
+        env: Environment returned by make_training_env
+
+    Returns:
+        StepProfiler over the native vectorized env or the DummyVecEnv
+        members; None for backends that step in worker processes
+    """
+    inner = env.venv if isinstance(env, VecMonitor) else env
+    if isinstance(inner, PlantCareSB3VecEnv):
+        return inner.venv.enable_profiling()
+    if isinstance(env, DummyVecEnv):
+        profiler = StepProfiler()
+        for member in env.envs:
+            member.unwrapped.enable_profiling(profiler)
+        return profiler
+    return None
+
+
+def pretrain_behavior_cloning(
+    model: PPO,
+    dataset_path: str,
+    n_steps: int = 2000,
+    batch_size: int = 256,
+    learning_rate: float = 1e-3,
+    seed: int = 42
+) -> float:
+    """
+    Warm-start the PPO actor on demonstrations (behavior cloning)
+
+    Minimizes the negative log-likelihood of the demonstrated actions under
+    the policy distribution. Minibatches are sampled from the memory-mapped
+    dataset, so only batch_size rows are in memory at a time.
+
+    Args:
+        model: PPO model to pretrain in place
+        dataset_path: Directory written by src.agents.offline_dataset
+        n_steps: Gradient steps
+        batch_size: Transitions per step
+        learning_rate: Adam learning rate (separate optimizer, PPO's state is untouched)
+        seed: Minibatch sampling seed
+
+    Returns:
+        Mean loss over the last 100 steps
+    """
+    dataset = OfflineDataset(dataset_path)
+    rng = np.random.default_rng(seed)
+    policy = model.policy
+    optimizer = torch.optim.Adam(policy.parameters(), lr=learning_rate)
+    policy.set_training_mode(True)
+
+    losses = []
+    for step in range(n_steps):
+        batch = dataset.sample(batch_size, rng)
+        observations = torch.as_tensor(batch['observations'], device=policy.device)
+        actions = torch.as_tensor(batch['actions'], device=policy.device)
+        _, log_prob, entropy = policy.evaluate_actions(observations, actions)
+        loss = -log_prob.mean()
+
+        optimizer.zero_grad()
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(policy.parameters(), model.max_grad_norm)
+        optimizer.step()
+        losses.append(loss.item())
+
+        if (step + 1) % max(1, n_steps // 10) == 0:
+            print(f"  BC step {step + 1}/{n_steps}: loss={np.mean(losses[-100:]):.4f}")
+
+    policy.set_training_mode(False)
+    return float(np.mean(losses[-100:]))
 
 
 def train_ppo_agent(
-    config_path: str = "config.yaml",
+    config_path: Union[str, PlantCareConfig] = "config.yaml",
     total_timesteps: int = 5_000_000,
     device: str = "auto",
     save_path: str = "./models/",
     log_path: str = "./logs/",
-    seed: int = 42
+    seed: int = 42,
+    pretrain_dataset: Optional[str] = None,
+    pretrain_steps: int = 2000,
+    profile: bool = False,
+    resume: Optional[str] = None,
+    callback_after_eval: Optional[BaseCallback] = None,
+    progress_bar: bool = True
 ):
     """
     Train PPO agent
@@ -37,10 +179,18 @@ def train_ppo_agent(
         save_path: Model save path
         log_path: Log save path
         seed: Random seed
+        pretrain_dataset: Demonstration dataset for behavior cloning before PPO (optional)
+        pretrain_steps: Behavior cloning gradient steps
+        profile: Log per-phase environment step timings to TensorBoard
+        resume: "latest" (newest checkpoint in save_path/checkpoints) or a
+            checkpoint path to continue training from; total_timesteps
+            includes the steps already trained
+        callback_after_eval: Callback run after every finished evaluation
+            (e.g. early stopping); returning False stops training
+        progress_bar: Show the SB3 progress bar
     """
     # Load configuration
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path)
     
     # Create save directories
     os.makedirs(save_path, exist_ok=True)
@@ -63,37 +213,41 @@ def train_ppo_agent(
     
     # Create vectorized environment (parallel training)
     print("Creating training environment...")
-    n_envs = 4  # 4 parallel environments
-    env = make_vec_env(
-        lambda: PlantCareEnv(config_path=config_path),
+    n_envs = config.training.n_envs
+    vec_backend = config.training.vec_backend
+    domain_randomization = config.training.domain_randomization.enabled
+    print(f"  {n_envs} environments, backend: {vec_backend}, "
+          f"domain randomization: {'on' if domain_randomization else 'off'}")
+    env = make_training_env(
+        config,
         n_envs=n_envs,
-        seed=seed
+        backend=vec_backend,
+        seed=seed,
+        n_workers=config.training.n_workers,
+        domain_randomization=domain_randomization
     )
     
-    # Create evaluation environment
-    eval_env = PlantCareEnv(config_path=config_path)
-    
     # Configure PPO parameters
-    ppo_config = config['ppo']
+    ppo_config = config.ppo
     
     print("Initializing PPO agent...")
     model = PPO(
         policy="MlpPolicy",
         env=env,
-        learning_rate=ppo_config['learning_rate'],
-        n_steps=ppo_config['n_steps'],
-        batch_size=ppo_config['batch_size'],
-        n_epochs=ppo_config['n_epochs'],
-        gamma=ppo_config['gamma'],
-        gae_lambda=ppo_config['gae_lambda'],
-        clip_range=ppo_config['clip_range'],
-        ent_coef=ppo_config['ent_coef'],
-        vf_coef=ppo_config['vf_coef'],
-        max_grad_norm=ppo_config['max_grad_norm'],
+        learning_rate=ppo_config.learning_rate,
+        n_steps=ppo_config.n_steps,
+        batch_size=ppo_config.batch_size,
+        n_epochs=ppo_config.n_epochs,
+        gamma=ppo_config.gamma,
+        gae_lambda=ppo_config.gae_lambda,
+        clip_range=ppo_config.clip_range,
+        ent_coef=ppo_config.ent_coef,
+        vf_coef=ppo_config.vf_coef,
+        max_grad_norm=ppo_config.max_grad_norm,
         policy_kwargs=dict(
             net_arch=dict(
-                pi=ppo_config['policy_network']['net_arch'],
-                vf=ppo_config['value_network']['net_arch']
+                pi=list(ppo_config.policy_network.net_arch),
+                vf=list(ppo_config.value_network.net_arch)
             )
         ),
         device=device,
@@ -102,28 +256,71 @@ def train_ppo_agent(
         tensorboard_log=log_path
     )
     
+    # Resume from a checkpoint (weights, optimizer, step counters, RNG states)
+    checkpoint_dir = os.path.join(save_path, "checkpoints")
+    resumed = False
+    if resume:
+        checkpoint_path = latest_checkpoint(checkpoint_dir) if resume == "latest" else resume
+        if checkpoint_path is None:
+            print(f"No checkpoint in {checkpoint_dir}, starting from scratch")
+        else:
+            restore_training_state(model, load_checkpoint(checkpoint_path))
+            resumed = True
+            print(f"Resumed from {checkpoint_path} at {model.num_timesteps:,} steps")
+    
+    # Warm start from baseline demonstrations
+    if pretrain_dataset and not resumed:
+        print(f"Behavior cloning pretraining on {pretrain_dataset}...")
+        pretrain_behavior_cloning(
+            model, pretrain_dataset, n_steps=pretrain_steps,
+            batch_size=ppo_config.batch_size, seed=seed
+        )
+    
     # Configure callbacks
     print("Configuring training callbacks...")
     
-    # Evaluation callback (evaluate every 10k steps)
-    eval_callback = EvalCallback(
-        eval_env,
+    # Evaluation callback: policy snapshots are evaluated in background
+    # processes over seeds × scenarios while training continues
+    eval_callback = AsyncEvalCallback(
+        config,
+        eval_freq=max(config.training.eval_freq // n_envs, 1),
+        seeds=range(1000, 1000 + config.training.n_eval_episodes),
+        scenarios=config.training.eval_scenarios,
+        n_workers=config.training.eval_workers,
         best_model_save_path=save_path,
         log_path=log_path,
-        eval_freq=10_000,
-        n_eval_episodes=5,
-        deterministic=True,
-        render=False
+        callback_after_eval=callback_after_eval
     )
+    if resumed:
+        # Keep the best score and the history of the interrupted run
+        n_kept = eval_callback.load_evaluations(max_timesteps=model.num_timesteps)
+        if n_kept or eval_callback.best_mean_reward > -np.inf:
+            print(f"  Continuing {n_kept} evaluations, best mean reward {eval_callback.best_mean_reward:.2f}")
     
-    # Checkpoint callback (save every 50k steps)
-    checkpoint_callback = CheckpointCallback(
-        save_freq=50_000 // n_envs,  # Divide by number of environments
-        save_path=save_path,
-        name_prefix="ppo_checkpoint"
+    # Checkpoint callback: the training state is copied in memory and written
+    # by a background thread, keeping the latest and the best checkpoints
+    checkpoint_writer = CheckpointWriter(
+        checkpoint_dir,
+        keep_last=config.training.keep_checkpoints,
+        keep_best=config.training.keep_best_checkpoints
+    )
+    checkpoint_callback = AsyncCheckpointCallback(
+        checkpoint_writer,
+        save_freq=max(config.training.save_freq // n_envs, 1)  # Divide by number of environments
     )
     
-    callbacks = [eval_callback, checkpoint_callback]
+    # Throughput telemetry (steps/s, rollout vs update time, memory, worker CPU)
+    telemetry_callback = TrainingTelemetryCallback()
+    
+    callbacks = [eval_callback, checkpoint_callback, telemetry_callback]
+    
+    # Step phase timings (opt-in; environments run uninstrumented otherwise)
+    if profile:
+        profiler = attach_step_profiler(env)
+        if profiler is None:
+            print(f"  Step profiling is not available for the {vec_backend} backend")
+        else:
+            callbacks.append(StepProfileCallback(profiler))
     
     # Start training
     print("\nStarting training...\n")
@@ -134,12 +331,14 @@ def train_ppo_agent(
     
     try:
         model.learn(
-            total_timesteps=total_timesteps,
+            total_timesteps=max(total_timesteps - model.num_timesteps, 0),
             callback=callbacks,
-            progress_bar=True
+            progress_bar=progress_bar,
+            reset_num_timesteps=not resumed
         )
     except KeyboardInterrupt:
         print("\nTraining interrupted by user")
+        checkpoint_writer.submit(capture_training_state(model))
     
     elapsed_time = time.time() - start_time
     
@@ -151,18 +350,28 @@ def train_ppo_agent(
     print("Training complete!")
     print("=" * 60)
     print(f"Training duration: {elapsed_time / 3600:.2f} hours")
+    telemetry = telemetry_callback.summary()
+    if telemetry:
+        print(f"Throughput: {telemetry['sps']:,.0f} steps/s, "
+              f"rollout collection {100 * telemetry['rollout_fraction']:.0f}% of training time")
     print(f"Final model saved at: {final_model_path}.zip")
     print(f"Best model saved at: {os.path.join(save_path, 'best_model.zip')}")
     print("=" * 60)
     
     # Cleanup
     env.close()
-    eval_env.close()
+    eval_callback.close()
+    checkpoint_writer.close()
     
     return model
 
 
-def test_trained_model(model_path: str, config_path: str = "config.yaml", n_episodes: int = 5):
+def test_trained_model(
+    model_path: str,
+    config_path: str = "config.yaml",
+    n_episodes: int = 5,
+    n_workers: int = 1
+):
     """
     Test trained model
     
@@ -170,72 +379,68 @@ def test_trained_model(model_path: str, config_path: str = "config.yaml", n_epis
         model_path: Model file path (.zip)
         config_path: Configuration file path
         n_episodes: Number of test episodes
+        n_workers: Evaluation worker processes (each loads its own copy of the model)
     """
     print("=" * 60)
     print("Testing trained PPO model")
     print("=" * 60 + "\n")
     
-    # Load model
+    # Test: all episodes step in lock-step with one batched forward pass per
+    # tick; with several workers each process loads its own copy of the model
     print(f"Loading model: {model_path}")
-    model = PPO.load(model_path)
-    
-    # Create environment
-    env = PlantCareEnv(config_path=config_path)
-    
-    # Test
-    results = {
-        'avg_health': [],
-        'total_water': [],
-        'total_energy': [],
-        'violations': []
-    }
+    if n_workers > 1:
+        policy = model_path
+        backend = "process"
+    else:
+        policy = BatchedPolicy.load(model_path)
+        backend = "batched"
+    summary, results = evaluate_policy(
+        policy,
+        config_path=config_path,
+        seeds=range(42, 42 + n_episodes),
+        n_workers=n_workers,
+        backend=backend
+    )
     
     for episode in range(n_episodes):
-        obs, info = env.reset(seed=42 + episode)
-        terminated = False
-        truncated = False
-        total_reward = 0
-        
-        while not (terminated or truncated):
-            action, _states = model.predict(obs, deterministic=True)
-            obs, reward, terminated, truncated, info = env.step(action)
-            total_reward += reward
-        
-        results['avg_health'].append(info['avg_health'])
-        results['total_water'].append(info['total_water_used'])
-        results['total_energy'].append(info['total_energy_used'])
-        results['violations'].append(info['total_violations'])
-        
-        print(f"Episode {episode + 1}: Health={info['avg_health']:.1f}, "
-              f"Water={info['total_water_used']:.1f}ml, Reward={total_reward:.2f}")
+        print(f"Episode {episode + 1}: Health={results['avg_health'][episode]:.1f}, "
+              f"Water={results['total_water'][episode]:.1f}ml, Reward={results['reward'][episode]:.2f}")
     
     print("\n" + "=" * 60)
     print("Test Results")
     print("=" * 60)
-    print(f"Average health: {np.mean(results['avg_health']):.1f} ± {np.std(results['avg_health']):.1f}")
-    print(f"Average water usage: {np.mean(results['total_water']):.1f} ml")
-    print(f"Average energy usage: {np.mean(results['total_energy']):.1f} Wh")
-    print(f"Average violations: {np.mean(results['violations']):.1f} hours")
+    print(f"Average health: {summary['avg_health_mean']:.1f} ± {summary['avg_health_std']:.1f}")
+    print(f"Average water usage: {summary['total_water_mean']:.1f} ml")
+    print(f"Average energy usage: {summary['total_energy_mean']:.1f} Wh")
+    print(f"Average violations: {summary['violations_mean']:.1f} hours")
+    if backend == "batched":
+        latency = policy.latency_stats()
+        print(f"Inference latency: {latency['mean_ms']:.3f} ms/batch "
+              f"(p99 {latency['p99_ms']:.3f} ms, batch size {latency['mean_batch_size']:.1f})")
     print("=" * 60)
-    
-    env.close()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Train PPO agent for plant care")
-    parser.add_argument("--config", type=str, default="../../config.yaml", help="Configuration file path")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Configuration file path")
     parser.add_argument("--timesteps", type=int, default=1_000_000, help="Total training steps")
     parser.add_argument("--device", type=str, default="auto", choices=["auto", "cuda", "cpu"], help="Training device")
-    parser.add_argument("--save_path", type=str, default="../../models/", help="Model save path")
-    parser.add_argument("--log_path", type=str, default="../../logs/", help="Log save path")
+    parser.add_argument("--save_path", type=str, default="./models/", help="Model save path")
+    parser.add_argument("--log_path", type=str, default="./logs/", help="Log save path")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
     parser.add_argument("--test", type=str, default=None, help="Test model path")
+    parser.add_argument("--eval_workers", type=int, default=1, help="Worker processes for --test evaluation")
+    parser.add_argument("--pretrain", type=str, default=None, help="Demonstration dataset for behavior cloning warm start")
+    parser.add_argument("--pretrain_steps", type=int, default=2000, help="Behavior cloning gradient steps")
+    parser.add_argument("--profile", action="store_true", help="Log per-phase environment step timings")
+    parser.add_argument("--resume", type=str, nargs="?", const="latest", default=None,
+                        help="Continue from a checkpoint (default: latest in <save_path>/checkpoints)")
     
     args = parser.parse_args()
     
     if args.test:
         # Test mode
-        test_trained_model(args.test, args.config)
+        test_trained_model(args.test, args.config, n_workers=args.eval_workers)
     else:
         # Training mode
         train_ppo_agent(
@@ -244,5 +449,9 @@ if __name__ == "__main__":
             device=args.device,
             save_path=args.save_path,
             log_path=args.log_path,
-            seed=args.seed
+            seed=args.seed,
+            pretrain_dataset=args.pretrain,
+            pretrain_steps=args.pretrain_steps,
+            profile=args.profile,
+            resume=args.resume
         )
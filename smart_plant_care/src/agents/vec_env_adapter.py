@@ -0,0 +1,109 @@
+"""
+Stable-Baselines3 adapter for the native vectorized environment
+Exposes PlantCareVecEnv through SB3's VecEnv interface
+"""
+
+import numpy as np
+from typing import Any, List, Optional, Sequence
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv, VecEnvIndices, VecEnvObs, VecEnvStepReturn
+)
+
+from src.environment.vec_env import PlantCareVecEnv
+
+
+class PlantCareSB3VecEnv(VecEnv):
+    """
+    SB3 VecEnv view of a PlantCareVecEnv
+
+    SB3 expects dones instead of terminations/truncations and a list of
+    per-environment info dicts carrying "terminal_observation" and
+    "TimeLimit.truncated" when an episode ends. Per-step info dicts are
+    only populated for finished environments to keep step() cheap.
+    """
+
+    def __init__(self, venv: PlantCareVecEnv):
+        """
+        Args:
+            venv: Native vectorized plant care environment
+        """
+        self.venv = venv
+        self._actions = None
+        super().__init__(venv.num_envs, venv.single_observation_space, venv.single_action_space)
+
+    def reset(self) -> VecEnvObs:
+        """Reset all environments (uses the seed set by seed(), if any)"""
+        observations, infos = self.venv.reset(seed=self._seeds[0])
+        self.reset_infos = [self._env_info(infos, i) for i in range(self.num_envs)]
+        self._reset_seeds()
+        self._reset_options()
+        return observations
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """Store actions for the next step_wait() call"""
+        self._actions = actions
+
+    def step_wait(self) -> VecEnvStepReturn:
+        """Step all environments and convert the result to SB3 conventions"""
+        observations, rewards, terminations, truncations, infos = self.venv.step(self._actions)
+        dones = terminations | truncations
+
+        step_infos: List[dict] = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            info = self._env_info(infos['final_info'], i)
+            info['terminal_observation'] = infos['final_obs'][i]
+            info['TimeLimit.truncated'] = bool(truncations[i] and not terminations[i])
+            step_infos[i] = info
+
+        return observations, rewards.astype(np.float32), dones, step_infos
+
+    def close(self) -> None:
+        """Close the underlying environment"""
+        self.venv.close()
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        """Attributes are shared by all sub-environments of the native vector env"""
+        value = getattr(self.venv, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        """Set a shared attribute of the underlying vector env (all indices only)"""
+        self._require_all_indices(indices, "set_attr")
+        setattr(self.venv, attr_name, value)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args,
+        indices: VecEnvIndices = None,
+        **method_kwargs
+    ) -> List[Any]:
+        """Call a method of the underlying vector env once (all indices only), result repeated per index"""
+        self._require_all_indices(indices, "env_method")
+        result = getattr(self.venv, method_name)(*method_args, **method_kwargs)
+        return [result for _ in range(self.num_envs)]
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> List[bool]:
+        """Sub-environments are never wrapped"""
+        return [False for _ in self._get_indices(indices)]
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        """Rendering is not supported"""
+        return [None for _ in range(self.num_envs)]
+
+    def _require_all_indices(self, indices: VecEnvIndices, operation: str):
+        """State is shared by all sub-environments, so per-index updates cannot be honoured"""
+        if sorted(set(self._get_indices(indices))) != list(range(self.num_envs)):
+            raise ValueError(
+                f"{operation} on a subset of sub-environments is not supported by the native "
+                f"vectorized env (its state is shared); pass indices=None"
+            )
+
+    @staticmethod
+    def _env_info(infos: dict, index: int) -> dict:
+        """Extract the info dict of one sub-environment"""
+        return {
+            key: value[index].item()
+            for key, value in infos.items()
+            if not key.startswith(('_', 'final'))
+        }
@@ -1,7 +1,11 @@
 """基线策略模块"""
 
-from .fixed_schedule import FixedSchedulePolicy
-from .threshold_rule import ThresholdRulePolicy
+from ..lazy import lazy_exports
 
-__all__ = ['FixedSchedulePolicy', 'ThresholdRulePolicy']
+__all__ = ['FixedSchedulePolicy', 'ThresholdRulePolicy', 'MPCPolicy']
 
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'FixedSchedulePolicy': '.fixed_schedule',
+    'ThresholdRulePolicy': '.threshold_rule',
+    'MPCPolicy': '.mpc',
+})
@@ -4,13 +4,12 @@ Water and light at fixed times daily (non-intelligent)
 """
 
 import numpy as np
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 
-from src.environment import PlantCareEnv
-from typing import Dict, List
-import yaml
+from src.config import PlantCareConfig, load_config
+
+if TYPE_CHECKING:
+    from src.environment import PlantCareEnv
 
 
 class FixedSchedulePolicy:
@@ -20,14 +19,13 @@ class FixedSchedulePolicy:
     - Lamp on at 6am, off at 10pm
     """
     
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: Union[str, PlantCareConfig] = "config.yaml"):
         """Initialize fixed schedule"""
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        params = load_config(config_path).baselines.fixed_schedule
         
-        self.water_times = config['baselines']['fixed_schedule']['water_times']
-        self.water_amount = config['baselines']['fixed_schedule']['water_amount']
-        self.lamp_schedule = config['baselines']['fixed_schedule']['lamp_schedule']
+        self.water_times = params.water_times
+        self.water_amount = params.water_amount
+        self.lamp_schedule = params.lamp_schedule
     
     def get_action(self, observation: np.ndarray) -> np.ndarray:
         """
@@ -53,77 +51,29 @@ class FixedSchedulePolicy:
 
 def evaluate_policy(
     policy: FixedSchedulePolicy,
-    env: PlantCareEnv,
+    env: "PlantCareEnv",
     n_episodes: int = 5,
     seed: int = 42
-) -> Dict:
+) -> Tuple[Dict, Dict]:
     """
     Evaluate policy performance
     
     Returns:
         metrics: Dictionary containing avg health, water usage, energy, etc.
     """
-    results = {
-        'avg_health': [],
-        'final_health': [],
-        'total_water': [],
-        'total_energy': [],
-        'violations': [],
-        'efficiency': []
-    }
-    
-    for episode in range(n_episodes):
-        obs, info = env.reset(seed=seed + episode)
-        terminated = False
-        truncated = False
-        
-        while not (terminated or truncated):
-            action = policy.get_action(obs)
-            obs, reward, terminated, truncated, info = env.step(action)
-        
-        # Record metrics
-        avg_health = info['avg_health']
-        final_health = obs[4]  # plant_health
-        total_water = info['total_water_used']
-        total_energy = info['total_energy_used']
-        violations = info['total_violations']
-        
-        # Efficiency = health gain / (water + λ·energy)
-        efficiency = avg_health / (total_water + 0.001 * total_energy + 1e-6)
-        
-        results['avg_health'].append(avg_health)
-        results['final_health'].append(final_health)
-        results['total_water'].append(total_water)
-        results['total_energy'].append(total_energy)
-        results['violations'].append(violations)
-        results['efficiency'].append(efficiency)
-        
-        print(f"Episode {episode + 1}/{n_episodes}: "
-              f"Avg Health={avg_health:.1f}, "
-              f"Water={total_water:.1f}ml, "
-              f"Violations={violations}")
-    
-    # Calculate statistics
-    summary = {
-        'avg_health_mean': np.mean(results['avg_health']),
-        'avg_health_std': np.std(results['avg_health']),
-        'final_health_mean': np.mean(results['final_health']),
-        'total_water_mean': np.mean(results['total_water']),
-        'total_energy_mean': np.mean(results['total_energy']),
-        'violations_mean': np.mean(results['violations']),
-        'efficiency_mean': np.mean(results['efficiency'])
-    }
-    
-    return summary, results
+    from src.evaluation.harness import evaluate_in_env
+    return evaluate_in_env(policy, env, seeds=range(seed, seed + n_episodes))
 
 
 if __name__ == "__main__":
+    from src.environment import PlantCareEnv
+
     print("=" * 60)
     print("Fixed Schedule Baseline Policy Evaluation")
     print("=" * 60 + "\n")
     
     # Create environment
-    config_path = "../../config.yaml"
+    config_path = "config.yaml"
     env = PlantCareEnv(config_path=config_path)
     
     # Create policy
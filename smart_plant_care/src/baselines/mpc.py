@@ -0,0 +1,347 @@
+"""
+Model-Predictive Control Baseline
+Random-shooting planner: at every decision thousands of water / lamp
+action sequences are simulated over the planning horizon with the batched
+physics model, scored with the environment's reward, and the first action
+of the best sequence is applied
+"""
+
+import time
+import dataclasses
+import numpy as np
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple, Union
+
+from src.config import PlantCareConfig, load_config
+from src.environment import PlantPhysics, WeatherScenario
+
+if TYPE_CHECKING:
+    from src.environment import PlantCareEnv
+
+
+class MPCPolicy:
+    """
+    Random-shooting MPC policy
+
+    The plant state comes from the bound environment (env.get_state(),
+    exact) or, without one, from the observation (so the policy also runs
+    in the evaluation harness and the controller). The weather over the
+    horizon is forecast with the scenario's noise-free diurnal curves and
+    its evaporation model; the harness switches an unbound policy to the
+    scenario under evaluation (for_scenario), the controller plans with the
+    scenario the policy was built for.
+
+    Candidates are simulated in chunks sized from the measured cost per
+    chunk and per candidate, so a slow machine evaluates fewer candidates.
+    The budget is a hard deadline: the simulation checks it before every
+    horizon step and abandons a chunk that would overrun it. The decision
+    then uses the best plan of the completed chunks, or, if none completed,
+    the previous best plan shifted by one step (do nothing without one),
+    which is not simulated.
+
+    predict_batch() shares one budget across all rows of a batch, so a
+    controller tick costs at most budget_ms whatever the number of pots;
+    with many pots per budget most rows fall back to doing nothing, so
+    MPC suits controllers with a handful of pots.
+    """
+
+    def __init__(
+        self,
+        config_path: Union[str, PlantCareConfig] = "config.yaml",
+        env: Optional["PlantCareEnv"] = None,
+        weather_scenario: Union[str, WeatherScenario, None] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            config_path: Configuration file path or loaded PlantCareConfig (baselines.mpc)
+            env: Environment to read the exact state from (optional)
+            weather_scenario: Scenario of the weather forecast (default: the env's, else "normal")
+            seed: Seed of the candidate sampler
+        """
+        config = load_config(config_path)
+        params = config.baselines.mpc
+
+        self.config = config
+        self.seed = seed
+        self.env = env
+        if weather_scenario is None:
+            weather_scenario = env.scenario if env is not None else "normal"
+        self.physics = env.physics if env is not None else PlantPhysics(config, weather_scenario)
+        self.weather_scenario = self.physics.scenario.name
+        self.forecast_temperature, self.forecast_light = self.physics.weather.curves(weather_scenario)
+
+        self.timestep_hours = config.environment.timestep_hours
+        self.horizon = max(params.horizon_hours // self.timestep_hours, 1)
+        self.n_candidates = params.n_candidates
+        self.chunk_size = params.chunk_size
+        self.budget_ns = int(params.budget_ms * 1e6)
+        self.water_levels = np.asarray(params.water_levels, dtype=np.float64)
+        self.water_probability = params.water_probability
+
+        reward = config.reward
+        self.alpha, self.beta, self.gamma, self.delta = reward.alpha, reward.beta, reward.gamma, reward.delta
+        self.constraints = reward.constraints
+        self.rng = np.random.default_rng(seed)
+
+        # Best plan of the previous decision (water, lamp per step) and the hour it starts at
+        self._plan: Optional[np.ndarray] = None
+        self._plan_hour: Optional[int] = None
+
+        # Planning statistics of the last decision (or batch)
+        self.last_candidates = 0
+        self.last_planning_ms = 0.0
+        self.last_fallbacks = 0
+
+        # Cost model of one chunk: fixed per-chunk overhead + per-candidate time (ns)
+        self._chunk_overhead_ns, self._candidate_ns = self._calibrate()
+
+    def cache_key(self) -> Dict[str, Any]:
+        """Stable identity for result caches: planner parameters, forecast scenario and seed"""
+        return {
+            'params': dataclasses.asdict(self.config.baselines.mpc),
+            'weather_scenario': self.weather_scenario,
+            'seed': self.seed,
+        }
+
+    def for_scenario(self, weather_scenario: Union[str, WeatherScenario]) -> "MPCPolicy":
+        """Unbound copy that forecasts weather_scenario (self if bound to an env or already matching)"""
+        name = weather_scenario.name if isinstance(weather_scenario, WeatherScenario) else weather_scenario
+        if self.env is not None or name == self.weather_scenario:
+            return self
+        return MPCPolicy(self.config, weather_scenario=weather_scenario, seed=self.seed)
+
+    def get_action(self, observation: np.ndarray) -> np.ndarray:
+        """
+        Plan from the current state and return the first action
+
+        Args:
+            observation: [soil_moisture, temperature, light_level, hour_of_day, plant_health, hours_since_water]
+
+        Returns:
+            action: [water_amount, lamp_on]
+        """
+        state = self.env.get_state() if self.env is not None else self._observation_state(observation)
+        return self.plan(state)
+
+    def predict_batch(self, observations: np.ndarray) -> np.ndarray:
+        """
+        Plan for a batch of observations within one budget_ms
+
+        Rows are planned in turn, each until an even share of the time that
+        is left; a row whose share is too short for any chunk gets the
+        do-nothing action. The rows are unrelated plants, so the previous
+        best plan is neither used nor updated.
+
+        Args:
+            observations: (batch, 6) observations
+
+        Returns:
+            actions: (batch, 2) [water_amount, lamp_on]
+        """
+        if self.env is not None:
+            raise ValueError("predict_batch plans from observations; use an MPCPolicy without env")
+        start = time.perf_counter_ns()
+        deadline = start + self.budget_ns
+        actions = np.zeros((len(observations), 2), dtype=np.float32)
+        candidates = fallbacks = 0
+        for i, observation in enumerate(observations):
+            now = time.perf_counter_ns()
+            state = self._observation_state(observation)
+            plan, evaluated = self._search(state, now + (deadline - now) // (len(observations) - i))
+            if plan is not None:
+                actions[i] = plan[0]
+            candidates += evaluated
+            fallbacks += plan is None
+        self.last_candidates = candidates
+        self.last_fallbacks = fallbacks
+        self.last_planning_ms = (time.perf_counter_ns() - start) / 1e6
+        return actions
+
+    def plan(self, state: Union[np.ndarray, Mapping[str, Any]]) -> np.ndarray:
+        """
+        Best first action from a state (a PlantCareEnv.get_state() record or a mapping with
+        soil_moisture, plant_health, hour_of_day, temp_bias and evap_multiplier)
+        """
+        start = time.perf_counter_ns()
+        hour = int(state['hour_of_day'])
+        previous = None
+        if self._plan is not None and self._plan_hour == hour:
+            previous = np.zeros_like(self._plan)
+            previous[:-1] = self._plan[1:]  # Previous best, shifted by one step
+
+        best_plan, evaluated = self._search(state, start + self.budget_ns, previous)
+        fallback = best_plan is None
+        if fallback:
+            best_plan = previous if previous is not None else np.zeros((self.horizon, 2))
+
+        self._plan = best_plan
+        self._plan_hour = (hour + self.timestep_hours) % 24
+        self.last_candidates = evaluated
+        self.last_fallbacks = int(fallback)
+        self.last_planning_ms = (time.perf_counter_ns() - start) / 1e6
+        return np.array([best_plan[0, 0], best_plan[0, 1]], dtype=np.float32)
+
+    def _observation_state(self, observation: np.ndarray) -> Dict[str, Any]:
+        """Planning state from an observation (nominal temperature bias and evaporation)"""
+        return {
+            'soil_moisture': float(observation[0]),
+            'plant_health': float(observation[4]),
+            'hour_of_day': int(round(float(observation[3]))) % 24,
+            'temp_bias': 0.0,
+            'evap_multiplier': 1.0,
+        }
+
+    def _search(
+        self,
+        state: Union[np.ndarray, Mapping[str, Any]],
+        deadline_ns: int,
+        previous: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[np.ndarray], int]:
+        """
+        Simulate candidate chunks until deadline_ns (a time.perf_counter_ns() value)
+
+        Returns:
+            Best plan (horizon, 2) of the completed chunks (None if none completed)
+            and the number of candidates evaluated
+        """
+        hour = int(state['hour_of_day'])
+        hours = (hour + np.arange(self.horizon) * self.timestep_hours) % 24
+        temperature = self.forecast_temperature[hours] + float(state['temp_bias'])
+        light = self.forecast_light[hours]
+        evap_multiplier = float(state['evap_multiplier'])
+        moisture, health = float(state['soil_moisture']), float(state['plant_health'])
+
+        best_return, best_plan = -np.inf, None
+        evaluated = 0
+        while evaluated < self.n_candidates:
+            remaining_ns = 0.9 * (deadline_ns - time.perf_counter_ns())  # Headroom for timer jitter
+            n = min(
+                self.chunk_size,
+                self.n_candidates - evaluated,
+                int((remaining_ns - self._chunk_overhead_ns) // self._candidate_ns)
+            )
+            if n < 1 or (evaluated and n < min(self.chunk_size // 4, self.n_candidates - evaluated)):
+                break  # Small chunks are dominated by the per-chunk overhead
+            chunk_start = time.perf_counter_ns()
+            plans = self._candidates(n, previous, include_fixed=not evaluated)
+            returns = self._simulate(plans, moisture, health, temperature, light, evap_multiplier, deadline_ns)
+            if returns is None:
+                break  # The chunk would have overrun the deadline
+            best = int(np.argmax(returns))
+            if returns[best] > best_return:
+                best_return, best_plan = returns[best], plans[best]
+            evaluated += n
+            # Slower chunks raise the per-candidate estimate at once, faster ones lower it gradually
+            observed = max(time.perf_counter_ns() - chunk_start - self._chunk_overhead_ns, 0) / n
+            self._candidate_ns = max(observed, 0.9 * self._candidate_ns, 1.0)
+        return best_plan, evaluated
+
+    def _calibrate(self) -> Tuple[float, float]:
+        """Time a one-candidate and a full chunk from a nominal state (overhead, per-candidate ns)"""
+        hours = np.arange(self.horizon) * self.timestep_hours % 24
+        args = (0.5, 80.0, self.forecast_temperature[hours], self.forecast_light[hours], 1.0)
+        timings = []
+        for n in (1, 1, self.chunk_size):  # The first run warms up the code paths
+            chunk_start = time.perf_counter_ns()
+            self._simulate(np.zeros((n, self.horizon, 2)), *args)
+            timings.append(time.perf_counter_ns() - chunk_start)
+        overhead = timings[1]
+        return overhead, max((timings[2] - overhead) / self.chunk_size, 1.0)
+
+    def _candidates(self, n: int, previous: Optional[np.ndarray], include_fixed: bool) -> np.ndarray:
+        """Sample n action sequences, shape (n, horizon, 2), optionally led by do-nothing and previous"""
+        plans = np.empty((n, self.horizon, 2))
+        waters = self.rng.random((n, self.horizon)) < self.water_probability
+        levels = self.water_levels[self.rng.integers(len(self.water_levels), size=(n, self.horizon))]
+        plans[:, :, 0] = np.where(waters, levels, 0.0)
+        plans[:, :, 1] = self.rng.random((n, self.horizon)) < 0.5
+        if include_fixed:
+            plans[0] = 0.0  # Do nothing
+            if previous is not None and n > 1:
+                plans[1] = previous
+        return plans
+
+    def _simulate(
+        self,
+        plans: np.ndarray,
+        moisture: float,
+        health: float,
+        temperature: np.ndarray,
+        light: np.ndarray,
+        evap_multiplier: float,
+        deadline_ns: Optional[int] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Total environment reward of every plan over the horizon, shape (n,)
+
+        With deadline_ns, None is returned as soon as the next horizon step
+        (estimated as the slowest step so far) would end after it.
+        """
+        n = len(plans)
+        constraints = self.constraints
+        moisture = np.full(n, moisture)
+        health = np.full(n, health)
+        returns = np.zeros(n)
+        step_ns, last = 0, time.perf_counter_ns()
+        for t in range(self.horizon):
+            if deadline_ns is not None:
+                now = time.perf_counter_ns()
+                step_ns, last = max(step_ns, now - last), now
+                if now + step_ns > deadline_ns:
+                    return None
+            water, lamp = plans[:, t, 0], plans[:, t, 1]
+            previous_health = health
+            moisture, health, _, _ = self.physics.step_batch(
+                moisture, health, water, temperature[t], light[t] + 500.0 * lamp,
+                dt=self.timestep_hours, evap_multiplier=evap_multiplier
+            )
+            violations = (
+                (moisture < constraints.moisture_min).astype(np.float64)
+                + (moisture > constraints.moisture_max)
+                + float(temperature[t] < constraints.temp_min)
+                + float(temperature[t] > constraints.temp_max)
+            )
+            returns += (
+                self.alpha * (health - previous_health)
+                - self.beta * water
+                - self.gamma * 500.0 * self.timestep_hours * lamp
+                - self.delta * violations
+            )
+        return returns
+
+    def stats(self) -> Dict[str, float]:
+        """Candidates evaluated, planning time and fallback decisions of the last decision (or batch)"""
+        return {
+            'candidates': self.last_candidates,
+            'planning_ms': self.last_planning_ms,
+            'fallbacks': self.last_fallbacks,
+        }
+
+
+if __name__ == "__main__":
+    from src.environment import PlantCareEnv
+    from src.evaluation.harness import evaluate_in_env
+
+    print("=" * 60)
+    print("MPC (Random Shooting) Baseline Policy Evaluation")
+    print("=" * 60 + "\n")
+
+    config_path = "config.yaml"
+    env = PlantCareEnv(config_path=config_path)
+    policy = MPCPolicy(config_path=config_path, env=env, seed=0)
+
+    print("Policy configuration:")
+    print(f"  Horizon: {policy.horizon * policy.timestep_hours} h")
+    print(f"  Candidates: {policy.n_candidates} (chunks of {policy.chunk_size})")
+    print(f"  Budget: {policy.budget_ns / 1e6:.1f} ms per decision")
+    print()
+
+    summary, results = evaluate_in_env(policy, env, seeds=range(42, 45))
+
+    print("\n" + "=" * 60)
+    print(f"Average health: {summary['avg_health_mean']:.1f} ± {summary['avg_health_std']:.1f}")
+    print(f"Total water: {summary['total_water_mean']:.1f} ml")
+    print(f"Total energy: {summary['total_energy_mean']:.1f} Wh")
+    print(f"Violations: {summary['violations_mean']:.1f} hours")
+    print(f"Last decision: {policy.last_candidates} candidates in {policy.last_planning_ms:.1f} ms")
+    print("=" * 60)
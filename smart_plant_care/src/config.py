@@ -0,0 +1,387 @@
+"""
+Typed Configuration
+Frozen dataclass view of config.yaml, validated once on load and cached by
+file path and modification time, so constructing environments and
+policies never parses YAML more than once per process
+"""
+
+import os
+import functools
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+
+@dataclass(frozen=True, slots=True)
+class PlantConfig:
+    """environment.plant"""
+    initial_health: float
+    health_min: float
+    health_max: float
+    optimal_moisture_min: float
+    optimal_moisture_max: float
+    optimal_temp_min: float
+    optimal_temp_max: float
+
+
+@dataclass(frozen=True, slots=True)
+class SoilConfig:
+    """environment.soil"""
+    capacity: float
+    initial_moisture: float
+    evaporation_rate: float
+    temp_evap_coeff: float
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherConfig:
+    """environment.weather"""
+    temp_mean: float
+    temp_std: float
+    temp_day_night_diff: float
+    light_max: float
+
+
+@dataclass(frozen=True, slots=True)
+class ActionsConfig:
+    """environment.actions"""
+    water_max: float
+    lamp_power: float
+
+
+@dataclass(frozen=True, slots=True)
+class EnvironmentConfig:
+    """environment"""
+    name: str
+    timestep_hours: int
+    episode_days: int
+    plant: PlantConfig
+    soil: SoilConfig
+    weather: WeatherConfig
+    actions: ActionsConfig
+
+    @property
+    def max_steps(self) -> int:
+        """Steps per episode"""
+        return self.episode_days * 24 // self.timestep_hours
+
+
+@dataclass(frozen=True, slots=True)
+class NetworkConfig:
+    """ppo.policy_network / ppo.value_network"""
+    net_arch: Tuple[int, ...]
+    activation: str
+
+
+@dataclass(frozen=True, slots=True)
+class PPOConfig:
+    """ppo"""
+    learning_rate: float
+    n_steps: int
+    batch_size: int
+    n_epochs: int
+    gamma: float
+    gae_lambda: float
+    clip_range: float
+    ent_coef: float
+    vf_coef: float
+    max_grad_norm: float
+    policy_network: NetworkConfig
+    value_network: NetworkConfig
+
+
+@dataclass(frozen=True, slots=True)
+class DomainRandomizationConfig:
+    """training.domain_randomization"""
+    enabled: bool = False
+    temp_range: Optional[Tuple[float, float]] = None
+    evap_multiplier: Tuple[float, float] = (1.0, 1.0)
+    sensor_noise_std: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class TrainingConfig:
+    """training"""
+    total_timesteps: int
+    eval_freq: int
+    save_freq: int
+    n_eval_episodes: int
+    device: str = "auto"
+    seed: int = 42
+    n_envs: int = 4
+    vec_backend: str = "vectorized"
+    n_workers: Optional[int] = None
+    eval_workers: int = 2
+    eval_scenarios: Tuple[str, ...] = ("normal",)
+    keep_checkpoints: int = 3
+    keep_best_checkpoints: int = 1
+    domain_randomization: DomainRandomizationConfig = DomainRandomizationConfig()
+
+
+@dataclass(frozen=True, slots=True)
+class ConstraintsConfig:
+    """reward.constraints"""
+    moisture_min: float
+    moisture_max: float
+    temp_min: float
+    temp_max: float
+
+
+@dataclass(frozen=True, slots=True)
+class RewardConfig:
+    """reward"""
+    alpha: float
+    beta: float
+    gamma: float
+    delta: float
+    constraints: ConstraintsConfig
+
+
+@dataclass(frozen=True, slots=True)
+class FixedScheduleConfig:
+    """baselines.fixed_schedule"""
+    water_times: Tuple[int, ...]
+    water_amount: float
+    lamp_schedule: Tuple[int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdRuleConfig:
+    """baselines.threshold_rule"""
+    moisture_threshold: float
+    water_amount: float
+    light_threshold: float
+
+
+@dataclass(frozen=True, slots=True)
+class MPCConfig:
+    """baselines.mpc"""
+    horizon_hours: int = 24
+    n_candidates: int = 2048
+    budget_ms: float = 20.0
+    chunk_size: int = 512
+    water_levels: Tuple[float, ...] = (0.0, 25.0, 50.0)
+    water_probability: float = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class BaselinesConfig:
+    """baselines"""
+    fixed_schedule: FixedScheduleConfig
+    threshold_rule: ThresholdRuleConfig
+    mpc: MPCConfig = MPCConfig()
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioConfig:
+    """One evaluation.test_scenarios entry (unset fields keep the built-in / neutral value)"""
+    name: str
+    temp_bias: Optional[float] = None
+    light_multiplier: Optional[float] = None
+    evap_multiplier: Optional[float] = None
+    noise_std: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class SweepConfig:
+    """evaluation.sweep"""
+    n_seeds: int = 20
+    n_workers: int = 1
+    cache_path: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class EvaluationConfig:
+    """evaluation"""
+    test_scenarios: Tuple[ScenarioConfig, ...] = ()
+    sweep: SweepConfig = SweepConfig()
+    metrics: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class LoggingConfig:
+    """logging"""
+    tensorboard_log: str = "./logs/tensorboard/"
+    save_path: str = "./models/"
+    video_folder: str = "./videos/"
+    verbose: int = 1
+    progress_bar: bool = True
+    log_interval: int = 10
+
+
+@dataclass(frozen=True, slots=True)
+class GPUConfig:
+    """gpu"""
+    enabled: bool = True
+    device_id: int = 0
+    cudnn_benchmark: bool = True
+    mixed_precision: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PlantCareConfig:
+    """
+    Complete configuration (config.yaml)
+
+    Immutable and hashable, so it can be shared between environments,
+    passed to worker processes and used as a cache key.
+    """
+    environment: EnvironmentConfig
+    ppo: PPOConfig
+    training: TrainingConfig
+    reward: RewardConfig
+    baselines: BaselinesConfig
+    evaluation: EvaluationConfig = EvaluationConfig()
+    logging: LoggingConfig = LoggingConfig()
+    gpu: GPUConfig = GPUConfig()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PlantCareConfig":
+        """
+        Build and validate a configuration from a parsed YAML dictionary
+
+        Raises:
+            ValueError: Missing or unknown keys, wrong types, inconsistent ranges
+        """
+        config = _build(cls, data, "config")
+        config.validate()
+        return config
+
+    def to_dict(self) -> Dict:
+        """Plain nested dictionary (same layout as config.yaml)"""
+        return dataclasses.asdict(self)
+
+    def validate(self):
+        """Check value ranges that the type annotations cannot express"""
+        env = self.environment
+        _check(env.timestep_hours > 0 and 24 % env.timestep_hours == 0,
+               "environment.timestep_hours must divide 24")
+        _check(env.episode_days > 0, "environment.episode_days must be positive")
+        _check(env.plant.health_min <= env.plant.initial_health <= env.plant.health_max,
+               "environment.plant.initial_health must lie in [health_min, health_max]")
+        _check(0.0 < env.plant.optimal_moisture_min < env.plant.optimal_moisture_max < 1.0,
+               "environment.plant optimal moisture range must satisfy 0 < min < max < 1")
+        _check(env.plant.optimal_temp_min < env.plant.optimal_temp_max,
+               "environment.plant optimal temperature range is empty")
+        _check(env.soil.capacity > 0, "environment.soil.capacity must be positive")
+        _check(0.0 <= env.soil.initial_moisture <= 1.0, "environment.soil.initial_moisture must lie in [0, 1]")
+        _check(env.soil.evaporation_rate >= 0, "environment.soil.evaporation_rate must be non-negative")
+        _check(self.reward.constraints.moisture_min < self.reward.constraints.moisture_max,
+               "reward.constraints moisture range is empty")
+        _check(self.reward.constraints.temp_min < self.reward.constraints.temp_max,
+               "reward.constraints temperature range is empty")
+        _check(self.training.vec_backend in ("vectorized", "dummy", "subproc", "shm"),
+               f"training.vec_backend must be vectorized, dummy, subproc or shm, got '{self.training.vec_backend}'")
+        _check(self.training.eval_workers >= 1, "training.eval_workers must be at least 1")
+        _check(self.training.keep_checkpoints >= 1, "training.keep_checkpoints must be at least 1")
+        randomization = self.training.domain_randomization
+        if randomization.temp_range is not None:
+            _check(randomization.temp_range[0] <= randomization.temp_range[1],
+                   "training.domain_randomization.temp_range must be [low, high]")
+        _check(0 < randomization.evap_multiplier[0] <= randomization.evap_multiplier[1],
+               "training.domain_randomization.evap_multiplier must be [low, high] with low > 0")
+        _check(randomization.sensor_noise_std >= 0,
+               "training.domain_randomization.sensor_noise_std must be non-negative")
+        lamp_start, lamp_end = self.baselines.fixed_schedule.lamp_schedule
+        _check(0 <= lamp_start <= lamp_end <= 24, "baselines.fixed_schedule.lamp_schedule must be [on, off] hours")
+        mpc = self.baselines.mpc
+        _check(mpc.horizon_hours >= env.timestep_hours, "baselines.mpc.horizon_hours must cover at least one step")
+        _check(mpc.n_candidates >= 1 and mpc.chunk_size >= 1, "baselines.mpc candidate counts must be positive")
+        _check(len(mpc.water_levels) > 0 and 0.0 <= mpc.water_probability <= 1.0,
+               "baselines.mpc needs water_levels and a water_probability in [0, 1]")
+        names = [scenario.name for scenario in self.evaluation.test_scenarios]
+        _check(len(names) == len(set(names)), "evaluation.test_scenarios names must be unique")
+
+
+def _check(condition: bool, message: str):
+    if not condition:
+        raise ValueError(f"Invalid configuration: {message}")
+
+
+def _build(cls, data: Any, path: str):
+    """Recursively convert a YAML dictionary into the dataclass cls"""
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid configuration: {path} must be a mapping")
+    hints = get_type_hints(cls)
+    names = {field.name for field in dataclasses.fields(cls)}
+    unknown = set(data) - names
+    if unknown:
+        raise ValueError(f"Invalid configuration: unknown keys in {path}: {sorted(unknown)}")
+
+    values = {}
+    for field in dataclasses.fields(cls):
+        if field.name in data:
+            values[field.name] = _convert(hints[field.name], data[field.name], f"{path}.{field.name}")
+        elif field.default is dataclasses.MISSING:
+            raise ValueError(f"Invalid configuration: missing key {path}.{field.name}")
+    return cls(**values)
+
+
+def _convert(annotation, value: Any, path: str):
+    """Convert one YAML value to the annotated type"""
+    origin = get_origin(annotation)
+    if origin is Union:  # Optional[X]
+        if value is None:
+            return None
+        inner = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _convert(inner[0], value, path)
+    if dataclasses.is_dataclass(annotation):
+        return _build(annotation, value, path)
+    if origin is tuple:
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"Invalid configuration: {path} must be a list")
+        args = get_args(annotation)
+        if len(args) == 2 and args[1] is Ellipsis:
+            return tuple(_convert(args[0], item, f"{path}[{i}]") for i, item in enumerate(value))
+        if len(value) != len(args):
+            raise ValueError(f"Invalid configuration: {path} must have {len(args)} entries")
+        return tuple(_convert(arg, item, f"{path}[{i}]") for i, (arg, item) in enumerate(zip(args, value)))
+    if annotation is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"Invalid configuration: {path} must be true or false")
+        return value
+    if annotation is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"Invalid configuration: {path} must be an integer")
+        return value
+    if annotation is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Invalid configuration: {path} must be a number")
+        return float(value)
+    if annotation is str:
+        if not isinstance(value, str):
+            raise ValueError(f"Invalid configuration: {path} must be a string")
+        return value
+    raise TypeError(f"Unsupported configuration type {annotation} at {path}")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_file(path: str, mtime_ns: int) -> PlantCareConfig:
+    """Parse and validate one version of a configuration file (cached)"""
+    # Deferred: processes that receive a loaded config never need the YAML parser
+    import yaml
+    with open(path, 'r') as f:
+        return PlantCareConfig.from_dict(yaml.safe_load(f))
+
+
+def load_config(config: Union[str, os.PathLike, Dict, PlantCareConfig] = "config.yaml") -> PlantCareConfig:
+    """
+    Get a validated configuration
+
+    Files are parsed once per (absolute path, modification time), so every
+    environment and policy built from the same path shares one object and
+    editing the file is picked up on the next call.
+
+    Args:
+        config: Path to a YAML file, an already parsed dictionary, or a
+            PlantCareConfig (returned as is)
+
+    Returns:
+        PlantCareConfig
+    """
+    if isinstance(config, PlantCareConfig):
+        return config
+    if isinstance(config, dict):
+        return PlantCareConfig.from_dict(config)
+    path = os.path.abspath(config)
+    return _load_file(path, os.stat(path).st_mtime_ns)
@@ -0,0 +1,12 @@
+"""部署模块"""
+
+from ..lazy import lazy_exports
+
+__all__ = ['PlantController', 'PotEndpoint', 'SimulatedPotServer', 'SiteWeather']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'PlantController': '.controller',
+    'PotEndpoint': '.controller',
+    'SimulatedPotServer': '.sensor_server',
+    'SiteWeather': '.sensor_server',
+})
@@ -0,0 +1,436 @@
+"""
+Asyncio Plant Controller
+Runs a policy against many physical pots from one process: every tick
+polls all sensor endpoints concurrently, computes every action in one
+batched policy call and dispatches the water/lamp commands, with per
+tick deadlines and a bound on in-flight requests
+"""
+
+import json
+import time
+import asyncio
+import argparse
+import itertools
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from src.environment.plant_env import build_action_space, build_observation_space
+
+
+# Pending bytes per connection above which request writers wait for the socket
+_WRITE_BUFFER_HIGH = 2**16
+
+# Delay before re-trying a failed connect, doubled per consecutive failure up to the maximum (s)
+_RECONNECT_MIN_S = 0.1
+_RECONNECT_MAX_S = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class PotEndpoint:
+    """Address of one pot: the sensor server and the pot id it serves"""
+    pot_id: int
+    host: str = "127.0.0.1"
+    port: int = 8765
+
+
+class _Connection:
+    """
+    One multiplexed stream to a sensor server
+
+    Requests are tagged with an id and written without waiting for earlier
+    responses; a reader task resolves the matching futures, so many pots
+    share one socket. Per request the cost is one future: writes are
+    coalesced into one socket write per event loop iteration, and since
+    the controller's phase deadlines never decrease the pending deadlines
+    are ordered, so a single timer per connection expires them. A lost connection fails its
+    pending requests and is re-opened on the next open(); after a failed
+    connect, open() is not retried before retry_at (exponential backoff).
+    """
+
+    def __init__(self, host: str, port: int, connect_timeout: float):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._out: List[str] = []
+        self._deadlines: Deque[Tuple[float, int]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._failures = 0
+        self.retry_at = 0.0  # Event loop time before which open() is not attempted
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def open(self):
+        """Connect if not connected (raises OSError / asyncio.TimeoutError)"""
+        if self.is_open:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, limit=2**20), self.connect_timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            self.retry_at = loop.time() + min(_RECONNECT_MIN_S * 2**self._failures, _RECONNECT_MAX_S)
+            self._failures += 1
+            raise
+        self._failures = 0
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    def send(self, body: str, deadline: float) -> asyncio.Future:
+        """
+        Queue one request
+
+        Args:
+            body: JSON object without the opening brace, e.g. '"op":"read","pot":7}'
+            deadline: Event loop time at which the request times out (not
+                earlier than the deadlines of requests already queued)
+
+        Returns:
+            Future resolved with the response dictionary, or failed with
+            asyncio.TimeoutError / ConnectionError
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self.is_open:
+            future.set_exception(ConnectionError(f"Not connected to {self.host}:{self.port}"))
+            return future
+        request_id = next(self._ids)
+        self._pending[request_id] = future
+        if not self._out:
+            loop.call_soon(self._flush)
+        self._out.append('{"id":%d,%s\n' % (request_id, body))
+        self._deadlines.append((deadline, request_id))
+        if self._timer is None:
+            self._timer = loop.call_at(self._deadlines[0][0], self._expire)
+        return future
+
+    def _flush(self):
+        if self._out and self.is_open:
+            self._writer.write("".join(self._out).encode())
+        self._out.clear()
+
+    def _expire(self):
+        """Fail every request whose deadline has passed, then re-arm for the oldest remaining one"""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            future = self._pending.pop(self._deadlines.popleft()[1], None)
+            if future is not None and not future.done():
+                future.set_exception(asyncio.TimeoutError())
+        self._timer = loop.call_at(self._deadlines[0][0], self._expire) if self._deadlines else None
+
+    async def drain(self):
+        """Socket-level backpressure: wait only while the send buffer is above its high-water mark"""
+        if self.is_open and self._writer.transport.get_write_buffer_size() > _WRITE_BUFFER_HIGH:
+            await self._writer.drain()
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Connection to {self.host}:{self.port} lost"))
+            self._pending.clear()
+            if self._writer is not None:
+                self._writer.close()
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+
+class PlantController:
+    """
+    Control loop for many pots
+
+    Each tick runs three phases: read every pot (concurrently, at most
+    max_in_flight requests outstanding) while signalling the tick to every
+    sensor server (which advances its site clock), one policy call on the
+    stacked observations of the pots that answered, then the commands.
+    Each phase has one deadline for all its requests: reads end timeout_s
+    after the tick starts, commands timeout_s after the policy call but no
+    later than the end of the period, so lost requests cannot push a tick
+    past period_s. Pots that miss the deadline are skipped for the tick.
+    Ticks that overrun the period are not made up, so a slow network
+    lowers the control rate instead of queueing work.
+    """
+
+    def __init__(
+        self,
+        policy,
+        pots: Sequence[PotEndpoint],
+        period_s: float = 1.0,
+        timeout_s: Optional[float] = None,
+        max_in_flight: int = 512,
+        connections_per_server: int = 4,
+        history: int = 10_000
+    ):
+        """
+        Args:
+            policy: Rule policy, SB3 model, BatchedPolicy or path to a saved model
+            pots: Pot endpoints
+            period_s: Control period (seconds between tick starts)
+            timeout_s: Time each phase (reads, commands) waits for responses
+                (default period_s / 4); also the connect timeout
+            max_in_flight: Maximum outstanding requests over all servers
+            connections_per_server: Streams per sensor server (pots are spread over them)
+            history: Tick and request latencies kept for stats()
+        """
+        from src.evaluation.harness import _batch_action_fn, _load_policy
+
+        if timeout_s is None:
+            timeout_s = period_s / 4
+        if not 0 < timeout_s <= period_s / 2:
+            raise ValueError("timeout_s must be in (0, period_s / 2] so both phases fit in one period")
+
+        self._act = _batch_action_fn(_load_policy(policy))
+        self.pots = list(pots)
+        self.period_s = period_s
+        self.timeout_s = timeout_s
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+        # Sensor glitches are clipped to the PlantCareEnv observation bounds
+        observation_space = build_observation_space()
+        action_space = build_action_space()
+        self._obs_low, self._obs_high = observation_space.low, observation_space.high
+        self._act_low, self._act_high = action_space.low, action_space.high
+        self.obs_dim = observation_space.shape[0]
+
+        self._connections: Dict[Tuple[str, int], List[_Connection]] = {}
+        for pot in self.pots:
+            key = (pot.host, pot.port)
+            if key not in self._connections:
+                self._connections[key] = [_Connection(pot.host, pot.port, timeout_s) for _ in range(connections_per_server)]
+
+        # Bounded histories keep a long-running service at constant memory
+        self.tick_ms: Deque[float] = deque(maxlen=history)
+        self.inference_ms: Deque[float] = deque(maxlen=history)
+        self.request_ms: Deque[float] = deque(maxlen=history)
+        self.counters = {
+            'ticks': 0, 'overruns': 0, 'reads': 0, 'commands': 0,
+            'timeouts': 0, 'errors': 0, 'skipped_pots': 0,
+        }
+
+    def _connection(self, pot: PotEndpoint) -> _Connection:
+        connections = self._connections[(pot.host, pot.port)]
+        return connections[pot.pot_id % len(connections)]
+
+    async def _exchange(
+        self,
+        pots: Sequence[PotEndpoint],
+        bodies: Sequence[str],
+        deadline: float
+    ) -> List[Optional[Dict]]:
+        """
+        Send one request per pot (bodies[i] goes to pots[i]) and collect the responses
+
+        At most max_in_flight requests are outstanding: the next request is
+        written only when an earlier one has completed, timed out or failed.
+        Every request times out at deadline (event loop time).
+
+        Returns:
+            Response per message, None where the request timed out or failed
+        """
+        loop = asyncio.get_running_loop()
+        futures = []
+        for pot, body in zip(pots, bodies):
+            await self._semaphore.acquire()
+            connection = self._connection(pot)
+            future = connection.send(body, deadline)
+            future.add_done_callback(self._on_done(loop.time()))
+            futures.append(future)
+            await connection.drain()
+
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        responses = []
+        for result in results:
+            if isinstance(result, asyncio.TimeoutError):
+                self.counters['timeouts'] += 1
+                result = None
+            elif isinstance(result, BaseException):
+                self.counters['errors'] += 1
+                result = None
+            elif 'error' in result:
+                self.counters['errors'] += 1
+                result = None
+            responses.append(result)
+        return responses
+
+    async def _reconnect(self):
+        """Open every closed connection whose backoff has expired, concurrently"""
+        now = asyncio.get_running_loop().time()
+        closed = [
+            connection for connections in self._connections.values() for connection in connections
+            if not connection.is_open and connection.retry_at <= now
+        ]
+        if closed:
+            # Failures are left to the requests of those pots
+            await asyncio.gather(*(connection.open() for connection in closed), return_exceptions=True)
+
+    def _on_done(self, start: float):
+        """Done callback: release the in-flight slot and record the latency"""
+        def callback(future: asyncio.Future):
+            self._semaphore.release()
+            if not future.cancelled() and future.exception() is None:
+                self.request_ms.append((asyncio.get_running_loop().time() - start) * 1e3)
+        return callback
+
+    async def tick(self) -> Dict:
+        """
+        Run one control cycle over all pots
+
+        Returns:
+            Dictionary with n_observed, n_commanded and tick_ms
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        tick_start = loop.time()
+        tick_end = tick_start + self.period_s
+        await self._reconnect()
+        servers = [PotEndpoint(0, host, port) for host, port in self._connections]
+        _, responses = await asyncio.gather(
+            self._exchange(servers, ['"op":"tick"}'] * len(servers), tick_start + self.timeout_s),
+            self._exchange(self.pots, [f'"op":"read","pot":{pot.pot_id}}}' for pot in self.pots],
+                           tick_start + self.timeout_s)
+        )
+        observed, readings = [], []
+        for i, response in enumerate(responses):
+            observation = None if response is None else response.get('obs')
+            if observation is not None and len(observation) == self.obs_dim:
+                observed.append(i)
+                readings.append(observation)
+            elif response is not None:
+                self.counters['errors'] += 1
+        self.counters['reads'] += len(observed)
+        self.counters['skipped_pots'] += len(self.pots) - len(observed)
+
+        n_commanded = 0
+        if observed:
+            observations = np.asarray(readings, dtype=np.float32)
+            np.clip(observations, self._obs_low, self._obs_high, out=observations)
+            inference_start = time.perf_counter()
+            actions = np.clip(np.asarray(self._act(observations)), self._act_low, self._act_high).tolist()
+            self.inference_ms.append((time.perf_counter() - inference_start) * 1e3)
+
+            targets = [self.pots[i] for i in observed]
+            responses = await self._exchange(targets, [
+                f'"op":"command","pot":{pot.pot_id},"action":[{water!r},{lamp!r}]}}'
+                for pot, (water, lamp) in zip(targets, actions)
+            ], min(loop.time() + self.timeout_s, tick_end))
+            n_commanded = sum(response is not None for response in responses)
+            self.counters['commands'] += n_commanded
+
+        elapsed_ms = (time.perf_counter() - start) * 1e3
+        self.tick_ms.append(elapsed_ms)
+        self.counters['ticks'] += 1
+        return {'n_observed': len(observed), 'n_commanded': n_commanded, 'tick_ms': elapsed_ms}
+
+    async def run(self, n_ticks: Optional[int] = None):
+        """
+        Tick every period_s until n_ticks ticks have run (forever if None)
+        """
+        loop = asyncio.get_running_loop()
+        next_start = loop.time()
+        for _ in (range(n_ticks) if n_ticks is not None else itertools.count()):
+            await self.tick()
+            next_start += self.period_s
+            delay = next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Overrun: start the next tick now and drop the missed ones
+                self.counters['overruns'] += 1
+                next_start = loop.time()
+
+    def stats(self) -> Dict:
+        """
+        Counters plus latency percentiles (ms) of ticks, policy calls and requests
+        """
+        stats = dict(self.counters)
+        for name, values in (('tick', self.tick_ms), ('inference', self.inference_ms),
+                             ('request', self.request_ms)):
+            if values:
+                p50, p99 = np.percentile(np.asarray(values), [50, 99])
+                stats[f'{name}_p50_ms'] = float(p50)
+                stats[f'{name}_p99_ms'] = float(p99)
+                stats[f'{name}_max_ms'] = float(max(values))
+        return stats
+
+    async def close(self):
+        for connections in self._connections.values():
+            for connection in connections:
+                await connection.close()
+
+
+async def _demo(args):
+    """Controller against an in-process simulated server"""
+    from src.deployment.sensor_server import SimulatedPotServer
+    from src.evaluation.sweep import _build_policy
+
+    server = SimulatedPotServer(
+        args.pots, args.config, latency_ms=(args.latency_min, args.latency_max), drop_rate=args.drop_rate
+    )
+    port = await server.start()
+    controller = PlantController(
+        _build_policy(args.policy, args.config),
+        [PotEndpoint(pot_id, port=port) for pot_id in range(args.pots)],
+        period_s=args.period,
+        timeout_s=args.timeout,
+        max_in_flight=args.max_in_flight
+    )
+    try:
+        await controller.run(args.ticks)
+    finally:
+        await controller.close()
+        await server.close()
+    return controller.stats()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pot controller against simulated sensors")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Configuration file path")
+    parser.add_argument("--policy", type=str, default="threshold_rule",
+                        help="Baseline name (fixed_schedule, threshold_rule) or model path (.zip)")
+    parser.add_argument("--pots", type=int, default=1000, help="Number of simulated pots")
+    parser.add_argument("--ticks", type=int, default=10, help="Control ticks to run")
+    parser.add_argument("--period", type=float, default=1.0, help="Control period (s)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Response wait per phase (s, default period / 4)")
+    parser.add_argument("--max_in_flight", type=int, default=512, help="Maximum outstanding requests")
+    parser.add_argument("--latency_min", type=float, default=0.5, help="Simulated minimum response delay (ms)")
+    parser.add_argument("--latency_max", type=float, default=5.0, help="Simulated maximum response delay (ms)")
+    parser.add_argument("--drop_rate", type=float, default=0.0, help="Simulated fraction of lost requests")
+    args = parser.parse_args()
+
+    stats = asyncio.run(_demo(args))
+    print(f"{stats['ticks']} ticks over {args.pots} pots: {stats['reads']} reads, {stats['commands']} commands, "
+          f"{stats['timeouts']} timeouts, {stats['errors']} errors, {stats['overruns']} overruns")
+    print(f"Tick latency: p50 {stats.get('tick_p50_ms', 0):.1f} ms, p99 {stats.get('tick_p99_ms', 0):.1f} ms; "
+          f"request p99 {stats.get('request_p99_ms', 0):.2f} ms; "
+          f"policy call p50 {stats.get('inference_p50_ms', 0):.2f} ms")
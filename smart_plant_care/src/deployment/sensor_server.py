@@ -0,0 +1,208 @@
+"""
+Simulated Sensor Server
+Stands in for the pot controllers in the field: serves sensor readings and
+accepts water/lamp commands over newline-delimited JSON, with every pot
+simulated by a PlantCareEnv fed from one shared site weather station
+"""
+
+import json
+import asyncio
+import argparse
+import numpy as np
+from typing import Optional, Tuple, Union
+
+from src.config import PlantCareConfig, load_config
+from src.environment import PlantCareEnv
+from src.environment.weather import WeatherGenerator
+
+
+class SiteWeather:
+    """
+    Weather station shared by all pots of a site
+
+    Plugged into every pot with PlantCareEnv.set_weather_provider(). The
+    day comes from the station's own clock, which the server advances on
+    every tick request of the controller, so pots that reset at different
+    times still share the site's day: pots at the same hour see the same
+    conditions. One noisy 24-hour table is drawn per site day.
+    """
+
+    def __init__(self, config: PlantCareConfig, weather_scenario: str = "normal", seed: int = 0):
+        self.generator = WeatherGenerator.for_config(config)
+        self.weather_scenario = weather_scenario
+        self.rng = np.random.default_rng(seed)
+        self.steps_per_day = 24 // config.environment.timestep_hours
+        self.step = 0  # Site clock (control ticks since start)
+        self._day = -1
+        self._table: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def day(self) -> int:
+        """Current site day"""
+        return self.step // self.steps_per_day
+
+    def advance(self):
+        """Move the site clock to the next tick"""
+        self.step += 1
+
+    def conditions(self, hour: int) -> Tuple[float, float]:
+        """(temperature, ambient_light) at the given hour of the current site day"""
+        if self._day != self.day:
+            self._table = self.generator.sample(np.arange(24), self.weather_scenario, self.rng)
+            self._day = self.day
+        return float(self._table[0][hour]), float(self._table[1][hour])
+
+
+class SimulatedPotServer:
+    """
+    TCP server simulating n_pots plants
+
+    Protocol (one JSON object per line, responses carry the request id and
+    may arrive out of order):
+        {"id": 1, "op": "read", "pot": 7}                      -> {"id": 1, "obs": [6 floats]}
+        {"id": 2, "op": "command", "pot": 7, "action": [w, l]} -> {"id": 2, "ok": true}
+        {"id": 3, "op": "tick"}                                -> {"id": 3, "step": site step}
+    Observations use the PlantCareEnv layout. A command advances the pot by
+    one timestep; dead or finished pots are replaced (reset) in place. The
+    controller sends one tick per control tick, which advances the site
+    clock (a lost tick delays the site weather by one step).
+    Errors are answered with {"id": ..., "error": message}.
+    """
+
+    def __init__(
+        self,
+        n_pots: int,
+        config_path: Union[str, PlantCareConfig] = "config.yaml",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: Tuple[float, float] = (0.0, 0.0),
+        drop_rate: float = 0.0,
+        weather_scenario: str = "normal",
+        seed: int = 0
+    ):
+        """
+        Args:
+            n_pots: Number of simulated pots (ids 0 .. n_pots - 1)
+            config_path: Configuration file path or loaded PlantCareConfig
+            host: Bind address
+            port: Bind port (0 picks a free port, see self.port after start())
+            latency_ms: Uniform [low, high] response delay per request
+            drop_rate: Probability that a request is never answered (exercises timeouts)
+            weather_scenario: Site weather scenario
+            seed: Seed for pots, weather, latency and drops
+        """
+        config = load_config(config_path)
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.drop_rate = drop_rate
+        self.rng = np.random.default_rng(seed)
+        self.site = SiteWeather(config, weather_scenario, seed)
+
+        self.pots = []
+        self.observations = []
+        for pot_id in range(n_pots):
+            env = PlantCareEnv(config_path=config, weather_scenario=weather_scenario)
+            env.set_weather_provider(lambda hour, scenario: self.site.conditions(hour))
+            self.pots.append(env)
+            self.observations.append(env.reset(seed=seed + pot_id)[0])
+
+        self.n_requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One client connection: answer requests concurrently"""
+        low, high = self.latency_ms
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.n_requests += 1
+                if self.drop_rate and self.rng.random() < self.drop_rate:
+                    continue
+                if high > 0:
+                    task = asyncio.create_task(self._respond_later(line, writer, self.rng.uniform(low, high) / 1e3))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                else:
+                    writer.write(self._respond(line))
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def _respond_later(self, line: bytes, writer: asyncio.StreamWriter, delay: float):
+        await asyncio.sleep(delay)
+        if not writer.is_closing():
+            writer.write(self._respond(line))
+
+    def _respond(self, line: bytes) -> bytes:
+        """Process one request line and encode the response"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request['id']
+            if request['op'] == "tick":
+                self.site.advance()
+                response = {'id': request_id, 'step': self.site.step}
+            elif request['op'] == "read":
+                response = {'id': request_id, 'obs': self.observations[request['pot']].tolist()}
+            elif request['op'] == "command":
+                pot = request['pot']
+                env = self.pots[pot]
+                observation, _, terminated, truncated, _ = env.step(np.asarray(request['action'], dtype=np.float32))
+                if terminated or truncated:
+                    observation, _ = env.reset()
+                self.observations[pot] = observation
+                response = {'id': request_id, 'ok': True}
+            else:
+                response = {'id': request_id, 'error': f"unknown op {request['op']!r}"}
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            response = {'id': request_id, 'error': f"bad request: {e}"}
+        return (json.dumps(response) + "\n").encode()
+
+
+async def _serve(args):
+    server = SimulatedPotServer(
+        args.pots, args.config, host=args.host, port=args.port,
+        latency_ms=(args.latency_min, args.latency_max), drop_rate=args.drop_rate
+    )
+    port = await server.start()
+    print(f"Simulating {args.pots} pots on {args.host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated pot sensor server")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Configuration file path")
+    parser.add_argument("--pots", type=int, default=1000, help="Number of simulated pots")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Bind port")
+    parser.add_argument("--latency_min", type=float, default=0.5, help="Minimum response delay (ms)")
+    parser.add_argument("--latency_max", type=float, default=5.0, help="Maximum response delay (ms)")
+    parser.add_argument("--drop_rate", type=float, default=0.0, help="Fraction of requests never answered")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -1,7 +1,20 @@
 """植物护理环境模块"""
 
-from .plant_env import PlantCareEnv
-from .physics import PlantPhysics
+from ..lazy import lazy_exports
 
-__all__ = ['PlantCareEnv', 'PlantPhysics']
+__all__ = ['PlantCareEnv', 'PlantPhysics', 'PlantCareVecEnv', 'WeatherScenario', 'load_scenarios', 'register_envs',
+           'TrajectoryWriter', 'TrajectoryReader', 'PrefetchingWeatherProvider', 'StepProfiler']
 
+# Submodules are imported on first access (gymnasium is only loaded with the environments)
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'PlantCareEnv': '.plant_env',
+    'register_envs': '.plant_env',
+    'PlantPhysics': '.physics',
+    'PlantCareVecEnv': '.vec_env',
+    'WeatherScenario': '.weather',
+    'load_scenarios': '.weather',
+    'TrajectoryWriter': '.trajectory',
+    'TrajectoryReader': '.trajectory',
+    'PrefetchingWeatherProvider': '.weather_provider',
+    'StepProfiler': '.profiling',
+})
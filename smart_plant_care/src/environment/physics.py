@@ -4,35 +4,40 @@ Includes: Soil moisture dynamics, photosynthesis, health calculation
 """
 
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple, Union
+
+from ..config import PlantCareConfig, load_config
+from .weather import WeatherGenerator, WeatherScenario, TEMP_NOISE_STD, LIGHT_NOISE_STD
 
 
 class PlantPhysics:
     """Plant Physics Simulator - Based on real plant physiology"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Union[PlantCareConfig, Dict], weather_scenario: Union[str, WeatherScenario] = "normal"):
         """
         Initialize physics model parameters
         
         Args:
-            config: Configuration dictionary containing all physics parameters
+            config: Configuration (PlantCareConfig or dictionary) containing all physics parameters
+            weather_scenario: Scenario name or parameter set (scales evaporation)
         """
+        config = load_config(config)
         self.config = config
         
+        # Precomputed diurnal weather tables (shared by every physics model of this config)
+        self.weather = WeatherGenerator.for_config(config)
+        self.scenario = self.weather.scenario(weather_scenario)
+        
         # Extract key parameters
-        self.soil_capacity = config['environment']['soil']['capacity']
-        self.evap_base = config['environment']['soil']['evaporation_rate']
-        self.temp_evap_coeff = config['environment']['soil']['temp_evap_coeff']
+        soil = config.environment.soil
+        self.soil_capacity = soil.capacity
+        self.evap_base = soil.evaporation_rate * self.scenario.evap_multiplier
+        self.temp_evap_coeff = soil.temp_evap_coeff
         
         # Plant optimal ranges
-        self.optimal_moisture = (
-            config['environment']['plant']['optimal_moisture_min'],
-            config['environment']['plant']['optimal_moisture_max']
-        )
-        self.optimal_temp = (
-            config['environment']['plant']['optimal_temp_min'],
-            config['environment']['plant']['optimal_temp_max']
-        )
+        plant = config.environment.plant
+        self.optimal_moisture = (plant.optimal_moisture_min, plant.optimal_moisture_max)
+        self.optimal_temp = (plant.optimal_temp_min, plant.optimal_temp_max)
         
     def update_soil_moisture(
         self, 
@@ -40,7 +45,8 @@ class PlantPhysics:
         water_added: float,  # ml
         temperature: float,
         light_level: float,
-        dt: float = 1.0  # Time step (hours)
+        dt: float = 1.0,  # Time step (hours)
+        evap_multiplier: float = 1.0
     ) -> float:
         """
         Update soil moisture (considering evaporation and watering)
@@ -54,12 +60,13 @@ class PlantPhysics:
             temperature: Current temperature (°C)
             light_level: Current light intensity (lux)
             dt: Time step (hours)
+            evap_multiplier: Per-plant scale of the evaporation rate (domain randomization)
             
         Returns:
             New soil moisture [0, 1]
         """
         # Evaporation: higher temp and light = faster evaporation
-        evaporation_rate = self.evap_base * (
+        evaporation_rate = self.evap_base * evap_multiplier * (
             1 + self.temp_evap_coeff * (temperature - 20)
         ) * (1 + 0.0005 * light_level)
         
@@ -108,7 +115,7 @@ class PlantPhysics:
         # Temperature response curve (parabolic, optimal at 23°C)
         optimal_temp = 23.0
         temp_deviation = abs(temperature - optimal_temp)
-        temp_factor = np.exp(-0.01 * temp_deviation**2)
+        temp_factor = np.exp(-0.01 * temp_deviation * temp_deviation)
         
         # Total photosynthesis efficiency
         photosynthesis = light_factor * water_factor * temp_factor
@@ -189,59 +196,290 @@ class PlantPhysics:
         
         # Clip to [0, 100] range
         return np.clip(new_health, 0.0, 100.0)
-    
+
+    # ------------------------------------------------------------------
+    # Batched API: same equations as the scalar methods above, evaluated
+    # branch-free on arrays of shape (N,) so a whole fleet of plants is
+    # updated in one call. Results are bit-identical to the scalar path.
+    # ------------------------------------------------------------------
+
+    def update_soil_moisture_batch(
+        self,
+        current_moisture: np.ndarray,
+        water_added: np.ndarray,
+        temperature: np.ndarray,
+        light_level: np.ndarray,
+        dt: float = 1.0,
+        evap_multiplier: Union[float, np.ndarray] = 1.0
+    ) -> np.ndarray:
+        """
+        Batched version of update_soil_moisture
+
+        Args:
+            current_moisture: Soil moisture per plant, shape (N,)
+            water_added: Water added per plant (ml), shape (N,)
+            temperature: Temperature per plant (°C), shape (N,)
+            light_level: Light intensity per plant (lux), shape (N,)
+            dt: Time step (hours)
+            evap_multiplier: Evaporation rate scale, scalar or shape (N,)
+
+        Returns:
+            New soil moisture per plant, shape (N,)
+        """
+        evaporation_rate = self.evap_base * evap_multiplier * (
+            1 + self.temp_evap_coeff * (temperature - 20)
+        ) * (1 + 0.0005 * light_level)
+        evaporation = evaporation_rate * current_moisture * dt
+        water_absorption = water_added / (self.soil_capacity * 1000)
+        new_moisture = current_moisture - evaporation + water_absorption
+        return np.clip(new_moisture, 0.0, 1.0)
+
+    def calculate_photosynthesis_batch(
+        self,
+        light_level: np.ndarray,
+        moisture: np.ndarray,
+        temperature: np.ndarray
+    ) -> np.ndarray:
+        """
+        Batched version of calculate_photosynthesis
+
+        Args:
+            light_level: Light intensity per plant (lux), shape (N,)
+            moisture: Soil moisture per plant, shape (N,)
+            temperature: Temperature per plant (°C), shape (N,)
+
+        Returns:
+            Photosynthesis efficiency per plant [0, 1], shape (N,)
+        """
+        K_light = 300
+        light_factor = light_level / (K_light + light_level)
+
+        # Branch-free form of the "moisture > 0.3" water limitation
+        water_factor = np.where(moisture > 0.3, 1.0, moisture / 0.3)
+
+        temp_deviation = np.abs(temperature - 23.0)
+        temp_factor = np.exp(-0.01 * temp_deviation * temp_deviation)
+
+        photosynthesis = light_factor * water_factor * temp_factor
+        return np.clip(photosynthesis, 0.0, 1.0)
+
+    def calculate_stress_batch(
+        self,
+        moisture: np.ndarray,
+        temperature: np.ndarray
+    ) -> np.ndarray:
+        """
+        Batched version of calculate_stress
+
+        Args:
+            moisture: Soil moisture per plant, shape (N,)
+            temperature: Temperature per plant (°C), shape (N,)
+
+        Returns:
+            Stress level per plant [0, 1], shape (N,)
+        """
+        moisture_lo, moisture_hi = self.optimal_moisture
+        temp_lo, temp_hi = self.optimal_temp
+
+        # Deviation below / above the optimal band, zero inside it
+        moisture_stress = np.where(
+            moisture < moisture_lo,
+            (moisture_lo - moisture) / moisture_lo,
+            np.where(moisture > moisture_hi, (moisture - moisture_hi) / (1.0 - moisture_hi), 0.0)
+        )
+        temp_stress = np.where(
+            temperature < temp_lo,
+            (temp_lo - temperature) / temp_lo,
+            np.where(temperature > temp_hi, (temperature - temp_hi) / (40 - temp_hi), 0.0)
+        )
+
+        total_stress = np.maximum(moisture_stress, temp_stress)
+        return np.clip(total_stress, 0.0, 1.0)
+
+    def update_plant_health_batch(
+        self,
+        current_health: np.ndarray,
+        photosynthesis: np.ndarray,
+        stress: np.ndarray,
+        dt: float = 1.0
+    ) -> np.ndarray:
+        """
+        Batched version of update_plant_health
+
+        Args:
+            current_health: Health per plant [0, 100], shape (N,)
+            photosynthesis: Photosynthesis efficiency per plant, shape (N,)
+            stress: Stress level per plant, shape (N,)
+            dt: Time step (hours)
+
+        Returns:
+            New health per plant [0, 100], shape (N,)
+        """
+        health_gain = photosynthesis * 0.5 * dt
+        health_decay = stress * 1.0 * dt
+        natural_decay = 0.05 * dt
+        new_health = current_health + health_gain - health_decay - natural_decay
+        return np.clip(new_health, 0.0, 100.0)
+
+    def step_batch(
+        self,
+        moisture: np.ndarray,
+        health: np.ndarray,
+        water_added: np.ndarray,
+        temperature: np.ndarray,
+        light_level: np.ndarray,
+        dt: float = 1.0,
+        evap_multiplier: Union[float, np.ndarray] = 1.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance N plants by one time step (moisture -> photosynthesis/stress -> health)
+
+        Args:
+            moisture: Soil moisture per plant, shape (N,)
+            health: Health per plant, shape (N,)
+            water_added: Water added per plant (ml), shape (N,)
+            temperature: Temperature per plant (°C), shape (N,)
+            light_level: Total light per plant (lux), shape (N,)
+            dt: Time step (hours)
+            evap_multiplier: Evaporation rate scale, scalar or per-plant array
+                (heterogeneous plants under domain randomization)
+
+        Returns:
+            (new_moisture, new_health, photosynthesis, stress), each shape (N,)
+        """
+        new_moisture = self.update_soil_moisture_batch(
+            moisture, water_added, temperature, light_level, dt=dt, evap_multiplier=evap_multiplier
+        )
+        photosynthesis = self.calculate_photosynthesis_batch(light_level, new_moisture, temperature)
+        stress = self.calculate_stress_batch(new_moisture, temperature)
+        new_health = self.update_plant_health_batch(health, photosynthesis, stress, dt=dt)
+        return new_moisture, new_health, photosynthesis, stress
+
+    def advance_idle(
+        self,
+        k: int,
+        moisture: float,
+        health: float,
+        temperature: np.ndarray,
+        light_level: np.ndarray,
+        dt: float = 1.0,
+        evap_multiplier: float = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Advance one plant through k idle hours (no water, lamp off) in one pass
+
+        Without watering, moisture only decays: m_k = m_0 * prod(1 - E_i * dt),
+        which is a cumulative product. Health increments then depend only on
+        the moisture trajectory and the weather, so health is a cumulative sum
+        clipped to [0, 100]. Matches k calls of the scalar methods up to
+        floating-point rounding.
+
+        Args:
+            k: Number of idle hours
+            moisture: Soil moisture at the start [0, 1]
+            health: Plant health at the start [0, 100]
+            temperature: Temperature per hour (°C), shape (k,) or scalar
+            light_level: Ambient light per hour (lux), shape (k,) or scalar
+            dt: Time step (hours)
+            evap_multiplier: Scale of the evaporation rate
+
+        Returns:
+            Dictionary of per-hour arrays of shape (k,), each entry being the
+            state after that hour: moisture, health, photosynthesis, stress
+        """
+        temperature = np.broadcast_to(np.asarray(temperature, dtype=np.float64), (k,))
+        light_level = np.broadcast_to(np.asarray(light_level, dtype=np.float64), (k,))
+
+        # Moisture: exponential decay with an hour-dependent rate
+        evaporation_rate = self.evap_base * evap_multiplier * (
+            1 + self.temp_evap_coeff * (temperature - 20)
+        ) * (1 + 0.0005 * light_level)
+        retention = 1.0 - evaporation_rate * dt
+        if np.all((retention >= 0.0) & (retention <= 1.0)):
+            moisture_path = moisture * np.cumprod(retention)
+        else:
+            # Clipping becomes active: fall back to the step-by-step recurrence
+            moisture_path = np.empty(k)
+            for i in range(k):
+                moisture = min(max(moisture - evaporation_rate[i] * moisture * dt, 0.0), 1.0)
+                moisture_path[i] = moisture
+
+        photosynthesis = self.calculate_photosynthesis_batch(light_level, moisture_path, temperature)
+        stress = self.calculate_stress_batch(moisture_path, temperature)
+
+        # Health: cumulative sum of increments, valid as long as no clipping happens
+        increments = photosynthesis * 0.5 * dt - stress * 1.0 * dt - 0.05 * dt
+        health_path = health + np.cumsum(increments)
+        outside = np.flatnonzero((health_path < 0.0) | (health_path > 100.0))
+        if outside.size:
+            # Continue from the first clipped hour one step at a time
+            start = outside[0]
+            current = health_path[start - 1] if start > 0 else health
+            for i in range(start, k):
+                current = min(max(current + increments[i], 0.0), 100.0)
+                health_path[i] = current
+
+        return {
+            'moisture': moisture_path,
+            'health': health_path,
+            'photosynthesis': photosynthesis,
+            'stress': stress
+        }
+
     def get_ambient_conditions(
         self, 
         hour_of_day: int,
-        weather_scenario: str = "normal"
+        weather_scenario: Union[str, WeatherScenario] = "normal",
+        rng: Optional[np.random.Generator] = None
     ) -> Tuple[float, float]:
         """
         Get environmental conditions (temperature, light)
         
+        Base curves come from the precomputed WeatherGenerator tables; hot
+        loops should draw whole episodes with WeatherGenerator.sample_episode
+        instead of calling this once per step.
+        
         Args:
             hour_of_day: Hour of day [0, 23]
-            weather_scenario: Weather scenario ("normal", "hot_dry", "cloudy")
+            weather_scenario: Scenario name or parameter set
+            rng: Random generator for the weather noise (global RNG if None)
             
         Returns:
             (temperature, ambient_light) Temperature (°C) and ambient light (lux)
         """
-        # Base day-night temperature variation (sine wave)
-        temp_mean = self.config['environment']['weather']['temp_mean']
-        temp_amplitude = self.config['environment']['weather']['temp_day_night_diff'] / 2
-        temperature = temp_mean + temp_amplitude * np.sin(2 * np.pi * (hour_of_day - 6) / 24)
-        
-        # Base day-night light variation (high during day, low at night)
-        light_max = self.config['environment']['weather']['light_max']
-        if 6 <= hour_of_day <= 18:
-            # Daytime: sine curve, strongest at noon
-            ambient_light = light_max * np.sin(np.pi * (hour_of_day - 6) / 12)
-        else:
-            # Nighttime: near 0
-            ambient_light = 0.0
-        
-        # Apply weather scenario adjustments
-        if weather_scenario == "hot_dry":
-            temperature += 5.0
-            ambient_light *= 1.2
-        elif weather_scenario == "cloudy":
-            temperature -= 2.0
-            ambient_light *= 0.6
-            
+        base_temperature, base_light = self.weather.curves(weather_scenario)
+        hour_of_day = int(hour_of_day) % 24
+        
         # Add random noise (simulate weather fluctuations)
-        temperature += np.random.normal(0, 1.0)
-        ambient_light = max(0, ambient_light + np.random.normal(0, 50))
+        normal = np.random.normal if rng is None else rng.normal
+        temperature = base_temperature[hour_of_day] + normal(0, TEMP_NOISE_STD)
+        ambient_light = max(0, base_light[hour_of_day] + normal(0, LIGHT_NOISE_STD))
         
         return temperature, ambient_light
 
+    def get_ambient_conditions_batch(
+        self,
+        hour_of_day: np.ndarray,
+        weather_scenario: Union[str, WeatherScenario] = "normal",
+        rng: Optional[np.random.Generator] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched version of get_ambient_conditions
+
+        Args:
+            hour_of_day: Hour of day per plant [0, 23], shape (N,)
+            weather_scenario: Weather scenario shared by all plants
+            rng: Random generator for the weather noise (global RNG if None)
+
+        Returns:
+            (temperature, ambient_light), each shape (N,)
+        """
+        return self.weather.sample(hour_of_day, weather_scenario, rng)
+
 
 if __name__ == "__main__":
     # Simple test
-    import yaml
-    
-    with open("../../config.yaml", "r") as f:
-        config = yaml.safe_load(f)
-    
-    physics = PlantPhysics(config)
+    physics = PlantPhysics(load_config("config.yaml"))
     
     print("=== Plant Physics Model Test ===\n")
     
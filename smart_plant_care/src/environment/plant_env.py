@@ -3,13 +3,94 @@ Plant Care Gymnasium Environment
 Compliant with OpenAI Gym interface specification
 """
 
+import copy
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
-from typing import Dict, Tuple, Any, Optional
-import yaml
+from typing import Dict, Tuple, Any, Optional, Union
 
+from ..config import PlantCareConfig, load_config
 from .physics import PlantPhysics
+from .recorder import EpisodeRecorder
+from .randomization import DomainRandomizer
+from .state import STATE_FIELD_NAMES, env_state_dtype, rng_from_words, rng_to_words
+from .weather import WeatherScenario
+
+
+def _observation_space() -> spaces.Box:
+    # Box - continuous space
+    return spaces.Box(
+        low=np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0], dtype=np.float32),  # [moisture, temp, light, hour, health, hours_since_water]
+        high=np.array([1.0, 50.0, 2000.0, 23.0, 100.0, 24.0], dtype=np.float32),
+        dtype=np.float32
+    )
+
+
+def _action_space() -> spaces.Box:
+    # Simplified to Box: [water_amount (0-100ml), lamp_on (0-1)]
+    return spaces.Box(
+        low=np.array([0.0, 0.0], dtype=np.float32),
+        high=np.array([100.0, 1.0], dtype=np.float32),
+        dtype=np.float32
+    )
+
+
+# Validated once; environments get shallow copies with their own RNG
+_OBSERVATION_SPACE = _observation_space()
+_ACTION_SPACE = _action_space()
+for _space in (_OBSERVATION_SPACE, _ACTION_SPACE):
+    _space.low.setflags(write=False)
+    _space.high.setflags(write=False)
+
+
+def _copy_space(space: spaces.Box) -> spaces.Box:
+    """Copy of a prebuilt space (Box validation dominates environment construction)"""
+    space = copy.copy(space)
+    space._np_random = None
+    return space
+
+
+# Scalar state stored as PlantCareEnv attributes (health_sum lives in the recorder)
+_SCALAR_FIELDS = tuple(name for name in STATE_FIELD_NAMES if name != 'health_sum')
+
+
+def build_observation_space() -> spaces.Box:
+    """Observation space shared by the single and vectorized environments"""
+    return _copy_space(_OBSERVATION_SPACE)
+
+
+def build_action_space() -> spaces.Box:
+    """Action space shared by the single and vectorized environments"""
+    return _copy_space(_ACTION_SPACE)
+
+
+def apply_sensor_noise(
+    observations: np.ndarray,
+    noise_std: float,
+    rng: np.random.Generator,
+    observation_space: spaces.Box
+) -> np.ndarray:
+    """
+    Relative Gaussian noise on the moisture, temperature and light readings (in place)
+
+    Args:
+        observations: Observation(s), shape (6,) or (N, 6)
+        noise_std: Relative noise standard deviation (0 disables the noise)
+        rng: Random generator
+        observation_space: Space the noisy readings are clipped to
+
+    Returns:
+        observations
+    """
+    if noise_std > 0:
+        # float32 draws and in-place updates keep the bulk (N, 3) case cheap
+        sensors = observations[..., :3]
+        factor = rng.standard_normal(sensors.shape, dtype=np.float32)
+        factor *= noise_std
+        factor += 1
+        sensors *= factor
+        np.clip(sensors, observation_space.low[:3], observation_space.high[:3], out=sensors)
+    return observations
 
 
 class PlantCareEnv(gym.Env):
@@ -34,52 +115,58 @@ class PlantCareEnv(gym.Env):
     
     metadata = {'render_modes': ['human', 'rgb_array']}
     
-    def __init__(self, config_path: str = "config.yaml", weather_scenario: str = "normal"):
+    def __init__(
+        self,
+        config_path: Union[str, PlantCareConfig] = "config.yaml",
+        weather_scenario: Union[str, WeatherScenario] = "normal",
+        domain_randomization: bool = False
+    ):
         """
         Initialize environment
         
         Args:
-            config_path: Configuration file path
-            weather_scenario: Weather scenario ("normal", "hot_dry", "cloudy")
+            config_path: Configuration file path or loaded PlantCareConfig
+            weather_scenario: Scenario name ("normal", "hot_dry", "cloudy" or any
+                evaluation.test_scenarios entry) or a WeatherScenario parameter set
+            domain_randomization: Sample physics parameters and add sensor noise per
+                episode as configured in training.domain_randomization (training only)
         """
         super().__init__()
         
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Load configuration (parsed once per file, shared between environments)
+        self.config = load_config(config_path)
         
-        self.weather_scenario = weather_scenario
-        self.physics = PlantPhysics(self.config)
+        self.physics = PlantPhysics(self.config, weather_scenario)
+        self.scenario = self.physics.scenario
+        self.weather_scenario = self.scenario.name
         self.weather_hook = None
+        self.trajectory_writer = None
+        self.profiler = None
+        
+        # Domain randomization (nominal parameters unless enabled)
+        self.randomizer = DomainRandomizer(self.config, enabled=domain_randomization)
+        self.sensor_noise_std = float(np.hypot(self.scenario.noise_std, self.randomizer.sensor_noise_std))
+        self.temp_bias = 0.0
+        self.evap_multiplier = 1.0
         
         # Extract key parameters
-        self.timestep_hours = self.config['environment']['timestep_hours']
-        self.episode_days = self.config['environment']['episode_days']
-        self.max_steps = self.episode_days * 24 // self.timestep_hours
-        
-        # Define state space (Box - continuous space)
-        self.observation_space = spaces.Box(
-            low=np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0]),  # [moisture, temp, light, hour, health, hours_since_water]
-            high=np.array([1.0, 50.0, 2000.0, 23.0, 100.0, 24.0]),
-            dtype=np.float32
-        )
+        self.timestep_hours = self.config.environment.timestep_hours
+        self.episode_days = self.config.environment.episode_days
+        self.max_steps = self.config.environment.max_steps
+        self.state_dtype = env_state_dtype(self.max_steps + 1)  # get_state() record layout
         
-        # Define action space (simplified to Box)
-        # [water_amount (0-100ml), lamp_on (0-1)]
-        self.action_space = spaces.Box(
-            low=np.array([0.0, 0.0]),
-            high=np.array([100.0, 1.0]),
-            dtype=np.float32
-        )
+        # Define state and action spaces
+        self.observation_space = build_observation_space()
+        self.action_space = build_action_space()
         
         # Reward weights
-        self.alpha = self.config['reward']['alpha']
-        self.beta = self.config['reward']['beta']
-        self.gamma = self.config['reward']['gamma']
-        self.delta = self.config['reward']['delta']
+        self.alpha = self.config.reward.alpha
+        self.beta = self.config.reward.beta
+        self.gamma = self.config.reward.gamma
+        self.delta = self.config.reward.delta
         
         # Constraint thresholds
-        self.constraints = self.config['reward']['constraints']
+        self.constraints = self.config.reward.constraints
         
         # Initialize state variables
         self.current_step = 0
@@ -90,11 +177,15 @@ class PlantCareEnv(gym.Env):
         self.hour_of_day = 0
         self.hours_since_water = 0
         
+        # Episode weather block (filled on reset)
+        self._weather_temperature = np.empty(0)
+        self._weather_light = np.empty(0)
+        
         # Statistics
         self.total_water_used = 0.0
         self.total_energy_used = 0.0
         self.total_violations = 0
-        self.health_history = []
+        self.recorder = EpisodeRecorder(self.max_steps)
         
     def reset(
         self, 
@@ -116,25 +207,32 @@ class PlantCareEnv(gym.Env):
         self.hours_since_water = 0
         
         # Reset plant state
-        self.soil_moisture = self.config['environment']['soil']['initial_moisture']
-        self.plant_health = self.config['environment']['plant']['initial_health']
+        self.soil_moisture = self.config.environment.soil.initial_moisture
+        self.plant_health = self.config.environment.plant.initial_health
+        
+        # Draw the whole episode's weather in one block from the env's own RNG
+        self._weather_temperature, self._weather_light = self.physics.weather.sample_episode(
+            self.max_steps, self.scenario, self.np_random, self.timestep_hours
+        )
+        
+        # Per-episode physics parameters (no RNG draws unless randomization is on)
+        params = self.randomizer.sample(1, self.np_random)
+        self.temp_bias = float(params['temp_bias'][0])
+        self.evap_multiplier = float(params['evap_multiplier'][0])
         
         # Get initial environmental conditions
-        if hasattr(self, 'weather_hook') and self.weather_hook:
-            self.temperature, ambient_light = self.weather_hook(self.hour_of_day, self.weather_scenario)
-        else:
-            self.temperature, ambient_light = self.physics.get_ambient_conditions(
-                self.hour_of_day, self.weather_scenario
-            )
+        self.temperature, ambient_light = self._get_ambient_conditions(0)
         self.light_level = ambient_light  
         
         # Reset statistics
         self.total_water_used = 0.0
         self.total_energy_used = 0.0
         self.total_violations = 0
-        self.health_history = [self.plant_health]
+        self.recorder.reset(self.plant_health, self.soil_moisture, self.temperature, self.light_level)
         
         observation = self._get_observation()
+        if self.trajectory_writer is not None:
+            self.trajectory_writer.start_episode(observation)
         info = self._get_info()
         
         return observation, info
@@ -161,12 +259,7 @@ class PlantCareEnv(gym.Env):
         previous_health = self.plant_health
         
         # Get environmental conditions
-        if hasattr(self, 'weather_hook') and self.weather_hook:
-            self.temperature, ambient_light = self.weather_hook(self.hour_of_day, self.weather_scenario)
-        else:
-            self.temperature, ambient_light = self.physics.get_ambient_conditions(
-                self.hour_of_day, self.weather_scenario
-            )
+        self.temperature, ambient_light = self._get_ambient_conditions(self.current_step + 1)
         
         # Lamp contribution (if on, add 500 lux)
         lamp_contribution = 500 if lamp_on else 0
@@ -178,7 +271,8 @@ class PlantCareEnv(gym.Env):
             water_amount,
             self.temperature,
             self.light_level,
-            dt=self.timestep_hours
+            dt=self.timestep_hours,
+            evap_multiplier=self.evap_multiplier
         )
         
         # Calculate photosynthesis and stress
@@ -215,7 +309,10 @@ class PlantCareEnv(gym.Env):
         # Update statistics
         self.total_water_used += water_amount
         self.total_energy_used += lamp_contribution * self.timestep_hours
-        self.health_history.append(self.plant_health)
+        self.recorder.record_step(
+            self.plant_health, self.soil_moisture, self.temperature, self.light_level,
+            water_amount, lamp_on
+        )
         
         # Check termination conditions
         terminated = self.plant_health < 10.0  # Plant died
@@ -224,11 +321,142 @@ class PlantCareEnv(gym.Env):
         observation = self._get_observation()
         info = self._get_info()
         
+        if self.trajectory_writer is not None:
+            self.trajectory_writer.record(
+                self.current_step, observation, (water_amount, lamp_on), reward,
+                self.plant_health, self.soil_moisture, self.temperature, self.light_level,
+                photosynthesis, stress, terminated, truncated
+            )
+        
         return observation, reward, terminated, truncated, info
+
+    def fast_forward(self, k: int) -> Tuple[np.ndarray, np.ndarray, bool, bool, Dict]:
+        """
+        Advance k idle hours (no water, lamp off) in one vectorized pass
+
+        Equivalent to calling step([0, 0]) k times (up to floating-point
+        rounding), but the whole stretch is computed by
+        PlantPhysics.advance_idle. Stops early if the episode ends.
+
+        Args:
+            k: Number of idle steps
+
+        Returns:
+            observations: Observation after each simulated step, shape (n, 6), n <= k
+            rewards: Reward of each simulated step, shape (n,)
+            terminated: Whether terminated (plant died)
+            truncated: Whether truncated (max steps reached)
+            info: Additional info after the last step
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        remaining = self.max_steps - self.current_step
+        n = min(k, remaining) if remaining > 0 else k
+        dt = self.timestep_hours
+
+        # Weather for the whole stretch
+        hours = (self.hour_of_day + np.arange(n) * dt) % 24
+        temperature, ambient_light = self._get_ambient_block(self.current_step + 1, hours)
+
+        trajectory = self.physics.advance_idle(
+            n, self.soil_moisture, self.plant_health, temperature, ambient_light,
+            dt=dt, evap_multiplier=self.evap_multiplier
+        )
+        moisture = trajectory['moisture']
+        health = trajectory['health']
+
+        # Stop at the first hour where the plant dies
+        dead = np.flatnonzero(health < 10.0)
+        if dead.size:
+            n = int(dead[0]) + 1
+            hours, moisture, health = hours[:n], moisture[:n], health[:n]
+            temperature, ambient_light = temperature[:n], ambient_light[:n]
+        first_step = self.current_step + 1
+
+        # Rewards: only health change and violations, no resources are used
+        violations = (
+            (moisture < self.constraints.moisture_min).astype(np.int64)
+            + (moisture > self.constraints.moisture_max)
+            + (temperature < self.constraints.temp_min)
+            + (temperature > self.constraints.temp_max)
+        )
+        previous_health = np.concatenate(([self.plant_health], health[:-1]))
+        rewards = self.alpha * (health - previous_health) - self.delta * violations
+        hours_since_water = np.minimum(self.hours_since_water + np.arange(1, n + 1) * dt, 24)
+
+        # Commit final state and statistics
+        self.soil_moisture = moisture[-1]
+        self.plant_health = health[-1]
+        self.temperature = temperature[-1]
+        self.light_level = ambient_light[-1]
+        self.current_step += n
+        self.hour_of_day = int((self.hour_of_day + n * dt) % 24)
+        self.hours_since_water = int(hours_since_water[-1])
+        self.total_violations += int(violations.sum())
+        self.recorder.record_block(health, moisture, temperature, ambient_light, np.zeros((n, 2)))
+
+        observations = np.empty((n, 6), dtype=np.float32)
+        observations[:, 0] = moisture
+        observations[:, 1] = temperature
+        observations[:, 2] = ambient_light
+        observations[:, 3] = (hours + dt) % 24
+        observations[:, 4] = health
+        observations[:, 5] = hours_since_water
+        apply_sensor_noise(observations, self.sensor_noise_std, self.np_random, self.observation_space)
+
+        terminated = bool(self.plant_health < 10.0)
+        truncated = self.current_step >= self.max_steps
+
+        if self.trajectory_writer is not None:
+            steps = np.arange(first_step, first_step + n)
+            self.trajectory_writer.record_block(
+                step=steps, observation=observations, action=np.zeros((n, 2)), reward=rewards,
+                health=health, moisture=moisture, temperature=temperature, light=ambient_light,
+                photosynthesis=trajectory['photosynthesis'][:n], stress=trajectory['stress'][:n],
+                terminated=(health < 10.0), truncated=(steps >= self.max_steps)
+            )
+
+        return observations, rewards, terminated, truncated, self._get_info()
+
+    def _get_ambient_block(self, start: int, hours: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ambient conditions for consecutive steps starting at weather block index start
+
+        Args:
+            start: Weather block index of the first step
+            hours: Hour of day of each step
+        """
+        if self.weather_hook is not None:
+            conditions = [self.weather_hook(int(hour), self.weather_scenario) for hour in hours]
+            temperature, ambient_light = np.asarray(conditions, dtype=np.float64).T
+            return temperature, ambient_light
+        stop = start + len(hours)
+        if stop <= len(self._weather_temperature):
+            return self._weather_temperature[start:stop] + self.temp_bias, self._weather_light[start:stop]
+        temperature, ambient_light = self.physics.weather.sample(hours, self.scenario, self.np_random)
+        return temperature + self.temp_bias, ambient_light
+
+    def _get_ambient_conditions(self, index: int) -> Tuple[float, float]:
+        """
+        Ambient (temperature, light) for the current hour
+        
+        Args:
+            index: Position in the episode weather block (0 at reset, k + 1 for step k)
+        """
+        if self.weather_hook is not None:
+            return self.weather_hook(self.hour_of_day, self.weather_scenario)
+        if index < len(self._weather_temperature):
+            return self._weather_temperature[index] + self.temp_bias, self._weather_light[index]
+        # Stepping past max_steps: fall back to a single draw
+        temperature, ambient_light = self.physics.get_ambient_conditions(
+            self.hour_of_day, self.scenario, self.np_random
+        )
+        return temperature + self.temp_bias, ambient_light
     
     def _get_observation(self) -> np.ndarray:
-        """Get current observation"""
-        return np.array([
+        """Get current observation (sensor readings noisy if the scenario sets noise_std)"""
+        observation = np.array([
             self.soil_moisture,
             self.temperature,
             self.light_level,
@@ -236,6 +464,7 @@ class PlantCareEnv(gym.Env):
             self.plant_health,
             float(self.hours_since_water)
         ], dtype=np.float32)
+        return apply_sensor_noise(observation, self.sensor_noise_std, self.np_random, self.observation_space)
     
     def _get_info(self) -> Dict:
         """Get additional info"""
@@ -243,14 +472,90 @@ class PlantCareEnv(gym.Env):
             'total_water_used': self.total_water_used,
             'total_energy_used': self.total_energy_used,
             'total_violations': self.total_violations,
-            'avg_health': np.mean(self.health_history),
+            'avg_health': self.recorder.avg_health,
             'current_step': self.current_step
         }
         
+    @property
+    def health_history(self) -> np.ndarray:
+        """Health of the current episode so far (read-only view into the recorder)"""
+        return self.recorder.health
+    
+    def get_episode_trajectory(self) -> Dict[str, np.ndarray]:
+        """Zero-copy views of the current episode: health, moisture, temperature, light, actions"""
+        return self.recorder.trajectory()
+        
+    def get_state(self) -> np.ndarray:
+        """
+        Snapshot of the dynamic state as one fixed-layout record (see environment.state)
+
+        Holds the plant, clock, counters, episode weather, recorder length and
+        RNG state, so set_state() continues bit-for-bit, observation noise
+        included. Snapshots of environments with the same config share a dtype
+        and can be stacked with np.stack. The recorded history itself, the
+        config and the physics are not copied.
+
+        Returns:
+            0-d structured array of dtype self.state_dtype
+        """
+        state = np.zeros((), dtype=self.state_dtype)
+        for name in _SCALAR_FIELDS:
+            state[name] = getattr(self, name)
+        state['health_sum'] = self.recorder.health_sum
+        state['recorded_states'] = self.recorder.n_states
+        rng_to_words(self.np_random, state['rng'])
+        n = len(self._weather_temperature)
+        state['n_weather'] = n
+        state['weather_temperature'][:n] = self._weather_temperature
+        state['weather_light'][:n] = self._weather_light
+        return state
+
+    def set_state(self, state: np.ndarray):
+        """
+        Restore a snapshot taken by get_state (of this or another environment with the same config)
+
+        The recorder is rewound to the snapshot's length; entries recorded
+        after the snapshot are overwritten by the following steps.
+        """
+        if state.dtype != self.state_dtype:
+            raise ValueError(f"State record layout {state.dtype} does not match this environment")
+        for name in _SCALAR_FIELDS:
+            setattr(self, name, state[name].item())
+        n = int(state['n_weather'])
+        self._weather_temperature = state['weather_temperature'][:n].copy()
+        self._weather_light = state['weather_light'][:n].copy()
+        self.recorder.rewind(int(state['recorded_states']), float(state['health_sum']))
+        rng_from_words(self.np_random, state['rng'])
+
     def set_weather_provider(self, provider_fn):
         """Optional external weather provider, signature: provider_fn(hour_of_day, weather_scenario) -> (temperature, ambient_light)"""
         self.weather_hook = provider_fn
     
+    def set_trajectory_writer(self, writer):
+        """Optional per-step trace log (TrajectoryWriter, or None to detach); episodes start on reset"""
+        self.trajectory_writer = writer
+    
+    def enable_profiling(self, profiler=None):
+        """
+        Time step phases (weather, physics, reward, recorder, observation, info)
+        
+        Args:
+            profiler: StepProfiler to add this environment to (new one if None)
+            
+        Returns:
+            The attached StepProfiler
+        """
+        from .profiling import StepProfiler
+        self.disable_profiling()
+        self.profiler = (profiler or StepProfiler()).attach(self)
+        return self.profiler
+    
+    def disable_profiling(self):
+        """Detach the profiler and restore the uninstrumented methods"""
+        if self.profiler is not None:
+            self.profiler.detach(self)
+            self.profiler = None
+    
     def _calculate_reward(
         self,
         previous_health: float,
@@ -271,13 +576,13 @@ class PlantCareEnv(gym.Env):
         
         # Constraint violation detection
         violations = 0
-        if self.soil_moisture < self.constraints['moisture_min']:
+        if self.soil_moisture < self.constraints.moisture_min:
             violations += 1
-        if self.soil_moisture > self.constraints['moisture_max']:
+        if self.soil_moisture > self.constraints.moisture_max:
             violations += 1
-        if self.temperature < self.constraints['temp_min']:
+        if self.temperature < self.constraints.temp_min:
             violations += 1
-        if self.temperature > self.constraints['temp_max']:
+        if self.temperature > self.constraints.temp_max:
             violations += 1
         
         self.total_violations += violations
@@ -303,19 +608,28 @@ class PlantCareEnv(gym.Env):
         return None
 
 
-# Register environment
-gym.register(
-    id='PlantCare-v0',
-    entry_point='environment.plant_env:PlantCareEnv',
-    max_episode_steps=720,  # 30 days × 24 hours
-)
+# Gymnasium id, see register_envs()
+ENV_ID = 'PlantCare-v0'
+
+
+def register_envs():
+    """
+    Register PlantCare-v0 with Gymnasium (idempotent)
+
+    Registration is explicit rather than an import side effect; call this
+    before gym.make("PlantCare-v0", config_path=...). Episodes are truncated
+    by the environment itself (environment.episode_days), so no TimeLimit
+    wrapper is added.
+    """
+    if ENV_ID not in gym.registry:
+        gym.register(id=ENV_ID, entry_point='src.environment.plant_env:PlantCareEnv')
 
 
 if __name__ == "__main__":
     # Test environment
     print("=== Testing PlantCareEnv ===\n")
     
-    env = PlantCareEnv(config_path="../../config.yaml")
+    env = PlantCareEnv(config_path="config.yaml")
     
     print(f"Observation space: {env.observation_space}")
     print(f"Action space: {env.action_space}")
@@ -0,0 +1,57 @@
+"""
+Domain Randomization
+Per-plant physics parameters drawn from training.domain_randomization,
+sampled as arrays so a batch of heterogeneous plants still steps in one call
+"""
+
+import numpy as np
+from typing import Dict, Union
+
+from ..config import PlantCareConfig, load_config
+
+
+class DomainRandomizer:
+    """
+    Samples per-plant physics parameters on reset
+
+    - temp_bias: offset of the plant's mean temperature, drawn so the mean
+      lies uniformly in temp_range (°C)
+    - evap_multiplier: scale of the soil evaporation rate
+    Sensor noise (sensor_noise_std) is a fixed relative standard deviation
+    applied to the moisture/temperature/light readings.
+    """
+
+    def __init__(self, config: Union[PlantCareConfig, Dict], enabled: bool = True):
+        """
+        Args:
+            config: Configuration (uses training.domain_randomization)
+            enabled: Also requires training.domain_randomization.enabled; when
+                off, sample() returns nominal parameters without using the RNG
+        """
+        config = load_config(config)
+        randomization = config.training.domain_randomization
+        self.enabled = bool(enabled and randomization.enabled)
+
+        temp_mean = config.environment.weather.temp_mean
+        temp_low, temp_high = randomization.temp_range or (temp_mean, temp_mean)
+        self.temp_bias_range = (temp_low - temp_mean, temp_high - temp_mean)
+        self.evap_multiplier_range = randomization.evap_multiplier
+        self.sensor_noise_std = randomization.sensor_noise_std if self.enabled else 0.0
+
+    def sample(self, n: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """
+        Draw parameters for n plants
+
+        Args:
+            n: Number of plants
+            rng: Random generator (e.g. the environment's np_random)
+
+        Returns:
+            Dictionary with temp_bias and evap_multiplier arrays of shape (n,)
+        """
+        if not self.enabled:
+            return {'temp_bias': np.zeros(n), 'evap_multiplier': np.ones(n)}
+        return {
+            'temp_bias': rng.uniform(*self.temp_bias_range, size=n),
+            'evap_multiplier': rng.uniform(*self.evap_multiplier_range, size=n),
+        }
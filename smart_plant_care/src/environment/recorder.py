@@ -0,0 +1,130 @@
+"""
+Episode Recorder
+Preallocated float32 trajectory storage with running sums, so recording a
+step and computing the info metrics are both O(1)
+"""
+
+import numpy as np
+from typing import Dict
+
+
+class EpisodeRecorder:
+    """
+    Fixed-capacity recorder for one episode
+
+    State arrays (health, moisture, temperature, light) hold the reset state
+    at index 0 followed by one entry per step; the action array holds one
+    [water_amount, lamp_on] row per step. Capacity is sized from max_steps
+    and only grows (by doubling) if an episode is stepped past it. Each
+    reset starts fresh buffers, so views returned by trajectory() stay valid
+    after the episode ends.
+    """
+
+    STATE_FIELDS = ('health', 'moisture', 'temperature', 'light')
+
+    def __init__(self, max_steps: int):
+        """
+        Args:
+            max_steps: Maximum number of steps per episode
+        """
+        self._allocate(max_steps)
+        self.n_states = 0
+        self.health_sum = 0.0
+
+    def _allocate(self, max_steps: int, keep: bool = False):
+        """Allocate buffers for max_steps steps, optionally copying recorded data over"""
+        old = self._buffers if keep else None
+        self.capacity = max_steps
+        self._buffers = {name: np.zeros(max_steps + 1, dtype=np.float32) for name in self.STATE_FIELDS}
+        self._buffers['actions'] = np.zeros((max_steps, 2), dtype=np.float32)
+        if old is not None:
+            for name, buffer in old.items():
+                self._buffers[name][:len(buffer)] = buffer
+
+    def reset(self, health: float, moisture: float, temperature: float, light: float):
+        """Start a new episode from the given initial state"""
+        if self.n_states:
+            self._allocate(self.capacity)
+        self.n_states = 0
+        self.health_sum = 0.0
+        self._write_state(health, moisture, temperature, light)
+
+    def record_step(
+        self,
+        health: float,
+        moisture: float,
+        temperature: float,
+        light: float,
+        water_amount: float,
+        lamp_on: float
+    ):
+        """Record the action taken and the state reached by one step"""
+        if self.n_states > self.capacity:
+            self._allocate(2 * self.capacity, keep=True)
+        self._buffers['actions'][self.n_states - 1] = (water_amount, lamp_on)
+        self._write_state(health, moisture, temperature, light)
+
+    def record_block(
+        self,
+        health: np.ndarray,
+        moisture: np.ndarray,
+        temperature: np.ndarray,
+        light: np.ndarray,
+        actions: np.ndarray
+    ):
+        """Record several consecutive steps at once (arrays of length n, actions (n, 2))"""
+        n = len(health)
+        while self.n_states + n > self.capacity + 1:
+            self._allocate(2 * self.capacity, keep=True)
+        start, stop = self.n_states, self.n_states + n
+        self._buffers['health'][start:stop] = health
+        self._buffers['moisture'][start:stop] = moisture
+        self._buffers['temperature'][start:stop] = temperature
+        self._buffers['light'][start:stop] = light
+        self._buffers['actions'][start - 1:stop - 1] = actions
+        self.health_sum += float(np.sum(health, dtype=np.float64))
+        self.n_states = stop
+
+    def rewind(self, n_states: int, health_sum: float):
+        """Continue recording after n_states entries (restoring an environment snapshot)"""
+        while n_states > self.capacity + 1:
+            self._allocate(2 * self.capacity, keep=True)
+        self.n_states = n_states
+        self.health_sum = health_sum
+
+    def _write_state(self, health: float, moisture: float, temperature: float, light: float):
+        """Append one state entry"""
+        i = self.n_states
+        self._buffers['health'][i] = health
+        self._buffers['moisture'][i] = moisture
+        self._buffers['temperature'][i] = temperature
+        self._buffers['light'][i] = light
+        self.health_sum += health
+        self.n_states = i + 1
+
+    @property
+    def avg_health(self) -> float:
+        """Mean health over all recorded states"""
+        return self.health_sum / self.n_states
+
+    @property
+    def health(self) -> np.ndarray:
+        """Health history as a read-only view"""
+        return self._view('health')
+
+    def trajectory(self) -> Dict[str, np.ndarray]:
+        """
+        Zero-copy views of the recorded episode
+
+        Returns:
+            Dictionary with health, moisture, temperature, light (n_states,)
+            and actions (n_states - 1, 2)
+        """
+        return {name: self._view(name) for name in self._buffers}
+
+    def _view(self, name: str) -> np.ndarray:
+        """Read-only view of the filled part of a buffer"""
+        length = self.n_states - 1 if name == 'actions' else self.n_states
+        view = self._buffers[name][:length]
+        view.flags.writeable = False
+        return view
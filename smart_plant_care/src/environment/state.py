@@ -0,0 +1,98 @@
+"""
+Environment State Snapshots
+Fixed-layout NumPy records of the dynamic state of PlantCareEnv and
+PlantCareVecEnv (plant, clock, counters, episode weather and RNG), so a
+snapshot is one flat block of memory: cheap to take, copy, stack into an
+array of snapshots, or write with np.save
+"""
+
+import numpy as np
+from functools import lru_cache
+
+
+# Per-environment scalar state shared by PlantCareEnv and PlantCareVecEnv (attribute name, dtype)
+STATE_FIELDS = (
+    ('current_step', np.int64),
+    ('hour_of_day', np.int64),
+    ('hours_since_water', np.int64),
+    ('soil_moisture', np.float64),
+    ('plant_health', np.float64),
+    ('temperature', np.float64),
+    ('light_level', np.float64),
+    ('total_water_used', np.float64),
+    ('total_energy_used', np.float64),
+    ('total_violations', np.int64),
+    ('temp_bias', np.float64),
+    ('evap_multiplier', np.float64),
+    ('health_sum', np.float64),
+)
+STATE_FIELD_NAMES = tuple(name for name, _ in STATE_FIELDS)
+
+# PCG64 / PCG64DXSM state as 64-bit words: state (high, low), increment (high, low), has_uint32, uinteger
+RNG_WORDS = 6
+_RNG_KINDS = ('PCG64', 'PCG64DXSM')
+_MASK = (1 << 64) - 1
+
+
+@lru_cache(maxsize=None)
+def env_state_dtype(n_weather: int) -> np.dtype:
+    """
+    Record layout of one PlantCareEnv
+
+    Args:
+        n_weather: Capacity of the episode weather block (max_steps + 1)
+
+    Returns:
+        Structured dtype with STATE_FIELDS, the recorder length, the RNG
+        words and the episode weather (n_weather valid entries)
+    """
+    return np.dtype([
+        *STATE_FIELDS,
+        ('recorded_states', np.int64),
+        ('rng', np.uint64, (RNG_WORDS,)),
+        ('n_weather', np.int64),
+        ('weather_temperature', np.float64, (n_weather,)),
+        ('weather_light', np.float64, (n_weather,)),
+    ])
+
+
+@lru_cache(maxsize=None)
+def vec_state_dtype(num_envs: int) -> np.dtype:
+    """
+    Record layout of one PlantCareVecEnv
+
+    Args:
+        num_envs: Number of sub-environments
+
+    Returns:
+        Structured dtype with an 'envs' array of STATE_FIELDS records and the
+        words of the RNG shared by all sub-environments
+    """
+    return np.dtype([
+        ('envs', np.dtype(list(STATE_FIELDS)), (num_envs,)),
+        ('rng', np.uint64, (RNG_WORDS,)),
+    ])
+
+
+def rng_to_words(rng: np.random.Generator, out: np.ndarray):
+    """Write the state of a PCG64-family generator into RNG_WORDS uint64 words"""
+    name = type(rng.bit_generator).__name__
+    if name not in _RNG_KINDS:
+        raise TypeError(f"State snapshots support PCG64 generators, got {name}")
+    state = rng.bit_generator.state
+    out[:] = (
+        state['state']['state'] >> 64, state['state']['state'] & _MASK,
+        state['state']['inc'] >> 64, state['state']['inc'] & _MASK,
+        state['has_uint32'], state['uinteger'],
+    )
+
+
+def rng_from_words(rng: np.random.Generator, words: np.ndarray):
+    """Restore a generator in place from words written by rng_to_words"""
+    words = [int(word) for word in words]
+    rng.bit_generator.state = {
+        'bit_generator': type(rng.bit_generator).__name__,
+        'state': {'state': (words[0] << 64) | words[1], 'inc': (words[2] << 64) | words[3]},
+        'has_uint32': words[4],
+        'uinteger': words[5],
+    }
@@ -0,0 +1,293 @@
+"""
+Trajectory Logging
+Streams per-step records (observation, action, reward, physics
+intermediates) into chunked columnar .npy files with bounded memory, and
+memory-maps them back for offline analysis without copying
+"""
+
+import os
+import json
+import shutil
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Columns of one step record: name -> (dtype, per-row shape)
+TRAJECTORY_COLUMNS: Dict[str, Tuple[str, Tuple[int, ...]]] = {
+    'episode': ('int64', ()),           # Episode index within the file set
+    'step': ('int32', ()),              # Step index within the episode (1 = first step)
+    'observation': ('float32', (6,)),   # Observation returned by step (including sensor noise)
+    'action': ('float32', (2,)),        # Applied [water_amount (clipped), lamp_on (0/1)]
+    'reward': ('float32', ()),
+    'health': ('float32', ()),          # True state after the step (no sensor noise)
+    'moisture': ('float32', ()),
+    'temperature': ('float32', ()),
+    'light': ('float32', ()),           # Ambient + lamp light
+    'photosynthesis': ('float32', ()),
+    'stress': ('float32', ()),
+    'terminated': ('bool', ()),
+    'truncated': ('bool', ()),
+}
+
+RECORD_DTYPE = np.dtype([(name, dtype, shape) for name, (dtype, shape) in TRAJECTORY_COLUMNS.items()])
+
+MANIFEST = "manifest.json"
+
+
+class TrajectoryWriter:
+    """
+    Append-only step log
+
+    Records are staged in a preallocated structured buffer of chunk_rows
+    rows; a full buffer is written out as one directory with one .npy file
+    per column, and the manifest is updated, so memory stays bounded by a
+    single chunk and readers can open the completed chunks while writing
+    continues. Attach to an environment with
+    PlantCareEnv.set_trajectory_writer().
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 65536, overwrite: bool = False):
+        """
+        Args:
+            path: Output directory
+            chunk_rows: Records per chunk (memory use is chunk_rows * RECORD_DTYPE.itemsize)
+            overwrite: Replace an existing trajectory directory
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            if not overwrite:
+                raise FileExistsError(f"Trajectory already exists: {path} (pass overwrite=True)")
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._buffer = np.zeros(chunk_rows, dtype=RECORD_DTYPE)
+        self._n = 0  # Rows staged in the buffer
+        self._chunks: List[Dict] = []
+        self._episodes: List[List[int]] = []  # [episode, start_row, n_rows]
+        self._initial_observations: List[Optional[List[float]]] = []  # Reset observation per episode
+        self.n_rows = 0
+        self.episode = -1
+        self.closed = False
+        self._write_manifest()
+
+    def start_episode(self, initial_observation: Optional[np.ndarray] = None) -> int:
+        """
+        Begin a new episode (called by the environment on reset)
+
+        Args:
+            initial_observation: Observation returned by reset, i.e. the one
+                the first action is taken on (None if unknown)
+
+        Returns:
+            Index of the new episode
+        """
+        self.episode += 1
+        self._episodes.append([self.episode, self.n_rows, 0])
+        if initial_observation is not None:
+            initial_observation = np.asarray(initial_observation, dtype=np.float32).tolist()
+        self._initial_observations.append(initial_observation)
+        return self.episode
+
+    def record(
+        self,
+        step: int,
+        observation: np.ndarray,
+        action: Tuple[float, float],
+        reward: float,
+        health: float,
+        moisture: float,
+        temperature: float,
+        light: float,
+        photosynthesis: float,
+        stress: float,
+        terminated: bool,
+        truncated: bool
+    ):
+        """Append one step record"""
+        if self.episode < 0:
+            self.start_episode()
+        self._buffer[self._n] = (
+            self.episode, step, observation, action, reward, health, moisture,
+            temperature, light, photosynthesis, stress, terminated, truncated
+        )
+        self._n += 1
+        self.n_rows += 1
+        self._episodes[-1][2] += 1
+        if self._n == self.chunk_rows:
+            self._flush_chunk()
+
+    def record_block(self, **columns: np.ndarray):
+        """
+        Append several consecutive steps of the current episode
+
+        Args:
+            columns: Every column of TRAJECTORY_COLUMNS except episode, as
+                arrays with a leading dimension of n (scalars are broadcast)
+        """
+        if self.episode < 0:
+            self.start_episode()
+        missing = set(TRAJECTORY_COLUMNS) - {'episode'} - set(columns)
+        if missing:
+            raise ValueError(f"Missing trajectory columns: {sorted(missing)}")
+        n = len(columns['step'])
+        done = 0
+        while done < n:
+            take = min(n - done, self.chunk_rows - self._n)
+            rows = self._buffer[self._n:self._n + take]
+            rows['episode'] = self.episode
+            for name, values in columns.items():
+                values = np.asarray(values)
+                rows[name] = values[done:done + take] if values.ndim else values
+            self._n += take
+            done += take
+            if self._n == self.chunk_rows:
+                self._flush_chunk()
+        self.n_rows += n
+        self._episodes[-1][2] += n
+
+    def flush(self):
+        """Write staged rows as a (possibly short) chunk"""
+        if self._n:
+            self._flush_chunk()
+
+    def close(self):
+        """Flush and finalize the manifest"""
+        if not self.closed:
+            self.flush()
+            self.closed = True
+            self._buffer = None
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _flush_chunk(self):
+        """Write the staged rows column by column and publish them in the manifest"""
+        name = f"{len(self._chunks):06d}"
+        chunk_dir = os.path.join(self.path, name)
+        os.makedirs(chunk_dir, exist_ok=True)
+        rows = self._buffer[:self._n]
+        for column in TRAJECTORY_COLUMNS:
+            np.save(os.path.join(chunk_dir, column + ".npy"), np.ascontiguousarray(rows[column]))
+        self._chunks.append({'dir': name, 'rows': int(self._n)})
+        self._n = 0
+        self._write_manifest()
+
+    def _write_manifest(self):
+        """Atomically replace the manifest (readers only see completed chunks)"""
+        manifest = {
+            'columns': {name: [dtype, list(shape)] for name, (dtype, shape) in TRAJECTORY_COLUMNS.items()},
+            'chunk_rows': self.chunk_rows,
+            'chunks': self._chunks,
+            'episodes': self._episodes,
+            'initial_observations': self._initial_observations,
+        }
+        tmp_path = os.path.join(self.path, MANIFEST + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST))
+
+
+class TrajectoryReader:
+    """
+    Memory-mapped view of a trajectory directory
+
+    Columns are opened with np.load(mmap_mode='r'), so reading touches only
+    the pages that are accessed. Row ranges inside one chunk are returned
+    as views; ranges spanning chunks are concatenated (a copy of just that
+    range).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Directory written by TrajectoryWriter
+        """
+        self.path = path
+        with open(os.path.join(path, MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        self.columns = tuple(manifest['columns'])
+        self._chunks = manifest['chunks']
+        self._offsets = np.cumsum([0] + [chunk['rows'] for chunk in self._chunks])
+        # Only episodes whose rows are all in completed chunks
+        self.episodes = np.asarray(
+            [entry for entry in manifest['episodes'] if entry[1] + entry[2] <= self._offsets[-1]],
+            dtype=np.int64
+        ).reshape(-1, 3)
+        self._initial_observations = manifest.get('initial_observations', [])
+        self._cache: Dict[Tuple[int, str], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def n_episodes(self) -> int:
+        return len(self.episodes)
+
+    def chunk(self, index: int, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Memory-mapped columns of one chunk"""
+        return {name: self._column(index, name) for name in (columns or self.columns)}
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Iterate over all chunks (constant memory)"""
+        for index in range(self.n_chunks):
+            yield self.chunk(index, columns)
+
+    def rows(self, start: int, stop: int, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Rows [start, stop) across the whole file set
+
+        Returns:
+            {column: array}; views into the memory map when the range lies in one chunk
+        """
+        start, stop = max(0, start), min(stop, len(self))
+        if start >= stop:
+            return {
+                name: np.empty((0,) + TRAJECTORY_COLUMNS[name][1], dtype=TRAJECTORY_COLUMNS[name][0])
+                for name in (columns or self.columns)
+            }
+        first = int(np.searchsorted(self._offsets, start, side='right')) - 1
+        last = int(np.searchsorted(self._offsets, stop - 1, side='right')) - 1
+        parts = {name: [] for name in (columns or self.columns)}
+        for index in range(first, last + 1):
+            lo = max(start - self._offsets[index], 0)
+            hi = min(stop - self._offsets[index], self._chunks[index]['rows'])
+            for name in parts:
+                parts[name].append(self._column(index, name)[lo:hi])
+        return {
+            name: arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+            for name, arrays in parts.items()
+        }
+
+    def episode(self, index: int, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """All rows of one episode (by position in self.episodes)"""
+        _, start, n_rows = self.episodes[index]
+        return self.rows(int(start), int(start + n_rows), columns)
+
+    def initial_observation(self, index: int) -> Optional[np.ndarray]:
+        """Reset observation of one episode (by position in self.episodes), None if not logged"""
+        episode = int(self.episodes[index][0])
+        if episode >= len(self._initial_observations) or self._initial_observations[episode] is None:
+            return None
+        return np.asarray(self._initial_observations[episode], dtype=TRAJECTORY_COLUMNS['observation'][0])
+
+    def column(self, name: str) -> np.ndarray:
+        """A whole column (a view for single-chunk files, otherwise a concatenated copy)"""
+        return self.rows(0, len(self), [name])[name]
+
+    def _column(self, index: int, name: str) -> np.ndarray:
+        key = (index, name)
+        array = self._cache.get(key)
+        if array is None:
+            path = os.path.join(self.path, self._chunks[index]['dir'], name + ".npy")
+            array = self._cache[key] = np.load(path, mmap_mode='r')
+        return array
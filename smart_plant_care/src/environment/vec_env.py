@@ -0,0 +1,336 @@
+"""
+Vectorized Plant Care Environment
+All N sub-environments are stored as struct-of-arrays NumPy buffers and
+stepped together through the batched PlantPhysics API
+"""
+
+import numpy as np
+from gymnasium.vector import VectorEnv
+from gymnasium.vector.utils import batch_space
+from typing import Dict, Tuple, Any, Optional, Union
+
+from ..config import PlantCareConfig, load_config
+from .physics import PlantPhysics
+from .plant_env import build_observation_space, build_action_space, apply_sensor_noise
+from .weather import WeatherScenario
+from .randomization import DomainRandomizer
+from .state import STATE_FIELD_NAMES, vec_state_dtype, rng_from_words, rng_to_words
+
+try:
+    from gymnasium.vector import AutoresetMode
+    _SAME_STEP = AutoresetMode.SAME_STEP
+except ImportError:  # gymnasium < 1.1
+    _SAME_STEP = "SameStep"
+
+
+class PlantCareVecEnv(VectorEnv):
+    """
+    Native vectorized version of PlantCareEnv
+
+    Every sub-environment uses the same physics, weather model and reward as
+    PlantCareEnv, but the state lives in arrays of shape (num_envs,) and one
+    call to step() advances all of them. Finished sub-environments are reset
+    in place during the same step; their last observation and info are
+    returned in infos["final_obs"] / infos["final_info"].
+
+    The two are statistically equivalent, not identical for the same seed:
+    weather is drawn per step from one RNG shared by all sub-environments
+    (PlantCareEnv draws a per-episode block from its own), and the totals
+    accumulate in float64 (float32 in PlantCareEnv).
+    """
+
+    metadata = {'render_modes': [], 'autoreset_mode': _SAME_STEP}
+
+    def __init__(
+        self,
+        num_envs: int,
+        config_path: Union[str, PlantCareConfig] = "config.yaml",
+        weather_scenario: Union[str, WeatherScenario] = "normal",
+        domain_randomization: bool = False
+    ):
+        """
+        Initialize vectorized environment
+
+        Args:
+            num_envs: Number of parallel sub-environments
+            config_path: Configuration file path or loaded PlantCareConfig
+            weather_scenario: Scenario name or WeatherScenario parameter set
+            domain_randomization: Give every sub-environment its own physics
+                parameters on reset (training.domain_randomization)
+        """
+        self.config = load_config(config_path)
+
+        self.num_envs = num_envs
+        self.physics = PlantPhysics(self.config, weather_scenario)
+        self.scenario = self.physics.scenario
+        self.weather_scenario = self.scenario.name
+        self.randomizer = DomainRandomizer(self.config, enabled=domain_randomization)
+        self.sensor_noise_std = float(np.hypot(self.scenario.noise_std, self.randomizer.sensor_noise_std))
+
+        # Extract key parameters
+        self.timestep_hours = self.config.environment.timestep_hours
+        self.episode_days = self.config.environment.episode_days
+        self.max_steps = self.config.environment.max_steps
+        self.initial_moisture = self.config.environment.soil.initial_moisture
+        self.initial_health = self.config.environment.plant.initial_health
+
+        # Spaces
+        self.single_observation_space = build_observation_space()
+        self.single_action_space = build_action_space()
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        # Reward weights and constraints
+        self.alpha = self.config.reward.alpha
+        self.beta = self.config.reward.beta
+        self.gamma = self.config.reward.gamma
+        self.delta = self.config.reward.delta
+        self.constraints = self.config.reward.constraints
+
+        # State buffers (struct of arrays)
+        self.current_step = np.zeros(num_envs, dtype=np.int64)
+        self.hour_of_day = np.zeros(num_envs, dtype=np.int64)
+        self.hours_since_water = np.zeros(num_envs, dtype=np.int64)
+        self.soil_moisture = np.zeros(num_envs, dtype=np.float64)
+        self.plant_health = np.zeros(num_envs, dtype=np.float64)
+        self.temperature = np.zeros(num_envs, dtype=np.float64)
+        self.light_level = np.zeros(num_envs, dtype=np.float64)
+
+        # Per-environment physics parameters (domain randomization)
+        self.temp_bias = np.zeros(num_envs, dtype=np.float64)
+        self.evap_multiplier = np.ones(num_envs, dtype=np.float64)
+
+        # Statistics buffers
+        self.total_water_used = np.zeros(num_envs, dtype=np.float64)
+        self.total_energy_used = np.zeros(num_envs, dtype=np.float64)
+        self.total_violations = np.zeros(num_envs, dtype=np.int64)
+        self.health_sum = np.zeros(num_envs, dtype=np.float64)
+        self.state_dtype = vec_state_dtype(num_envs)  # get_state() record layout
+        self.profiler = None
+
+    def enable_profiling(self, profiler=None):
+        """
+        Time step phases (weather, physics, reward, autoreset, observation, info)
+
+        Args:
+            profiler: StepProfiler to add this environment to (new one if None)
+
+        Returns:
+            The attached StepProfiler
+        """
+        from .profiling import StepProfiler
+        self.disable_profiling()
+        self.profiler = (profiler or StepProfiler()).attach(self)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Detach the profiler and restore the uninstrumented methods"""
+        if self.profiler is not None:
+            self.profiler.detach(self)
+            self.profiler = None
+
+    def get_state(self) -> np.ndarray:
+        """
+        Snapshot of all sub-environments and the shared RNG as one fixed-layout record
+
+        Each state array is copied with one vectorized assignment, so the cost
+        barely depends on num_envs. Weather is drawn per step here, so unlike
+        PlantCareEnv there is no weather block.
+
+        Returns:
+            0-d structured array of dtype self.state_dtype (state['envs'][field] has shape (num_envs,))
+        """
+        state = np.zeros((), dtype=self.state_dtype)
+        envs = state['envs']
+        for name in STATE_FIELD_NAMES:
+            envs[name] = getattr(self, name)
+        rng_to_words(self.np_random, state['rng'])
+        return state
+
+    def set_state(self, state: np.ndarray):
+        """Restore a snapshot taken by get_state (state arrays are updated in place)"""
+        if state.dtype != self.state_dtype:
+            raise ValueError(f"State record layout {state.dtype} does not match this environment")
+        envs = state['envs']
+        for name in STATE_FIELD_NAMES:
+            getattr(self, name)[:] = envs[name]
+        rng_from_words(self.np_random, state['rng'])
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[Dict] = None
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Reset all sub-environments
+
+        Returns:
+            observations: Batch of initial observations, shape (num_envs, 6)
+            infos: Dictionary of per-environment info arrays
+        """
+        super().reset(seed=seed)
+        self._reset_indices(np.arange(self.num_envs))
+        return self._get_observation(), self._get_info()
+
+    def step(
+        self,
+        actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Execute one action step in every sub-environment
+
+        Args:
+            actions: Batch of [water_amount, lamp_on], shape (num_envs, 2)
+
+        Returns:
+            observations, rewards, terminations, truncations, infos
+        """
+        actions = np.asarray(actions)
+
+        # Parse actions
+        water_amount = np.clip(actions[:, 0], 0, 100)
+        lamp_on = actions[:, 1] > 0.5
+
+        previous_health = self.plant_health
+
+        # Environmental conditions and lamp contribution (500 lux when on)
+        temperature, ambient_light = self.physics.get_ambient_conditions_batch(
+            self.hour_of_day, self.scenario, self.np_random
+        )
+        self.temperature = temperature + self.temp_bias
+        lamp_contribution = np.where(lamp_on, 500, 0)
+        self.light_level = ambient_light + lamp_contribution
+
+        # Physics update for all plants at once
+        self.soil_moisture, self.plant_health, _, _ = self.physics.step_batch(
+            self.soil_moisture,
+            self.plant_health,
+            water_amount,
+            self.temperature,
+            self.light_level,
+            dt=self.timestep_hours,
+            evap_multiplier=self.evap_multiplier
+        )
+
+        # Update time and watering timer (> 5ml counts as effective watering)
+        self.current_step += 1
+        self.hour_of_day = (self.hour_of_day + self.timestep_hours) % 24
+        self.hours_since_water = np.where(
+            water_amount > 5,
+            0,
+            np.minimum(self.hours_since_water + self.timestep_hours, 24)
+        )
+
+        rewards = self._calculate_reward(previous_health, water_amount, lamp_on)
+
+        # Update statistics
+        self.total_water_used += water_amount
+        self.total_energy_used += lamp_contribution * self.timestep_hours
+        self.health_sum += self.plant_health
+
+        terminations = self.plant_health < 10.0
+        truncations = self.current_step >= self.max_steps
+
+        observations = self._get_observation()
+        infos = self._get_info()
+
+        # Auto-reset finished sub-environments in place (same-step mode)
+        done = terminations | truncations
+        if done.any():
+            infos['final_obs'] = observations.copy()
+            infos['_final_obs'] = done
+            infos['final_info'] = {key: value.copy() for key, value in infos.items()
+                                   if not key.startswith('final')}
+            infos['_final_info'] = done
+
+            done_idx = np.flatnonzero(done)
+            self._reset_indices(done_idx)
+            observations[done_idx] = self._get_observation(done_idx)
+            for key, value in self._get_info().items():
+                infos[key][done_idx] = value[done_idx]
+
+        return observations, rewards, terminations, truncations, infos
+
+    def _reset_indices(self, indices: np.ndarray):
+        """Reset the sub-environments at the given indices"""
+        self.current_step[indices] = 0
+        self.hour_of_day[indices] = 0
+        self.hours_since_water[indices] = 0
+        self.soil_moisture[indices] = self.initial_moisture
+        self.plant_health[indices] = self.initial_health
+
+        temperature, ambient_light = self.physics.get_ambient_conditions_batch(
+            self.hour_of_day[indices], self.scenario, self.np_random
+        )
+
+        # New physics parameters for the reset plants (no RNG draws unless enabled)
+        params = self.randomizer.sample(len(indices), self.np_random)
+        self.temp_bias[indices] = params['temp_bias']
+        self.evap_multiplier[indices] = params['evap_multiplier']
+
+        self.temperature[indices] = temperature + self.temp_bias[indices]
+        self.light_level[indices] = ambient_light
+
+        self.total_water_used[indices] = 0.0
+        self.total_energy_used[indices] = 0.0
+        self.total_violations[indices] = 0
+        self.health_sum[indices] = self.initial_health
+
+    def _get_observation(self, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get current observations, shape (num_envs, 6), or (len(indices), 6) for a subset
+
+        Sensor noise is drawn for the whole batch in one call.
+        """
+        index = slice(None) if indices is None else indices
+        observations = np.empty((self.num_envs if indices is None else len(indices), 6), dtype=np.float32)
+        observations[:, 0] = self.soil_moisture[index]
+        observations[:, 1] = self.temperature[index]
+        observations[:, 2] = self.light_level[index]
+        observations[:, 3] = self.hour_of_day[index]
+        observations[:, 4] = self.plant_health[index]
+        observations[:, 5] = self.hours_since_water[index]
+        return apply_sensor_noise(
+            observations, self.sensor_noise_std, self.np_random, self.single_observation_space
+        )
+
+    def _get_info(self) -> Dict[str, np.ndarray]:
+        """Get additional info (one array per key, same keys as PlantCareEnv)"""
+        return {
+            'total_water_used': self.total_water_used.copy(),
+            'total_energy_used': self.total_energy_used.copy(),
+            'total_violations': self.total_violations.copy(),
+            'avg_health': self.health_sum / (self.current_step + 1),
+            'current_step': self.current_step.copy()
+        }
+
+    def _calculate_reward(
+        self,
+        previous_health: np.ndarray,
+        water_amount: np.ndarray,
+        lamp_on: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate rewards for all sub-environments
+
+        R = α·Δhealth - β·water_used - γ·energy_used - δ·violations
+        """
+        health_delta = self.plant_health - previous_health
+        energy_penalty = np.where(lamp_on, 500 * self.timestep_hours, 0)
+
+        # Constraint violation detection
+        violations = (
+            (self.soil_moisture < self.constraints.moisture_min).astype(np.int64)
+            + (self.soil_moisture > self.constraints.moisture_max)
+            + (self.temperature < self.constraints.temp_min)
+            + (self.temperature > self.constraints.temp_max)
+        )
+        self.total_violations += violations
+
+        return (
+            self.alpha * health_delta
+            - self.beta * water_amount
+            - self.gamma * energy_penalty
+            - self.delta * violations
+        )
@@ -0,0 +1,214 @@
+"""
+Weather Generator
+Precomputed 24-hour temperature/light curves per scenario plus
+episode-level noise blocks, so a step only needs an array lookup
+"""
+
+import numpy as np
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from ..config import PlantCareConfig, load_config
+
+
+class WeatherScenario(NamedTuple):
+    """Parameter set of one weather scenario"""
+    name: str
+    temp_bias: float = 0.0         # °C added to the temperature curve
+    light_multiplier: float = 1.0  # Scale of the ambient light curve
+    evap_multiplier: float = 1.0   # Scale of the soil evaporation rate
+    noise_std: float = 0.0         # Relative noise on the moisture/temperature/light sensors
+
+
+# Built-in scenarios, extended / overridden by evaluation.test_scenarios
+BUILTIN_SCENARIOS = {
+    "normal": WeatherScenario("normal"),
+    "hot_dry": WeatherScenario("hot_dry", temp_bias=5.0, light_multiplier=1.2),
+    "cloudy": WeatherScenario("cloudy", temp_bias=-2.0, light_multiplier=0.6),
+}
+
+
+def load_scenarios(config: Union[PlantCareConfig, Dict]) -> Dict[str, WeatherScenario]:
+    """
+    Scenario parameter sets declared in config.yaml
+
+    Each entry of evaluation.test_scenarios becomes a WeatherScenario; fields
+    it does not set keep the value of the built-in scenario of the same name
+    (or the neutral default).
+
+    Args:
+        config: Configuration (PlantCareConfig or dictionary)
+
+    Returns:
+        {name: WeatherScenario}, built-ins first, then declared scenarios
+    """
+    scenarios = dict(BUILTIN_SCENARIOS)
+    for entry in load_config(config).evaluation.test_scenarios:
+        base = scenarios.get(entry.name, WeatherScenario(entry.name))
+        overrides = {
+            field: getattr(entry, field)
+            for field in WeatherScenario._fields[1:]
+            if getattr(entry, field) is not None
+        }
+        scenarios[entry.name] = base._replace(**overrides)
+    return scenarios
+
+
+# Standard deviation of the hourly weather fluctuations
+TEMP_NOISE_STD = 1.0   # °C
+LIGHT_NOISE_STD = 50.0  # lux
+
+# Generators shared between environments, see WeatherGenerator.for_config
+_SHARED_GENERATORS: Dict[tuple, "WeatherGenerator"] = {}
+
+
+class WeatherGenerator:
+    """Diurnal weather tables, built once per scenario"""
+
+    def __init__(self, config: Union[PlantCareConfig, Dict]):
+        """
+        Build the base day-night curves
+
+        Args:
+            config: Configuration (uses environment.weather and evaluation.test_scenarios)
+        """
+        config = load_config(config)
+        weather = config.environment.weather
+        hours = np.arange(24)
+
+        # Day-night temperature variation (sine wave)
+        temp_amplitude = weather.temp_day_night_diff / 2
+        self.base_temperature = weather.temp_mean + temp_amplitude * np.sin(2 * np.pi * (hours - 6) / 24)
+
+        # Day-night light variation: sine curve from 6:00 to 18:00, zero at night
+        self.base_light = np.where(
+            (hours >= 6) & (hours <= 18),
+            weather.light_max * np.sin(np.pi * (hours - 6) / 12),
+            0.0
+        )
+
+        # Tables may be shared between environments (see for_config)
+        self.base_temperature.setflags(write=False)
+        self.base_light.setflags(write=False)
+
+        self.scenarios = load_scenarios(config)
+        self._tables: Dict[WeatherScenario, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @staticmethod
+    def for_config(config: PlantCareConfig) -> "WeatherGenerator":
+        """Generator shared by every environment with the same weather and scenario settings"""
+        key = (config.environment.weather, config.evaluation.test_scenarios)
+        generator = _SHARED_GENERATORS.get(key)
+        if generator is None:
+            generator = _SHARED_GENERATORS[key] = WeatherGenerator(config)
+        return generator
+
+    def scenario(self, weather_scenario: Union[str, WeatherScenario]) -> WeatherScenario:
+        """
+        Resolve a scenario name to its parameter set
+
+        Unknown names map to neutral parameters, parameter sets are returned as is.
+        """
+        if isinstance(weather_scenario, WeatherScenario):
+            return weather_scenario
+        return self.scenarios.get(weather_scenario) or WeatherScenario(weather_scenario)
+
+    def curves(self, weather_scenario: Union[str, WeatherScenario] = "normal") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Noise-free 24-hour curves for a scenario (cached)
+
+        Args:
+            weather_scenario: Scenario name or parameter set
+
+        Returns:
+            (temperature, ambient_light), each shape (24,)
+        """
+        scenario = self.scenario(weather_scenario)
+        table = self._tables.get(scenario)
+        if table is None:
+            table = (self.base_temperature + scenario.temp_bias, self.base_light * scenario.light_multiplier)
+            for array in table:
+                array.setflags(write=False)
+            self._tables[scenario] = table
+        return table
+
+    def sample(
+        self,
+        hours: np.ndarray,
+        weather_scenario: Union[str, WeatherScenario],
+        rng: Optional[np.random.Generator] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw noisy conditions for an array of hours in one vectorized block
+
+        Args:
+            hours: Hour of day for every sample [0, 23]
+            weather_scenario: Scenario name or parameter set
+            rng: Random generator, e.g. the environment's np_random (global RNG if None)
+
+        Returns:
+            (temperature, ambient_light), each with the shape of hours
+        """
+        hours = np.asarray(hours)
+        standard_normal = np.random.standard_normal if rng is None else rng.standard_normal
+        noise = standard_normal((2,) + hours.shape)
+        return self.apply_noise(hours, weather_scenario, noise[0], noise[1])
+
+    def apply_noise(
+        self,
+        hours: np.ndarray,
+        weather_scenario: Union[str, WeatherScenario],
+        temp_noise: np.ndarray,
+        light_noise: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Combine base curves with standard-normal noise drawn elsewhere
+
+        Lets callers draw the noise of many episodes first (one RNG stream
+        each) and then build all conditions in a single broadcast.
+
+        Args:
+            hours: Hour of day for every sample [0, 23]
+            weather_scenario: Scenario name or parameter set
+            temp_noise: Standard-normal temperature noise, broadcastable with hours
+            light_noise: Standard-normal light noise, broadcastable with hours
+
+        Returns:
+            (temperature, ambient_light)
+        """
+        base_temperature, base_light = self.curves(weather_scenario)
+        temperature = base_temperature[hours] + TEMP_NOISE_STD * temp_noise
+        ambient_light = np.maximum(0.0, base_light[hours] + LIGHT_NOISE_STD * light_noise)
+        return temperature, ambient_light
+
+    def sample_episode(
+        self,
+        n_steps: int,
+        weather_scenario: Union[str, WeatherScenario],
+        rng: np.random.Generator,
+        timestep_hours: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw the conditions of a whole episode
+
+        Index 0 holds the conditions observed at reset, index k + 1 those used
+        by step k (taken at hour k * timestep_hours of the episode).
+
+        Args:
+            n_steps: Number of steps in the episode
+            weather_scenario: Scenario name or parameter set
+            rng: Random generator
+            timestep_hours: Hours per step
+
+        Returns:
+            (temperature, ambient_light), each shape (n_steps + 1,)
+        """
+        hours = self.episode_hours(n_steps, timestep_hours)
+        return self.sample(hours, weather_scenario, rng)
+
+    @staticmethod
+    def episode_hours(n_steps: int, timestep_hours: int = 1) -> np.ndarray:
+        """Hour of day for each entry of an episode weather block, shape (n_steps + 1,)"""
+        hours = np.empty(n_steps + 1, dtype=np.int64)
+        hours[0] = 0
+        hours[1:] = (np.arange(n_steps) * timestep_hours) % 24
+        return hours
@@ -0,0 +1,220 @@
+"""
+Prefetching Weather Provider
+Wraps a slow weather source (forecast file, local forecast service) for
+PlantCareEnv.set_weather_provider: background threads fetch the upcoming
+hours into a ring buffer, results are kept in an LRU cache, and a lookup
+never waits for the source
+"""
+
+import time
+import threading
+import numpy as np
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from ..config import PlantCareConfig, load_config
+from .physics import PlantPhysics
+from .weather import WeatherScenario
+
+
+# (scenario, day, hour)
+WeatherKey = Tuple[Union[str, WeatherScenario], int, int]
+
+
+class PrefetchingWeatherProvider:
+    """
+    Non-blocking weather provider with prefetch and caching
+
+    The provider follows the environment's clock: every call advances an
+    absolute hour counter (a call with an hour earlier than the previous one
+    starts the next day), and the prefetch threads fetch the next
+    prefetch_hours hours from source_fn. A lookup checks the LRU cache,
+    then the ring buffer; on a miss it returns
+    PlantPhysics.get_ambient_conditions() immediately and the source is
+    still fetched in the background. Because hits depend on thread timing,
+    rollouts with a provider are not bit-reproducible.
+
+    Example:
+        provider = PrefetchingWeatherProvider(read_forecast, config)
+        env.set_weather_provider(provider)
+    """
+
+    def __init__(
+        self,
+        source_fn: Callable[[int, int, Union[str, WeatherScenario]], Tuple[float, float]],
+        config_path: Union[str, PlantCareConfig] = "config.yaml",
+        prefetch_hours: int = 48,
+        cache_size: int = 4096,
+        n_threads: int = 1,
+        seed: Optional[int] = None,
+        history: int = 10_000
+    ):
+        """
+        Args:
+            source_fn: (day, hour_of_day, weather_scenario) -> (temperature, ambient_light); may be slow
+            config_path: Configuration file path or loaded PlantCareConfig (fallback physics, timestep)
+            prefetch_hours: Lookahead window (also the ring buffer capacity)
+            cache_size: LRU cache entries
+            n_threads: Prefetch threads (> 1 overlaps the latency of I/O-bound sources)
+            seed: Seed of the fallback weather noise
+            history: Latency samples kept for stats()
+        """
+        if prefetch_hours < 1:
+            raise ValueError("prefetch_hours must be at least 1")
+        config = load_config(config_path)
+        self.source_fn = source_fn
+        self.physics = PlantPhysics(config)
+        self.timestep_hours = config.environment.timestep_hours
+        self.prefetch_hours = prefetch_hours
+        self.cache_size = cache_size
+        self._rng = np.random.default_rng(seed)
+
+        # Lookahead ring: slot t % capacity holds the entry of absolute hour t
+        self._ring_keys: List[Optional[WeatherKey]] = [None] * prefetch_hours
+        self._ring_values: List[Optional[Tuple[float, float]]] = [None] * prefetch_hours
+        self._cache: "OrderedDict[WeatherKey, Tuple[float, float]]" = OrderedDict()
+        self._in_flight: Set[WeatherKey] = set()
+        self._failed: Set[WeatherKey] = set()
+
+        # Consumer clock (absolute hour) and scenario, read by the prefetch threads
+        self._time = 0
+        self._scenario: Union[str, WeatherScenario, None] = None
+
+        self.counters = {'hits': 0, 'misses': 0, 'prefetched': 0, 'source_errors': 0}
+        self.lookup_ns: Deque[int] = deque(maxlen=history)
+        self.source_ns: Deque[int] = deque(maxlen=history)
+
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._prefetch_loop, name=f"weather-prefetch-{i}", daemon=True)
+            for i in range(n_threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __call__(self, hour_of_day: int, weather_scenario: Union[str, WeatherScenario]) -> Tuple[float, float]:
+        """Weather provider hook: (temperature, ambient_light) for the given hour"""
+        start = time.perf_counter_ns()
+        hour = int(hour_of_day) % 24
+        with self._lock:
+            t = self._time - self._time % 24 + hour
+            if t < self._time:
+                t += 24
+            key = (weather_scenario, t // 24, hour)
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            else:
+                slot = t % self.prefetch_hours
+                if self._ring_keys[slot] == key:
+                    value = self._ring_values[slot]
+                    if value is not None:
+                        self._remember(key, value)
+            if t != self._time or weather_scenario != self._scenario:
+                self._time = t
+                self._scenario = weather_scenario
+                self._wake.notify_all()
+
+        if value is None:
+            self.counters['misses'] += 1
+            value = self.physics.get_ambient_conditions(hour, weather_scenario, self._rng)
+        else:
+            self.counters['hits'] += 1
+        self.lookup_ns.append(time.perf_counter_ns() - start)
+        return value
+
+    def seek(self, day: int, hour: int = 0):
+        """Move the clock, e.g. to replay the same forecast days in every episode"""
+        with self._lock:
+            self._time = day * 24 + hour
+            self._wake.notify_all()
+
+    def stats(self) -> Dict:
+        """
+        Counters plus latency statistics
+
+        Returns:
+            Dictionary with hits, misses, prefetched, source_errors, hit_rate,
+            cache_entries, lookup p50/p99 (us) and source mean/p99 (ms)
+        """
+        stats = dict(self.counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['cache_entries'] = len(self._cache)
+        if self.lookup_ns:
+            p50, p99 = np.percentile(np.asarray(self.lookup_ns, dtype=np.float64) / 1e3, [50, 99])
+            stats['lookup_p50_us'], stats['lookup_p99_us'] = float(p50), float(p99)
+        if self.source_ns:
+            latencies = np.asarray(self.source_ns, dtype=np.float64) / 1e6
+            stats['source_mean_ms'] = float(np.mean(latencies))
+            stats['source_p99_ms'] = float(np.percentile(latencies, 99))
+        return stats
+
+    def close(self):
+        """Stop the prefetch threads (an in-progress source call is not interrupted)"""
+        with self._lock:
+            self._closed = True
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def __enter__(self) -> "PrefetchingWeatherProvider":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _remember(self, key: WeatherKey, value: Tuple[float, float]):
+        """Insert into the LRU cache (lock held)"""
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _next_missing(self) -> Optional[Tuple[int, WeatherKey]]:
+        """First hour of the lookahead window that nobody has fetched (lock held)"""
+        if self._scenario is None:
+            return None
+        first = self._time
+        for t in range(first, first + self.prefetch_hours, self.timestep_hours):
+            key = (self._scenario, t // 24, t % 24)
+            slot = t % self.prefetch_hours
+            if (self._ring_keys[slot] != key and key not in self._cache
+                    and key not in self._in_flight and key not in self._failed):
+                return t, key
+        return None
+
+    def _prefetch_loop(self):
+        while True:
+            with self._lock:
+                task = self._next_missing()
+                while task is None and not self._closed:
+                    self._wake.wait()
+                    task = self._next_missing()
+                if self._closed:
+                    return
+                t, key = task
+                self._in_flight.add(key)
+
+            scenario, day, hour = key
+            start = time.perf_counter_ns()
+            try:
+                value = tuple(float(v) for v in self.source_fn(day, hour, scenario))
+            except Exception:
+                value = None
+            self.source_ns.append(time.perf_counter_ns() - start)
+
+            with self._lock:
+                self._in_flight.discard(key)
+                if value is None:
+                    # Not retried while the key stays in the window; the set is bounded like the cache
+                    self.counters['source_errors'] += 1
+                    if len(self._failed) >= self.cache_size:
+                        self._failed.clear()
+                    self._failed.add(key)
+                    continue
+                self.counters['prefetched'] += 1
+                slot = t % self.prefetch_hours
+                self._ring_keys[slot] = key
+                self._ring_values[slot] = value
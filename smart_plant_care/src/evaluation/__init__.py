@@ -0,0 +1,13 @@
+"""策略评估模块"""
+
+from ..lazy import lazy_exports
+
+__all__ = ['evaluate_policy', 'evaluate_in_env', 'summarize_results', 'summarize_by_scenario', 'run_sweep']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'evaluate_policy': '.harness',
+    'evaluate_in_env': '.harness',
+    'summarize_results': '.harness',
+    'summarize_by_scenario': '.harness',
+    'run_sweep': '.sweep',
+})
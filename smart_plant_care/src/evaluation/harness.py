@@ -0,0 +1,324 @@
+"""
+Unified Policy Evaluation Harness
+One evaluation loop for rule-based policies and SB3 models, fanned out
+over seeds × weather scenarios with a process pool
+"""
+
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple, Union
+
+from src.config import PlantCareConfig
+from src.environment import PlantCareEnv, WeatherScenario
+
+
+# Per-episode metrics collected by every backend
+METRIC_KEYS = ('avg_health', 'final_health', 'total_water', 'total_energy', 'violations', 'efficiency')
+
+
+def _empty_results() -> Dict[str, List]:
+    """Results container: one list entry per episode"""
+    results = {key: [] for key in METRIC_KEYS}
+    results['reward'] = []
+    results['seed'] = []
+    results['scenario'] = []
+    return results
+
+
+def _merge_results(target: Dict[str, List], source: Dict[str, List]):
+    """Append the episodes of source to target"""
+    for key, values in source.items():
+        target[key].extend(values)
+
+
+def _process_pool(n_workers: int) -> ProcessPoolExecutor:
+    """
+    Worker pool for evaluation tasks
+
+    Workers are spawned rather than forked: the parent may already run Numba
+    (episode kernel) or PyTorch thread pools, which do not survive a fork.
+    """
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _action_fn(policy):
+    """Return a callable observation -> action for a rule policy or SB3 model"""
+    if hasattr(policy, 'get_action'):
+        return policy.get_action
+    if hasattr(policy, 'predict'):
+        return lambda obs: policy.predict(obs, deterministic=True)[0]
+    raise TypeError(f"Policy {type(policy).__name__} has neither get_action() nor predict()")
+
+
+def _load_policy(policy):
+    """Policies may be given as a path to a saved SB3 model (.zip)"""
+    if isinstance(policy, str):
+        from stable_baselines3 import PPO
+        return PPO.load(policy, device="cpu")
+    return policy
+
+
+def _scenario_policy(policy, scenario: Union[str, WeatherScenario]):
+    """Policies with their own weather model (MPCPolicy) plan with the scenario under evaluation"""
+    return policy.for_scenario(scenario) if hasattr(policy, 'for_scenario') else policy
+
+
+def _record_episode(
+    results: Dict[str, List],
+    obs: np.ndarray,
+    info: Dict,
+    total_reward: float,
+    seed: int,
+    scenario: str
+):
+    """Append the metrics of one finished episode"""
+    avg_health = info['avg_health']
+    total_water = info['total_water_used']
+    total_energy = info['total_energy_used']
+
+    results['avg_health'].append(avg_health)
+    results['final_health'].append(obs[4])  # plant_health
+    results['total_water'].append(total_water)
+    results['total_energy'].append(total_energy)
+    results['violations'].append(info['total_violations'])
+    # Efficiency = health gain / (water + λ·energy)
+    results['efficiency'].append(avg_health / (total_water + 0.001 * total_energy + 1e-6))
+    results['reward'].append(total_reward)
+    results['seed'].append(int(seed))
+    results['scenario'].append(scenario)
+
+
+def evaluate_in_env(
+    policy,
+    env: PlantCareEnv,
+    seeds: Sequence[int],
+    verbose: bool = True
+) -> Tuple[Dict, Dict[str, List]]:
+    """
+    Evaluate a policy serially on an existing environment
+
+    Args:
+        policy: Object with get_action(obs) (rule policies) or predict(obs) (SB3 models)
+        env: Environment to run the episodes in
+        seeds: One reset seed per episode
+        verbose: Print one line per episode
+
+    Returns:
+        summary: Aggregated statistics (see summarize_results)
+        results: Per-episode metric lists
+    """
+    act = _action_fn(policy)
+    results = _empty_results()
+    seeds = list(seeds)
+
+    for episode, seed in enumerate(seeds):
+        obs, info = env.reset(seed=int(seed))
+        terminated = False
+        truncated = False
+        total_reward = 0.0
+
+        while not (terminated or truncated):
+            obs, reward, terminated, truncated, info = env.step(act(obs))
+            total_reward += reward
+
+        _record_episode(results, obs, info, total_reward, seed, env.weather_scenario)
+
+        if verbose:
+            print(f"Episode {episode + 1}/{len(seeds)}: "
+                  f"Avg Health={results['avg_health'][-1]:.1f}, "
+                  f"Water={results['total_water'][-1]:.1f}ml, "
+                  f"Violations={results['violations'][-1]}")
+
+    return summarize_results(results), results
+
+
+def summarize_results(results: Dict[str, List]) -> Dict:
+    """
+    Aggregate per-episode metrics into the summary dictionary
+
+    Returns:
+        Dictionary with avg_health_mean/std, final_health_mean, total_water_mean,
+        total_energy_mean, violations_mean and efficiency_mean
+    """
+    return {
+        'avg_health_mean': np.mean(results['avg_health']),
+        'avg_health_std': np.std(results['avg_health']),
+        'final_health_mean': np.mean(results['final_health']),
+        'total_water_mean': np.mean(results['total_water']),
+        'total_energy_mean': np.mean(results['total_energy']),
+        'violations_mean': np.mean(results['violations']),
+        'efficiency_mean': np.mean(results['efficiency'])
+    }
+
+
+def _evaluate_chunk(
+    policy,
+    config_path: Union[str, PlantCareConfig],
+    scenario: Union[str, WeatherScenario],
+    seeds: List[int],
+    verbose: bool = False
+) -> Dict[str, List]:
+    """Evaluate a chunk of seeds for one scenario (serial backend and process pool task)"""
+    env = PlantCareEnv(config_path=config_path, weather_scenario=scenario)
+    _, results = evaluate_in_env(_scenario_policy(_load_policy(policy), scenario), env, seeds, verbose=verbose)
+    env.close()
+    return results
+
+
+def _batch_action_fn(policy):
+    """Return a callable (batch, obs_dim) -> (batch, action_dim) for any policy"""
+    if hasattr(policy, 'predict_batch'):
+        return policy.predict_batch
+    if hasattr(policy, 'policy') and hasattr(policy, 'predict'):
+        # SB3 model: one forward pass per tick through the batched wrapper
+        from src.agents.inference import BatchedPolicy
+        return BatchedPolicy.from_model(policy).predict_batch
+    act = _action_fn(policy)
+    return lambda observations: np.stack([act(obs) for obs in observations])
+
+
+def _evaluate_lockstep(
+    policy,
+    config_path: Union[str, PlantCareConfig],
+    scenario: Union[str, WeatherScenario],
+    seeds: List[int]
+) -> Dict[str, List]:
+    """
+    Run one environment per seed in lock-step, batching the policy calls
+
+    All still-running environments are stacked into one observation batch
+    per tick, so an SB3 model runs one forward pass per tick instead of one
+    per environment. Episodes are identical to the serial backend.
+    """
+    act = _batch_action_fn(_scenario_policy(_load_policy(policy), scenario))
+    envs = [PlantCareEnv(config_path=config_path, weather_scenario=scenario) for _ in seeds]
+    observations = np.stack([env.reset(seed=seed)[0] for env, seed in zip(envs, seeds)])
+    total_rewards = np.zeros(len(envs))
+    final = [None] * len(envs)
+    active = np.arange(len(envs))
+
+    while len(active):
+        actions = act(observations[active])
+        still_active = []
+        for i, action in zip(active, actions):
+            obs, reward, terminated, truncated, info = envs[i].step(action)
+            observations[i] = obs
+            total_rewards[i] += reward
+            if terminated or truncated:
+                final[i] = (obs, info)
+            else:
+                still_active.append(i)
+        active = np.asarray(still_active, dtype=np.intp)
+
+    results = _empty_results()
+    for i, env in enumerate(envs):
+        obs, info = final[i]
+        _record_episode(results, obs, info, float(total_rewards[i]), seeds[i], env.weather_scenario)
+        env.close()
+    return results
+
+
+def _evaluate_kernel(
+    policy,
+    config_path: Union[str, PlantCareConfig],
+    scenario: Union[str, WeatherScenario],
+    seeds: List[int]
+) -> Dict[str, List]:
+    """Evaluate a rule policy with the compiled episode kernel (identical metrics)"""
+    from src.baselines.episode_kernel import simulate_episodes
+
+    metrics = simulate_episodes(policy, seeds, config_path=config_path, weather_scenario=scenario)
+    results = {key: list(metrics[key]) for key in METRIC_KEYS}
+    results['reward'] = [float('nan')] * len(seeds)  # Rewards are not tracked by the kernel
+    results['seed'] = [int(seed) for seed in seeds]
+    name = scenario.name if isinstance(scenario, WeatherScenario) else scenario
+    results['scenario'] = [name] * len(seeds)
+    return results
+
+
+def evaluate_policy(
+    policy,
+    config_path: Union[str, PlantCareConfig] = "config.yaml",
+    seeds: Sequence[int] = (42, 43, 44, 45, 46),
+    scenarios: Sequence[Union[str, WeatherScenario]] = ("normal",),
+    n_workers: int = 1,
+    backend: str = "auto",
+    verbose: bool = False
+) -> Tuple[Dict, Dict[str, List]]:
+    """
+    Evaluate a policy over every combination of seeds × weather scenarios
+
+    Args:
+        policy: Rule policy, SB3 model, or path to a saved SB3 model (.zip).
+            Pass a path when using the process backend with an SB3 model so
+            each worker loads its own copy.
+        config_path: Configuration file path or loaded PlantCareConfig
+        seeds: Reset seeds, evaluated for every scenario
+        scenarios: Scenario names (see evaluation.test_scenarios) or WeatherScenario parameter sets
+        n_workers: Worker processes for the "process" backend
+        backend: "serial", "process", "batched" (all seeds of a scenario in
+            lock-step, one batched policy call per tick), "kernel" (rule
+            policies only, compiled simulator) or "auto" (process if
+            n_workers > 1, else serial)
+        verbose: Print one line per episode (serial backend only)
+
+    Returns:
+        summary: Aggregated statistics over all episodes
+        results: Per-episode metric lists, with "seed" and "scenario" columns
+    """
+    seeds = [int(seed) for seed in seeds]
+    if backend == "auto":
+        backend = "process" if n_workers > 1 else "serial"
+
+    results = _empty_results()
+
+    if backend == "serial":
+        policy = _load_policy(policy)
+        for scenario in scenarios:
+            _merge_results(results, _evaluate_chunk(policy, config_path, scenario, seeds, verbose))
+    elif backend == "batched":
+        policy = _load_policy(policy)
+        for scenario in scenarios:
+            _merge_results(results, _evaluate_lockstep(policy, config_path, scenario, seeds))
+    elif backend == "kernel":
+        for scenario in scenarios:
+            _merge_results(results, _evaluate_kernel(policy, config_path, scenario, seeds))
+    elif backend == "process":
+        # Several chunks per worker keeps the pool busy when scenarios differ in cost
+        chunk_size = max(1, -(-len(seeds) * len(scenarios) // (4 * n_workers)))
+        tasks = [
+            (scenario, seeds[i:i + chunk_size])
+            for scenario in scenarios
+            for i in range(0, len(seeds), chunk_size)
+        ]
+        with _process_pool(n_workers) as pool:
+            futures = [
+                pool.submit(_evaluate_chunk, policy, config_path, scenario, chunk)
+                for scenario, chunk in tasks
+            ]
+            for future in futures:
+                _merge_results(results, future.result())
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    return summarize_results(results), results
+
+
+def summarize_by_scenario(results: Dict[str, List]) -> Dict[str, Dict]:
+    """
+    Summary dictionary per weather scenario
+
+    Args:
+        results: Per-episode results returned by evaluate_policy
+
+    Returns:
+        {scenario: summary}
+    """
+    scenarios = np.asarray(results['scenario'])
+    summaries = {}
+    for scenario in dict.fromkeys(results['scenario']):
+        mask = scenarios == scenario
+        subset = {key: np.asarray(results[key])[mask] for key in METRIC_KEYS}
+        summaries[scenario] = summarize_results(subset)
+    return summaries
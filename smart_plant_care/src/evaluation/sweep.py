@@ -0,0 +1,269 @@
+"""
+Scenario Sweep Runner
+Evaluates policies × evaluation.test_scenarios × seeds in parallel and
+caches every cell, keyed by (policy hash, scenario, seed), so a rerun only
+recomputes cells whose inputs changed
+"""
+
+import os
+import math
+import json
+import hashlib
+import argparse
+import dataclasses
+from typing import Dict, List, Optional, Sequence, Union
+
+from src.config import PlantCareConfig, load_config
+from src.environment import WeatherScenario, load_scenarios
+from src.evaluation.harness import (
+    METRIC_KEYS, summarize_results, _evaluate_chunk, _evaluate_kernel, _process_pool
+)
+
+
+# Metrics stored per cached cell
+CELL_KEYS = METRIC_KEYS + ('reward',)
+
+
+def policy_hash(policy) -> str:
+    """
+    Content hash of a policy
+
+    Saved models (.zip paths) hash the file, SB3 models their network
+    weights, policies with a cache_key() (MPCPolicy) that key, rule
+    policies their class and parameters.
+    """
+    digest = hashlib.sha256()
+    if isinstance(policy, str):
+        with open(policy, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    elif hasattr(policy, 'policy') and hasattr(policy.policy, 'state_dict'):
+        for name, tensor in policy.policy.state_dict().items():
+            digest.update(name.encode())
+            digest.update(tensor.detach().cpu().numpy().tobytes())
+    elif hasattr(policy, 'cache_key'):
+        digest.update(type(policy).__qualname__.encode())
+        digest.update(json.dumps(policy.cache_key(), sort_keys=True).encode())
+    else:
+        digest.update(type(policy).__qualname__.encode())
+        digest.update(json.dumps(vars(policy), sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def scenario_hash(scenario: WeatherScenario, config: PlantCareConfig) -> str:
+    """
+    Hash of everything besides the policy and seed that determines a cell:
+    the scenario parameters, the environment section and the reward section
+    """
+    inputs = {
+        'scenario': scenario._asdict(),
+        'environment': dataclasses.asdict(config.environment),
+        'reward': dataclasses.asdict(config.reward),
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class SweepCache:
+    """
+    Per-cell result store backed by a JSON file
+
+    Keys are "policy_hash/scenario_hash/seed", values the per-episode
+    metrics. Values the backend did not compute (the kernel's rewards) are
+    stored as null, keeping the file standard JSON.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file (None keeps the cache in memory only)
+        """
+        self.path = path
+        self.cells: Dict[str, Dict[str, float]] = {}
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                self.cells = json.load(f)
+
+    @staticmethod
+    def key(policy_key: str, scenario_key: str, seed: int) -> str:
+        return f"{policy_key}/{scenario_key}/{int(seed)}"
+
+    def get(self, policy_key: str, scenario_key: str, seed: int) -> Optional[Dict[str, float]]:
+        return self.cells.get(self.key(policy_key, scenario_key, seed))
+
+    def put(self, policy_key: str, scenario_key: str, results: Dict[str, List]):
+        """Store every episode of a harness results dictionary"""
+        for i, seed in enumerate(results['seed']):
+            self.cells[self.key(policy_key, scenario_key, seed)] = {
+                name: _json_value(results[name][i]) for name in CELL_KEYS
+            }
+
+    def save(self):
+        """Write the cache atomically"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.cells, f)
+        os.replace(tmp_path, self.path)
+
+
+def _json_value(value) -> Optional[float]:
+    """Metric as a JSON number (None for NaN)"""
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _kernel_supported(policy, scenario: WeatherScenario) -> bool:
+    """Rule policies on noise-free scenarios can use the compiled episode kernel"""
+    from src.baselines import FixedSchedulePolicy, ThresholdRulePolicy
+    return isinstance(policy, (FixedSchedulePolicy, ThresholdRulePolicy)) and scenario.noise_std == 0
+
+
+def run_sweep(
+    policies: Dict[str, object],
+    config_path: Union[str, PlantCareConfig] = "config.yaml",
+    seeds: Sequence[int] = range(20),
+    scenarios: Optional[Sequence[str]] = None,
+    n_workers: int = 1,
+    cache_path: Optional[str] = None,
+    use_kernel: bool = True,
+    verbose: bool = True
+) -> Dict[str, Dict[str, Dict]]:
+    """
+    Evaluate every policy on every scenario and seed, reusing cached cells
+
+    Args:
+        policies: {name: policy}; rule policies, SB3 models or paths to saved
+            models (.zip). Pass paths for SB3 models when n_workers > 1.
+        config_path: Configuration file path or loaded PlantCareConfig
+        seeds: Reset seeds, evaluated for every policy and scenario
+        scenarios: Scenario names (default: all of evaluation.test_scenarios)
+        n_workers: Worker processes for the Gym evaluations
+        cache_path: JSON cache file (None: no persistent cache)
+        use_kernel: Run rule policies on noise-free scenarios through the
+            compiled episode kernel (identical metrics, much faster, but no
+            rewards); with use_kernel=False cached cells without a reward are
+            recomputed
+        verbose: Print cache statistics
+
+    Returns:
+        {policy_name: {scenario_name: summary}} (see summarize_results)
+    """
+    config = load_config(config_path)
+
+    declared = load_scenarios(config)
+    if scenarios is None:
+        scenarios = [entry.name for entry in config.evaluation.test_scenarios]
+    unknown = [name for name in scenarios if name not in declared]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {unknown}")
+
+    seeds = [int(seed) for seed in seeds]
+    cache = SweepCache(cache_path)
+    policy_keys = {name: policy_hash(policy) for name, policy in policies.items()}
+    scenario_keys = {name: scenario_hash(declared[name], config) for name in scenarios}
+
+    # Collect the cells that are not cached yet, one task per (policy, scenario)
+    tasks = []
+    for policy_name, policy in policies.items():
+        for scenario_name in scenarios:
+            missing = []
+            for seed in seeds:
+                cell = cache.get(policy_keys[policy_name], scenario_keys[scenario_name], seed)
+                if cell is None or (not use_kernel and cell['reward'] is None):
+                    missing.append(seed)
+            if missing:
+                tasks.append((policy_name, scenario_name, missing))
+
+    n_cells = len(policies) * len(scenarios) * len(seeds)
+    n_missing = sum(len(missing) for _, _, missing in tasks)
+    if verbose:
+        print(f"Sweep: {n_cells} cells, {n_cells - n_missing} cached, {n_missing} to compute")
+
+    # Kernel-eligible tasks run in-process, the rest in seed chunks on the pool
+    pool_tasks = []
+    for policy_name, scenario_name, missing in tasks:
+        policy, scenario = policies[policy_name], declared[scenario_name]
+        if use_kernel and _kernel_supported(policy, scenario):
+            results = _evaluate_kernel(policy, config_path, scenario, missing)
+            cache.put(policy_keys[policy_name], scenario_keys[scenario_name], results)
+        else:
+            chunk_size = max(1, -(-len(missing) // max(n_workers, 1)))
+            pool_tasks.extend(
+                (policy_name, scenario_name, missing[i:i + chunk_size])
+                for i in range(0, len(missing), chunk_size)
+            )
+
+    if pool_tasks and n_workers > 1:
+        with _process_pool(n_workers) as pool:
+            futures = {
+                pool.submit(_evaluate_chunk, policies[p], config_path, declared[s], chunk): (p, s)
+                for p, s, chunk in pool_tasks
+            }
+            for future, (policy_name, scenario_name) in futures.items():
+                cache.put(policy_keys[policy_name], scenario_keys[scenario_name], future.result())
+    else:
+        for policy_name, scenario_name, chunk in pool_tasks:
+            results = _evaluate_chunk(policies[policy_name], config_path, declared[scenario_name], chunk)
+            cache.put(policy_keys[policy_name], scenario_keys[scenario_name], results)
+
+    if n_missing:
+        cache.save()
+
+    # Assemble summaries from the cache
+    summaries = {}
+    for policy_name in policies:
+        summaries[policy_name] = {}
+        for scenario_name in scenarios:
+            cells = [cache.get(policy_keys[policy_name], scenario_keys[scenario_name], seed) for seed in seeds]
+            results = {key: [cell[key] for cell in cells] for key in CELL_KEYS}
+            summaries[policy_name][scenario_name] = summarize_results(results)
+    return summaries
+
+
+def _build_policy(name: str, config_path: Union[str, PlantCareConfig]):
+    """Baseline name or path to a saved model"""
+    if name == "fixed_schedule":
+        from src.baselines import FixedSchedulePolicy
+        return FixedSchedulePolicy(config_path)
+    if name == "threshold_rule":
+        from src.baselines import ThresholdRulePolicy
+        return ThresholdRulePolicy(config_path)
+    if name == "mpc":
+        from src.baselines import MPCPolicy
+        return MPCPolicy(config_path, seed=0)  # Fixed sampler seed keeps sweep cells cacheable
+    return name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Policy × scenario × seed evaluation sweep")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Configuration file path")
+    parser.add_argument("--policies", type=str, nargs="+", default=["fixed_schedule", "threshold_rule"],
+                        help="Baseline names (fixed_schedule, threshold_rule, mpc) or model paths (.zip)")
+    parser.add_argument("--scenarios", type=str, nargs="+", default=None, help="Scenario names (default: all)")
+    parser.add_argument("--seeds", type=int, default=None, help="Seeds per cell (default: evaluation.sweep.n_seeds)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: evaluation.sweep.n_workers)")
+    parser.add_argument("--no_cache", action="store_true", help="Recompute every cell")
+    args = parser.parse_args()
+
+    sweep_config = load_config(args.config).evaluation.sweep
+
+    summaries = run_sweep(
+        {name: _build_policy(name, args.config) for name in args.policies},
+        config_path=args.config,
+        seeds=range(args.seeds or sweep_config.n_seeds),
+        scenarios=args.scenarios,
+        n_workers=args.workers or sweep_config.n_workers,
+        cache_path=None if args.no_cache else sweep_config.cache_path
+    )
+
+    print("\n" + "=" * 72)
+    print(f"{'Policy':<24} {'Scenario':<14} {'Health':>12} {'Water (ml)':>10} {'Violations':>10}")
+    print("=" * 72)
+    for policy_name, by_scenario in summaries.items():
+        for scenario_name, summary in by_scenario.items():
+            print(f"{os.path.basename(policy_name):<24} {scenario_name:<14} "
+                  f"{summary['avg_health_mean']:>6.1f} ± {summary['avg_health_std']:<4.1f} "
+                  f"{summary['total_water_mean']:>10.1f} {summary['violations_mean']:>10.1f}")
+    print("=" * 72)
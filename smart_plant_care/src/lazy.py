@@ -0,0 +1,38 @@
+"""
+Lazy Package Exports
+Package __init__ modules map their public names to submodules and import
+them on first attribute access, so importing a package only costs what is
+actually used (worker processes never load torch, plotting, etc.)
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Build module-level __getattr__ and __dir__ for a package
+
+    Args:
+        package: Package name (__name__ of the __init__ module)
+        exports: {public name: relative submodule}, e.g. {'PlantCareEnv': '.plant_env'}
+
+    Returns:
+        (__getattr__, __dir__)
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {'PlantCareEnv': '.plant_env'})
+    """
+    def __getattr__(name: str):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        # Cache on the package so later lookups bypass __getattr__
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(importlib.import_module(package))) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,10 +1,6 @@
 """工具函数模块"""
 
-from .visualization import (
-    plot_comparison_table,
-    plot_metrics_comparison_bars,
-    plot_action_timeline
-)
+from ..lazy import lazy_exports
 
 __all__ = [
     'plot_comparison_table',
@@ -12,3 +8,9 @@ __all__ = [
     'plot_action_timeline'
 ]
 
+# matplotlib / seaborn are only imported when a plot function is used
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'plot_comparison_table': '.visualization',
+    'plot_metrics_comparison_bars': '.visualization',
+    'plot_action_timeline': '.visualization',
+})
@@ -0,0 +1,141 @@
+"""
+Import-Time Budget
+Measures the import cost of the modules that worker processes and CLI tools
+load, each in a fresh interpreter, and checks it against a per-module budget
+and a list of heavy dependencies that must not be pulled in
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import time
+from typing import Dict, List, Optional, Sequence
+
+
+# Project root (the directory containing src/)
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dependencies none of the budgeted modules may import as a side effect
+HEAVY_MODULES = ('torch', 'stable_baselines3', 'matplotlib', 'seaborn', 'numba', 'yaml')
+
+# Import time budget per module (ms on a typical development machine, see --scale)
+BUDGETS_MS = {
+    'src.environment': 10,
+    'src.baselines': 10,
+    'src.evaluation': 10,
+    'src.utils': 10,
+    'src.config': 20,
+    'src.baselines.threshold_rule': 60,
+    'src.environment.plant_env': 100,
+    'src.agents.shm_worker': 100,
+    'src.evaluation.harness': 100,
+}
+
+# Runs in the fresh interpreter: time one import, report what it loaded
+_PROBE = """\
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'import_ms': elapsed * 1e3, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def measure_import(module: str, repeats: int = 5) -> Dict:
+    """
+    Import a module in fresh interpreters
+
+    Args:
+        module: Dotted module name
+        repeats: Interpreters to start; the fastest run is reported
+
+    Returns:
+        Dictionary with import_ms (the import statement alone), process_ms
+        (interpreter start to exit, i.e. what a spawned worker pays) and the
+        heavy modules that were loaded
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    import_ms, process_ms, loaded = [], [], set()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        process_ms.append((time.perf_counter() - start) * 1e3)
+        report = json.loads(output.strip().splitlines()[-1])
+        import_ms.append(report['import_ms'])
+        loaded.update(report['modules'])
+    return {
+        'module': module,
+        'import_ms': min(import_ms),
+        'process_ms': min(process_ms),
+        'heavy': sorted(name for name in HEAVY_MODULES if name in loaded),
+    }
+
+
+def check_budgets(
+    budgets: Optional[Dict[str, float]] = None,
+    scale: float = 1.0,
+    repeats: int = 5
+) -> List[Dict]:
+    """
+    Measure every budgeted module
+
+    Args:
+        budgets: {module: ms} (default: BUDGETS_MS)
+        scale: Multiplier applied to every budget (slow or loaded machines)
+        repeats: Fresh interpreters per module
+
+    Returns:
+        One row per module: measure_import() fields plus budget_ms and ok
+    """
+    rows = []
+    for module, budget_ms in (budgets or BUDGETS_MS).items():
+        row = measure_import(module, repeats)
+        row['budget_ms'] = budget_ms * scale
+        row['ok'] = row['import_ms'] <= row['budget_ms'] and not row['heavy']
+        rows.append(row)
+    return rows
+
+
+def _baseline(repeats: int) -> Dict[str, float]:
+    """Reference costs of this machine: bare interpreter and import numpy"""
+    empty = measure_import("sys", repeats)
+    numpy = measure_import("numpy", repeats)
+    return {'interpreter_ms': empty['process_ms'], 'numpy_ms': numpy['import_ms']}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check import-time budgets of worker and CLI modules")
+    parser.add_argument("--modules", type=str, nargs="+", default=None, help="Modules to check (default: all budgeted)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Budget multiplier for slow machines")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args(argv)
+
+    budgets = BUDGETS_MS
+    if args.modules:
+        budgets = {module: BUDGETS_MS.get(module, 100) for module in args.modules}
+    rows = check_budgets(budgets, scale=args.scale, repeats=args.repeats)
+
+    if args.json:
+        print(json.dumps({'baseline': _baseline(args.repeats), 'modules': rows}, indent=2))
+    else:
+        baseline = _baseline(args.repeats)
+        print(f"Interpreter startup {baseline['interpreter_ms']:.0f} ms, import numpy {baseline['numpy_ms']:.0f} ms")
+        print(f"{'module':<32} {'import ms':>10} {'process ms':>11} {'budget ms':>10}  status")
+        for row in rows:
+            status = "ok" if row['ok'] else "OVER"
+            if row['heavy']:
+                status = f"HEAVY: {', '.join(row['heavy'])}"
+            print(f"{row['module']:<32} {row['import_ms']:>10.1f} {row['process_ms']:>11.1f} "
+                  f"{row['budget_ms']:>10.0f}  {status}")
+    return 0 if all(row['ok'] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,26 @@ Generate comparison charts, training curves, action timelines, etc.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Sequence, Union
 import os
 
-# Set plot style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 10
+if TYPE_CHECKING:
+    from src.environment.trajectory import TrajectoryReader
+
+_style_applied = False
+
+
+def _pyplot():
+    """Import matplotlib/seaborn on first use and set the plot style once"""
+    global _style_applied
+    import matplotlib.pyplot as plt
+    if not _style_applied:
+        import seaborn as sns
+        sns.set_style("whitegrid")
+        plt.rcParams['figure.figsize'] = (12, 6)
+        plt.rcParams['font.size'] = 10
+        _style_applied = True
+    return plt
 
 
 def plot_comparison_table(results: Dict[str, Dict], save_path: str = None):
@@ -23,6 +34,8 @@ def plot_comparison_table(results: Dict[str, Dict], save_path: str = None):
         results: Format {"policy_name": {"avg_health": 80, "total_water": 10000, ...}}
         save_path: Save path
     """
+    plt = _pyplot()
+    
     fig, ax = plt.subplots(figsize=(14, 6))
     ax.axis('tight')
     ax.axis('off')
@@ -98,18 +111,31 @@ def plot_training_curves(log_path: str, save_path: str = None):
 
 
 def plot_action_timeline(
-    observations: List[np.ndarray],
-    actions: List[np.ndarray],
-    save_path: str = None
+    observations: Union[Sequence[np.ndarray], str, "TrajectoryReader"],
+    actions: Sequence[np.ndarray] = None,
+    save_path: str = None,
+    episode: int = 0,
+    start_step: int = 0,
+    n_steps: int = 24
 ):
     """
     Draw 24-hour action timeline
     
     Args:
-        observations: Observation sequence
-        actions: Action sequence
+        observations: Observation sequence, or a trajectory directory /
+            TrajectoryReader (observations and actions are then read from
+            the memory-mapped files)
+        actions: Action sequence (omit when reading a trajectory)
         save_path: Save path
+        episode: Trajectory episode to plot
+        start_step: First step of the episode to plot
+        n_steps: Number of steps to plot from the trajectory
     """
+    if actions is None:
+        observations, actions = _trajectory_window(observations, episode, start_step, n_steps)
+    
+    plt = _pyplot()
+    
     fig, axes = plt.subplots(4, 1, figsize=(14, 10), sharex=True)
     
     hours = [obs[3] for obs in observations]  # hour_of_day
@@ -168,6 +194,31 @@ def plot_action_timeline(
     plt.close()
 
 
+def _trajectory_window(trajectory, episode: int, start_step: int, n_steps: int):
+    """
+    Observation and action arrays of one episode window, sliced from the memory map
+
+    Each action is paired with the observation it was taken on: the reset
+    observation for the first step, otherwise the previous row's (a row
+    stores the observation after its step). Both arrays are clamped to the
+    steps the episode actually has, so they always have the same length.
+    """
+    from src.environment.trajectory import TrajectoryReader
+    reader = trajectory if isinstance(trajectory, TrajectoryReader) else TrajectoryReader(trajectory)
+    rows = reader.episode(episode, ['observation', 'action'])
+    start = max(start_step, 0)
+    stop = min(start + n_steps, len(rows['action']))
+    if start >= stop:
+        return rows['observation'][:0], rows['action'][:0]
+    if start > 0:
+        return rows['observation'][start - 1:stop - 1], rows['action'][start:stop]
+    initial = reader.initial_observation(episode)
+    if initial is None:
+        raise ValueError("Trajectory has no reset observation for this episode; plot from start_step=1")
+    observations = np.concatenate([initial[None], rows['observation'][:stop - 1]])
+    return observations, rows['action'][:stop]
+
+
 def plot_metrics_comparison_bars(results: Dict[str, Dict], save_path: str = None):
     """
     Draw metric comparison bar charts for different policies
@@ -176,6 +227,8 @@ def plot_metrics_comparison_bars(results: Dict[str, Dict], save_path: str = None
         results: Policy results dictionary
         save_path: Save path
     """
+    plt = _pyplot()
+    
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     
     policies = list(results.keys())
@@ -257,12 +310,12 @@ if __name__ == "__main__":
     }
     
     # Create output directory
-    os.makedirs("../../docs/images", exist_ok=True)
+    os.makedirs("docs/images", exist_ok=True)
     
     # Generate comparison table
-    plot_comparison_table(results, save_path="../../docs/images/comparison_table.png")
+    plot_comparison_table(results, save_path="docs/images/comparison_table.png")
     
     # Generate comparison bar chart
-    plot_metrics_comparison_bars(results, save_path="../../docs/images/comparison_bars.png")
+    plot_metrics_comparison_bars(results, save_path="docs/images/comparison_bars.png")
     
     print("\nExample charts generated in docs/images/ directory")